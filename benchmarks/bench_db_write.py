@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Write-path benchmark for the sentiment_results table.
+
+Measures rows/second for the legacy `DataFrame.to_sql` path, the bulk
+`executemany` insert and the content-hash upsert the load stage uses, with
+one writer and with several concurrent writers.
+
+    python -m benchmarks.bench_db_write --rows 20000 --writers 4
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+from database.bulk import bulk_insert_results, bulk_upsert_results, content_hash
+from database.db import Base, create_db_engine
+
+LABELS = ["Positive", "Negative", "Neutral"]
+
+
+def make_rows(n, prefix=""):
+    rows = []
+    for i in range(n):
+        text = f"{prefix}synthetic post {i} about keyword {random.randint(0, 50)}"
+        rows.append({
+            "input_text": text,
+            "sentiment_label": random.choice(LABELS),
+            "sentiment_score": random.random(),
+            "source": "Twitter",
+            "content_hash": content_hash(text, "Twitter"),
+        })
+    return rows
+
+
+def write_to_sql(engine, rows):
+    pd.DataFrame(rows).to_sql("sentiment_results", con=engine, if_exists="append", index=False)
+
+
+def write_bulk(engine, rows):
+    bulk_insert_results(rows, bind=engine)
+
+
+def write_upsert(engine, rows):
+    bulk_upsert_results(rows, bind=engine)
+
+
+def run_case(write, rows_per_writer, batch_size, writers):
+    """Run `writers` threads that each write their own rows in batches; return rows/sec."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        work = [make_rows(rows_per_writer, prefix=f"w{w} ") for w in range(writers)]
+
+        def worker(rows):
+            for i in range(0, len(rows), batch_size):
+                write(engine, rows[i:i + batch_size])
+
+        threads = [threading.Thread(target=worker, args=(rows,)) for rows in work]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+        engine.dispose()
+    return rows_per_writer * writers / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="rows written per writer")
+    parser.add_argument("--batch-size", type=int, default=200, help="rows per transaction (one pipeline run)")
+    parser.add_argument("--writers", type=int, default=4, help="concurrent writer threads")
+    args = parser.parse_args()
+
+    print(f"{'path':<10} {'writers':>7} {'rows/sec':>12}")
+    for name, write in (("to_sql", write_to_sql), ("bulk", write_bulk), ("upsert", write_upsert)):
+        for writers in (1, args.writers):
+            rate = run_case(write, args.rows, args.batch_size, writers)
+            print(f"{name:<10} {writers:>7} {rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
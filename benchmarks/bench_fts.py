@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Full-text search benchmark over a synthetic multi-million-row corpus.
+
+Loads `--rows` posts through the bulk insert path (FTS triggers active),
+then times /api/search-style queries against a LIKE scan baseline.
+
+    python -m benchmarks.bench_fts --rows 2000000
+"""
+
+import argparse
+import itertools
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from database.bulk import bulk_insert_results
+from database.db import Base, create_db_engine
+from database.search import ensure_fts, search_results
+
+LABELS = ["positive", "negative", "neutral"]
+BRANDS = ["apple", "tesla", "nvidia", "openai", "samsung", "netflix", "spotify", "microsoft"]
+
+
+def make_vocabulary(size, seed=7):
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(size)]
+
+
+def generate_rows(n, vocabulary, seed=11):
+    """Zipf-ish word frequencies so common and rare terms both exist."""
+    rng = random.Random(seed)
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(vocabulary))))
+    for i in range(n):
+        words = rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(8, 30))
+        words.insert(rng.randrange(len(words)), rng.choice(BRANDS))
+        yield {
+            "input_text": " ".join(words),
+            "sentiment_label": rng.choice(LABELS),
+            "sentiment_score": rng.random(),
+        }
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    vocabulary = make_vocabulary(args.vocabulary)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        ensure_fts(engine)
+
+        start = time.perf_counter()
+        batch = []
+        for row in generate_rows(args.rows, vocabulary):
+            batch.append(row)
+            if len(batch) >= args.batch_size:
+                bulk_insert_results(batch, bind=engine)
+                batch = []
+        bulk_insert_results(batch, bind=engine)
+        load_s = time.perf_counter() - start
+        size_mb = os.path.getsize(os.path.join(tmp, "bench.db")) / 1e6
+        print(f"Loaded {args.rows:,} rows with FTS triggers in {load_s:.1f}s "
+              f"({args.rows / load_s:,.0f} rows/s, {size_mb:,.0f} MB)")
+
+        common, mid, rare = vocabulary[0], vocabulary[200], vocabulary[-1]
+        cases = [
+            ("terms: brand + common word", dict(q=f"tesla {common}")),
+            ("terms: rare word", dict(q=rare)),
+            ("phrase: two common words", dict(q=f"{common} {vocabulary[1]}", mode="phrase")),
+            ("prefix: 3-letter prefix", dict(q=mid[:3], mode="prefix")),
+            ("terms + label filter", dict(q="nvidia", label="negative")),
+        ]
+
+        print(f"\n{'query':<30} {'p50 ms':>10} {'max ms':>10} {'rows':>6}")
+        for name, kwargs in cases:
+            rows, _ = search_results(limit=50, bind=engine, **kwargs)
+            p50, worst = timed(lambda: search_results(limit=50, bind=engine, **kwargs), args.repeat)
+            print(f"{name:<30} {p50:>10.1f} {worst:>10.1f} {len(rows):>6}")
+
+        # Second page via cursor
+        _, cursor = search_results(q="apple", limit=50, bind=engine)
+        p50, worst = timed(lambda: search_results(q="apple", limit=50, cursor=cursor, bind=engine), args.repeat)
+        print(f"{'terms: page 2 (cursor)':<30} {p50:>10.1f} {worst:>10.1f} {50:>6}")
+
+        with engine.connect() as conn:
+            like = lambda: conn.exec_driver_sql(
+                "SELECT id FROM sentiment_results WHERE input_text LIKE ? LIMIT 50", (f"%{rare}%",)
+            ).all()
+            p50, worst = timed(like, args.repeat)
+        print(f"{'LIKE scan baseline (rare)':<30} {p50:>10.1f} {worst:>10.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+CPU inference throughput: one in-process model vs. an `InferencePool`.
+
+Runs `--callers` concurrent threads, each analyzing `--batch`-text
+batches, against the in-process baseline and every replicas x threads
+combination in the sweep, and reports texts/s and batch latency
+p50/p95. `--model tiny` builds a small random RoBERTa in a temp dir so
+the sweep runs offline; pass a model name or path for real numbers.
+
+    python -m benchmarks.bench_inference_pool --model tiny --replicas 1,2 --threads 1,2
+    python -m benchmarks.bench_inference_pool --model cardiffnlp/twitter-roberta-base-sentiment-latest
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+WORDS = ["great", "terrible", "launch", "price", "update", "battery", "love", "hate", "meh", "news",
+         "slow", "fast", "broken", "works", "support", "refund", "camera", "screen", "app", "crash"]
+
+
+def make_texts(n, seed=5):
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(8, 40))) for _ in range(n)]
+
+
+def build_tiny_model(path):
+    """Save a 2-layer random RoBERTa sentiment classifier and tokenizer to `path`."""
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    from transformers import PreTrainedTokenizerFast, RobertaConfig, RobertaForSequenceClassification
+
+    vocab = {token: i for i, token in enumerate(["<s>", "<pad>", "</s>", "<unk>"] + WORDS)}
+    tokenizer = Tokenizer(models.WordLevel(vocab=vocab, unk_token="<unk>"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    fast = PreTrainedTokenizerFast(tokenizer_object=tokenizer, bos_token="<s>", eos_token="</s>",
+                                   unk_token="<unk>", pad_token="<pad>", model_max_length=128)
+    config = RobertaConfig(
+        vocab_size=len(vocab), hidden_size=64, num_hidden_layers=2, num_attention_heads=2,
+        intermediate_size=128, max_position_embeddings=130, num_labels=3, pad_token_id=1,
+        id2label={0: "negative", 1: "neutral", 2: "positive"},
+        label2id={"negative": 0, "neutral": 1, "positive": 2},
+    )
+    RobertaForSequenceClassification(config).save_pretrained(path)
+    fast.save_pretrained(path)
+    return path
+
+
+def drive(analyze, texts, batch, callers, rounds):
+    """`callers` threads each run `rounds` batches; returns (texts/s, per-batch latencies)."""
+    latencies = []
+    lock = threading.Lock()
+
+    def caller(offset):
+        for i in range(rounds):
+            start = (offset * rounds + i) * batch % max(1, len(texts) - batch)
+            chunk = texts[start:start + batch]
+            t0 = time.perf_counter()
+            analyze(chunk, batch_size=batch)
+            with lock:
+                latencies.append(time.perf_counter() - t0)
+
+    threads = [threading.Thread(target=caller, args=(c,)) for c in range(callers)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    return callers * rounds * batch / elapsed, latencies
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def report(name, throughput, latencies):
+    print(f"{name:<26} {throughput:>10.1f} {statistics.median(latencies) * 1000:>10.1f} "
+          f"{percentile(latencies, 0.95) * 1000:>10.1f}")
+
+
+def parse_ints(value):
+    return [int(v) for v in value.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="tiny", help="model name/path, or 'tiny' for an offline random model")
+    parser.add_argument("--replicas", type=parse_ints, default=[1, 2, 4])
+    parser.add_argument("--threads", type=parse_ints, default=None,
+                        help="threads per replica to sweep (default: cores // replicas)")
+    parser.add_argument("--callers", type=int, default=8, help="concurrent calling threads")
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=10, help="batches per caller")
+    parser.add_argument("--skip-baseline", action="store_true")
+    args = parser.parse_args()
+
+    from src.analysis.inference_pool import InferencePool
+    from src.analysis.model import SentimentAnalyzer
+
+    tmpdir = None
+    model = args.model
+    if model == "tiny":
+        tmpdir = tempfile.TemporaryDirectory()
+        model = build_tiny_model(tmpdir.name)
+
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    texts = make_texts(max(1000, args.batch * args.callers * 2))
+    print(f"model={args.model} cores={cores} callers={args.callers} batch={args.batch} rounds={args.rounds}")
+    print(f"{'config':<26} {'texts/s':>10} {'p50 ms':>10} {'p95 ms':>10}")
+
+    try:
+        if not args.skip_baseline:
+            import torch
+            analyzer = SentimentAnalyzer(model_name=model)
+            analyzer.analyze(texts[:args.batch], batch_size=args.batch)  # warm-up
+            report(f"in-process ({torch.get_num_threads()} thr)",
+                   *drive(analyzer.analyze, texts, args.batch, args.callers, args.rounds))
+            del analyzer
+
+        for replicas in args.replicas:
+            for threads in args.threads or [max(1, cores // replicas)]:
+                pool = InferencePool(replicas, threads, model_name=model)
+                try:
+                    pool.analyze(texts[:args.batch * replicas], batch_size=args.batch)  # warm-up
+                    report(f"pool {replicas} x {threads} thr",
+                           *drive(pool.analyze, texts, args.batch, args.callers, args.rounds))
+                finally:
+                    pool.shutdown()
+    finally:
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Response serialization benchmark for /api/sentiment payloads.
+
+Compares the previous path (Pydantic SentimentResponse validation,
+jsonable_encoder, stdlib json) with the orjson records and columnar paths,
+and reports compressed sizes, at 200, 1000 and 10000 rows.
+
+    python -m benchmarks.bench_serialization
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from src.api import responses
+from src.api.responses import dumps, sentiment_payload
+
+
+class LegacySentimentResponse(BaseModel):
+    """Mirror of main.SentimentResponse (kept here to avoid importing the app)."""
+    keyword: str
+    total_results: int
+    sentiment_breakdown: dict
+    data: list
+
+
+def make_frame(n, seed=3):
+    rng = random.Random(seed)
+    words = ["great", "terrible", "launch", "price", "update", "battery", "love", "hate", "meh", "news"]
+    rows = []
+    for i in range(n):
+        text = " ".join(rng.choices(words, k=rng.randint(6, 25)))
+        rows.append({
+            "source": rng.choice(["Twitter", "Reddit"]),
+            "created_at": "Mon Oct 19 10:00:00 +0000 2026",
+            "text": f"Post {i}: {text}",
+            "cleaned_text": text,
+            "sentiment": rng.choice(["positive", "negative", "neutral"]),
+            "sentiment_score": rng.random(),
+        })
+    return pd.DataFrame(rows)
+
+
+def legacy(df):
+    model = LegacySentimentResponse(
+        keyword="bench",
+        total_results=len(df),
+        sentiment_breakdown=df["sentiment"].value_counts().to_dict(),
+        data=df.to_dict(orient="records"),
+    )
+    encoded = jsonable_encoder(model)
+    return json.dumps(encoded, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def timed(fn, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+
+    print(f"{'rows':>6} {'path':<22} {'p50 ms':>9} {'bytes':>10} {'gzip':>9} {'br':>9}")
+    for n in args.sizes:
+        df = make_frame(n)
+        cases = [
+            ("pydantic + json", lambda: legacy(df)),
+            ("orjson records", lambda: dumps(sentiment_payload("bench", df, "records"))),
+            ("orjson columnar", lambda: dumps(sentiment_payload("bench", df, "columnar"))),
+        ]
+        for name, fn in cases:
+            ms, body = timed(fn, args.repeat)
+            gz = len(responses.compress(body, "gzip"))
+            br = len(responses.compress(body, "br")) if responses.brotli else float("nan")
+            print(f"{n:>6} {name:<22} {ms:>9.2f} {len(body):>10,} {gz:>9,} {br:>9,}")
+
+        for encoding in ("gzip", "br"):
+            if encoding == "br" and responses.brotli is None:
+                continue
+            body = dumps(sentiment_payload("bench", df, "records"))
+            ms, _ = timed(lambda: responses.compress(body, encoding), args.repeat)
+            print(f"{n:>6} {'compress ' + encoding:<22} {ms:>9.2f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Load test for the API, driven in-process over ASGI or against a running server.
+
+In-process mode (default) imports `main.app` against a scratch database with
+replayed/generated connector output and the stub analyzer from
+`benchmarks.suite`, so it runs offline. `--url` targets a local uvicorn
+instead (whatever connectors/model that server was started with).
+
+Each concurrency level is one scenario: closed-loop virtual users send
+requests for `--duration` seconds, following a ramp profile, with keywords
+drawn from a Zipf distribution. Per scenario it reports throughput,
+p50/p95/p99 latency, error and shed (503) rates and peak RSS.
+
+    python -m benchmarks.load_test --concurrency 1 8 32 64 --duration 20
+    python -m benchmarks.load_test --ramp linear --zipf 1.2 --upstream-ms 150
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --server-pid 4242
+
+Ramp profiles: `constant` (all users from the start), `linear` (1 -> N over
+the run) and `step` (N/4 more users each quarter).
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+
+RAMPS = ("constant", "linear", "step")
+
+
+# --- Workload ---
+def zipf_sampler(keywords, s, seed=17):
+    """Draw keywords with P(rank k) proportional to 1 / k**s (s=0 is uniform)."""
+    rng = random.Random(seed)
+    cum_weights = list(itertools.accumulate(1 / (k ** s) for k in range(1, len(keywords) + 1)))
+    return lambda: rng.choices(keywords, cum_weights=cum_weights)[0]
+
+
+def active_users(ramp, users, elapsed, duration):
+    if ramp == "linear":
+        return max(1, math.ceil(users * min(1.0, elapsed / duration)))
+    if ramp == "step":
+        return max(1, math.ceil(users * min(4, int(elapsed / duration * 4) + 1) / 4))
+    return users
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+# --- Memory ---
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_mb(pid=None):
+    """Current RSS of `pid` (default: this process) in MB; None if unavailable."""
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / 2**20
+    except (OSError, IndexError, ValueError):
+        if pid is None:
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # peak only (Linux: KB)
+        return None
+
+
+class RssSampler:
+    """Track the peak RSS of a process while a scenario runs."""
+
+    def __init__(self, pid=None, interval=0.1):
+        self.pid = pid
+        self.interval = interval
+        self.peak = None
+        self._task = None
+
+    async def _loop(self):
+        while True:
+            current = rss_mb(self.pid)
+            if current is not None:
+                self.peak = current if self.peak is None else max(self.peak, current)
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        self.peak = rss_mb(self.pid)
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        return self.peak
+
+
+# --- Targets ---
+def prepare_in_process(args):
+    """Configure and import the app with offline connectors and the stub analyzer."""
+    scratch = tempfile.mkdtemp(prefix="sentilytics-load-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(scratch, 'load.db')}"
+    os.environ.setdefault("WRITE_BEHIND_SPILL_PATH", os.path.join(scratch, "spill.ndjson"))
+    os.environ.setdefault("REDDIT_CLIENT_ID", "load-test")
+    os.environ.setdefault("UPSTREAM_BUDGET_CALLS_PER_MINUTE", "1000000")
+    os.environ.setdefault("UPSTREAM_BUDGET_BURST", "1000000")
+    if args.no_cache:
+        os.environ["SENTIMENT_CACHE_TTL_SECONDS"] = "0"
+
+    import src.analysis.model as model_module
+    import src.processing.pipeline as pipeline
+    from benchmarks.suite import load_analyzer, make_posts
+
+    replay = None
+    if args.replay:
+        with open(args.replay, encoding="utf-8") as f:
+            replay = json.load(f)
+    delay = args.upstream_ms / 1000
+
+    def connector(source, seed):
+        def fetch(keyword, max_results):
+            time.sleep(delay)  # simulated upstream round trip
+            if replay is not None:
+                return replay.get(source, [])[:max_results]
+            return make_posts(max_results, keyword, seed=seed)
+        return fetch
+
+    model_module._analyzer_instance = load_analyzer(args.model)
+    pipeline.fetch_twitter_data = connector("twitter", 1)
+    pipeline.fetch_reddit_data = connector("reddit", 2)
+
+    import main
+    return main
+
+
+@asynccontextmanager
+async def open_client(args):
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    timeout = httpx.Timeout(args.timeout)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=timeout) as client:
+            yield client
+        return
+
+    main = prepare_in_process(args)
+    async with main.lifespan(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest",
+                                     limits=limits, timeout=timeout) as client:
+            yield client
+
+
+# --- Scenario ---
+async def run_scenario(client, args, users, next_keyword):
+    samples = []  # (latency_seconds, status or None on exception)
+    started = time.perf_counter()
+    deadline = started + args.duration
+    sampler = RssSampler(args.server_pid)
+    sampler.start()
+
+    async def user(index):
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                return
+            if index >= active_users(args.ramp, users, now - started, args.duration):
+                await asyncio.sleep(0.05)
+                continue
+            params = {args.param: next_keyword(), **args.extra_params}
+            request_started = time.perf_counter()
+            try:
+                response = await client.get(args.endpoint, params=params)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = None
+            samples.append((time.perf_counter() - request_started, status))
+            if status == 503 and args.shed_backoff_ms:
+                # A shed request returns at once; retrying immediately would
+                # just spin, so back off as a client honouring Retry-After would
+                await asyncio.sleep(args.shed_backoff_ms / 1000)
+            elif args.think_ms:
+                await asyncio.sleep(args.think_ms / 1000)
+
+    await asyncio.gather(*(user(i) for i in range(users)))
+    elapsed = time.perf_counter() - started
+    peak_rss = await sampler.stop()
+
+    total = len(samples)
+    shed = sum(1 for _, status in samples if status == 503)
+    errors = sum(1 for _, status in samples if status is None or (status >= 400 and status != 503))
+    ok = sorted(latency for latency, status in samples if status is not None and status < 400)
+    ms = lambda value: round(value * 1000, 2) if value is not None else None
+
+    return {
+        "users": users,
+        "ramp": args.ramp,
+        "requests": total,
+        "duration_seconds": round(elapsed, 2),
+        "throughput_rps": round(len(ok) / elapsed, 2),
+        "p50_ms": ms(percentile(ok, 50)),
+        "p95_ms": ms(percentile(ok, 95)),
+        "p99_ms": ms(percentile(ok, 99)),
+        "max_ms": ms(ok[-1] if ok else None),
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "shed_rate": round(shed / total, 4) if total else 0.0,
+        "peak_rss_mb": round(peak_rss, 1) if peak_rss is not None else None,
+    }
+
+
+async def run(args):
+    keywords = [f"kw{i}" for i in range(args.keywords)]
+    next_keyword = zipf_sampler(keywords, args.zipf)
+    report = []
+
+    print(f"{'users':>6} {'reqs':>7} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'err %':>6} {'shed %':>7} {'rss MB':>8}")
+    async with open_client(args) as client:
+        for users in args.concurrency:
+            result = await run_scenario(client, args, users, next_keyword)
+            report.append(result)
+            fmt = lambda value: "-" if value is None else f"{value:,.1f}"
+            print(f"{users:>6} {result['requests']:>7} {result['throughput_rps']:>8.1f} "
+                  f"{fmt(result['p50_ms']):>9} {fmt(result['p95_ms']):>9} {fmt(result['p99_ms']):>9} "
+                  f"{result['error_rate'] * 100:>6.1f} {result['shed_rate'] * 100:>7.1f} "
+                  f"{fmt(result['peak_rss_mb']):>8}")
+            if args.cooldown:
+                await asyncio.sleep(args.cooldown)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="target a running server instead of the in-process app")
+    parser.add_argument("--server-pid", type=int, help="with --url: sample this process's RSS")
+    parser.add_argument("--endpoint", default="/api/sentiment")
+    parser.add_argument("--param", default="query", help="query parameter that carries the keyword")
+    parser.add_argument("--extra", nargs="*", default=[], metavar="KEY=VALUE", help="extra query parameters")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32], help="one scenario per value")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per scenario")
+    parser.add_argument("--ramp", choices=RAMPS, default="constant")
+    parser.add_argument("--keywords", type=int, default=50, help="distinct keywords")
+    parser.add_argument("--zipf", type=float, default=1.1, help="keyword popularity skew (0 = uniform)")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="pause between a user's requests")
+    parser.add_argument("--shed-backoff-ms", type=float, default=500.0, help="pause after a 503 response")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--cooldown", type=float, default=1.0, help="seconds between scenarios")
+    parser.add_argument("--model", default="stub", help="in-process: 'stub' or a local model directory")
+    parser.add_argument("--replay", help="in-process: connector replay file (see benchmarks.suite record)")
+    parser.add_argument("--upstream-ms", type=float, default=100.0, help="in-process: simulated connector latency")
+    parser.add_argument("--no-cache", action="store_true", help="in-process: disable the /api/sentiment cache")
+    parser.add_argument("--out", help="write the per-scenario report as JSON")
+    args = parser.parse_args()
+    args.extra_params = dict(item.split("=", 1) for item in args.extra)
+
+    report = asyncio.run(run(args))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"args": {k: v for k, v in vars(args).items()}, "scenarios": report}, f, indent=2)
+        print(f"💾 [Load] Wrote {len(report)} scenarios to {args.out}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the hot paths.
+
+Runs without network access or a downloaded model: connector output is
+replayed from a JSON file (or generated), and scoring uses a deterministic
+stub analyzer unless `--model` points at a local model directory. Covers
+
+  preprocess   preprocess_text throughput
+  analyze      analyzer.analyze throughput per batch size
+  pipeline     run_sentiment_pipeline end to end (extract -> score -> load)
+  db_write     to_sql vs bulk insert vs upsert (see bench_db_write)
+  serialize    /api/sentiment payload encoding (see bench_serialization)
+
+Results are written as JSON; `compare` (or `run --baseline`) flags every
+metric that got worse than the baseline by more than `--threshold`.
+
+    python -m benchmarks.suite run --out bench.json
+    python -m benchmarks.suite run --out new.json --baseline bench.json
+    python -m benchmarks.suite compare bench.json new.json --threshold 0.15
+    python -m benchmarks.suite record --keyword tesla --out replay.json
+
+NLTK data (punkt, punkt_tab, stopwords) must be installed once beforehand.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime, timedelta
+
+SECTIONS = ("preprocess", "analyze", "pipeline", "db_write", "serialize")
+LABELS = ["Positive", "Negative", "Neutral"]
+
+
+class StubAnalyzer:
+    """Deterministic stand-in for SentimentAnalyzer; cost grows with text length, no model."""
+    model_name = "stub"
+
+    def analyze(self, texts, batch_size=16, return_embeddings=False):
+        digests = [zlib.crc32(str(text).encode()) for text in texts]
+        results = [{"label": LABELS[digest % 3], "score": (digest % 1000) / 1000} for digest in digests]
+        if return_embeddings:
+            import numpy as np
+            vectors = [np.random.default_rng(digest).standard_normal(32) for digest in digests]
+            return results, np.array(vectors, dtype=np.float16).reshape(len(texts), 32)
+        return results
+
+
+# --- Inputs ---
+def make_posts(n, keyword="bench", seed=5):
+    """Synthetic social posts with the noise preprocess_text strips (urls, mentions, emoji)."""
+    rng = random.Random(seed)
+    words = ["great", "terrible", "launch", "price", "update", "battery", "love", "hate",
+             "honestly", "the", "is", "not", "really", "today", "news", "market"]
+    extras = ["https://t.co/abc123", "@someone", "#trending", "\U0001F600", "\U0001F525", "!!", "..."]
+    base = datetime(2026, 10, 19, 12, 0, 0)
+    posts = []
+    for i in range(n):
+        tokens = rng.choices(words, k=rng.randint(8, 30)) + rng.sample(extras, k=rng.randint(0, 3))
+        rng.shuffle(tokens)
+        posts.append({
+            "text": f"{keyword} {' '.join(tokens)} #{i}",
+            "created_at": (base - timedelta(minutes=i)).strftime("%a %b %d %H:%M:%S +0000 %Y"),
+        })
+    return posts
+
+
+def load_replay(path, keyword, max_results):
+    """Connector output keyed by source: from a `record` file, or generated."""
+    if path:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return {
+        "keyword": keyword,
+        "twitter": make_posts(max_results, keyword, seed=1),
+        "reddit": make_posts(max_results, keyword, seed=2),
+    }
+
+
+def load_analyzer(model):
+    if model == "stub":
+        return StubAnalyzer()
+    from src.analysis.model import SentimentAnalyzer
+    return SentimentAnalyzer(model_name=model)
+
+
+def median_seconds(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def metric(value, unit, higher_is_better=True):
+    return {"value": round(value, 4), "unit": unit, "higher_is_better": higher_is_better}
+
+
+# --- Sections ---
+def bench_preprocess(args, results):
+    from src.processing.text_cleaner import preprocess_text
+
+    texts = [post["text"] for post in make_posts(args.texts)]
+    seconds = median_seconds(lambda: [preprocess_text(t) for t in texts], args.repeat)
+    results["preprocess.texts_per_sec"] = metric(len(texts) / seconds, "texts/s")
+
+
+def bench_analyze(args, results, analyzer):
+    from src.processing.text_cleaner import preprocess_text
+
+    texts = [preprocess_text(post["text"]) for post in make_posts(args.texts)]
+    for batch_size in args.batch_sizes:
+        def run():
+            for i in range(0, len(texts), batch_size):
+                analyzer.analyze(texts[i:i + batch_size], batch_size=batch_size)
+        seconds = median_seconds(run, args.repeat)
+        results[f"analyze.batch_{batch_size}.texts_per_sec"] = metric(len(texts) / seconds, "texts/s")
+
+
+def bench_pipeline(args, results, analyzer):
+    import src.analysis.model as model_module
+    import src.processing.pipeline as pipeline
+
+    replay = load_replay(args.replay, args.keyword, args.max_results)
+    keyword = replay.get("keyword", args.keyword)
+    model_module._analyzer_instance = analyzer
+    pipeline.fetch_twitter_data = lambda kw, n: replay.get("twitter", [])[:n]
+    pipeline.fetch_reddit_data = lambda kw, n: replay.get("reddit", [])[:n]
+
+    posts = len(replay.get("twitter", [])[:args.max_results]) + len(replay.get("reddit", [])[:args.max_results])
+    seconds = median_seconds(lambda: pipeline.run_sentiment_pipeline(keyword, args.max_results), args.repeat)
+    results["pipeline.run_ms"] = metric(seconds * 1000, "ms", higher_is_better=False)
+    results["pipeline.posts_per_sec"] = metric(posts / seconds, "posts/s")
+
+
+def bench_db_write(args, results):
+    from benchmarks.bench_db_write import run_case, write_bulk, write_to_sql, write_upsert
+
+    for name, write in (("to_sql", write_to_sql), ("bulk", write_bulk), ("upsert", write_upsert)):
+        rate = statistics.median(run_case(write, args.rows, args.write_batch, 1) for _ in range(3))
+        results[f"db_write.{name}.rows_per_sec"] = metric(rate, "rows/s")
+
+
+def bench_serialize(args, results):
+    from benchmarks.bench_serialization import legacy, make_frame, timed
+    from src.api.responses import dumps, sentiment_payload
+
+    for n in args.sizes:
+        df = make_frame(n)
+        cases = (
+            ("pydantic_json", lambda: legacy(df)),
+            ("orjson_records", lambda: dumps(sentiment_payload("bench", df, "records"))),
+            ("orjson_columnar", lambda: dumps(sentiment_payload("bench", df, "columnar"))),
+        )
+        for name, fn in cases:
+            ms, _ = timed(fn, args.repeat)
+            results[f"serialize.{n}.{name}.ms"] = metric(ms, "ms", higher_is_better=False)
+
+
+# --- Reporting ---
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current, threshold):
+    """Print a per-metric comparison; return the names of regressed metrics."""
+    regressions = []
+    print(f"{'metric':<44} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or not base["value"]:
+            print(f"{name:<44} {'-':>12} {cur['value']:>12,.2f}")
+            continue
+        change = (cur["value"] - base["value"]) / base["value"]
+        worse = -change if cur["higher_is_better"] else change
+        flag = ""
+        if worse > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<44} {base['value']:>12,.2f} {cur['value']:>12,.2f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def run(args):
+    # Point the app's default engine at a scratch database before anything
+    # under database/ is imported, so the pipeline never touches app.db.
+    scratch = tempfile.mkdtemp(prefix="sentilytics-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(scratch, 'bench.db')}"
+    # The connectors are stubbed, so don't let the upstream budget throttle the runs
+    os.environ.setdefault("UPSTREAM_BUDGET_CALLS_PER_MINUTE", "1000000")
+    os.environ.setdefault("UPSTREAM_BUDGET_BURST", "1000000")
+    from database import models
+    from database.db import engine
+    models.Base.metadata.create_all(bind=engine)
+
+    sections = args.only or SECTIONS
+    analyzer = load_analyzer(args.model) if {"analyze", "pipeline"} & set(sections) else None
+    results = {}
+    for section in sections:
+        print(f"🚀 [Bench] {section}")
+        if section == "preprocess":
+            bench_preprocess(args, results)
+        elif section == "analyze":
+            bench_analyze(args, results, analyzer)
+        elif section == "pipeline":
+            bench_pipeline(args, results, analyzer)
+        elif section == "db_write":
+            bench_db_write(args, results)
+        elif section == "serialize":
+            bench_serialize(args, results)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "git_revision": git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "model": args.model,
+            "args": {k: v for k, v in vars(args).items() if k != "func"},
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 [Bench] Wrote {len(results)} metrics to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        return 1 if regressions else 0
+    for name, result in results.items():
+        print(f"{name:<44} {result['value']:>12,.2f} {result['unit']}")
+    return 0
+
+
+def run_compare(args):
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"⚠️ [Bench] {len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    print("✅ [Bench] No regressions")
+    return 0
+
+
+def run_record(args):
+    """Capture live connector output once so later runs can replay it offline."""
+    from src.connectors.api_clients import fetch_reddit_data, fetch_twitter_data
+
+    replay = {
+        "keyword": args.keyword,
+        "twitter": [{"text": p.get("text", ""), "created_at": p.get("created_at")}
+                    for p in fetch_twitter_data(args.keyword, args.max_results) or []],
+        "reddit": [{"text": p.get("text", ""), "created_at": p.get("created_at")}
+                   for p in fetch_reddit_data(args.keyword, args.max_results) or []],
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(replay, f, indent=2, default=str)
+    print(f"💾 [Bench] Recorded {len(replay['twitter'])} tweets and {len(replay['reddit'])} Reddit posts to {args.out}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("run", help="run the suite and save results as JSON")
+    p.add_argument("--out", default="bench_results.json")
+    p.add_argument("--baseline", help="compare against this results file; exit 1 on regression")
+    p.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown before flagging (0.15 = 15%%)")
+    p.add_argument("--only", nargs="+", choices=SECTIONS)
+    p.add_argument("--model", default="stub", help="'stub' or a local model directory")
+    p.add_argument("--replay", help="connector replay file written by `record`")
+    p.add_argument("--keyword", default="bench")
+    p.add_argument("--max-results", type=int, default=100, help="posts per source per pipeline run")
+    p.add_argument("--texts", type=int, default=2000, help="texts for preprocess/analyze")
+    p.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 16, 32, 64])
+    p.add_argument("--rows", type=int, default=5000, help="rows per db_write case")
+    p.add_argument("--write-batch", type=int, default=200)
+    p.add_argument("--sizes", type=int, nargs="+", default=[200, 1000])
+    p.add_argument("--repeat", type=int, default=5)
+    p.set_defaults(func=run)
+
+    p = sub.add_parser("compare", help="compare two results files")
+    p.add_argument("baseline")
+    p.add_argument("current")
+    p.add_argument("--threshold", type=float, default=0.15)
+    p.set_defaults(func=run_compare)
+
+    p = sub.add_parser("record", help="save live connector output for replay (needs network)")
+    p.add_argument("--keyword", required=True)
+    p.add_argument("--max-results", type=int, default=100)
+    p.add_argument("--out", default="replay.json")
+    p.set_defaults(func=run_record)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
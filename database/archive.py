@@ -0,0 +1,212 @@
+# database/archive.py
+import logging
+import os
+import re
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from sqlalchemy import DateTime, Float, Integer, delete, or_, select
+
+from .db import engine
+from .models import SentimentResult
+
+logger = logging.getLogger("sentilytics")
+
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "./archive")
+RETENTION_DAYS = float(os.getenv("RESULTS_RETENTION_DAYS", "30"))
+
+# Hive-style layout: <ARCHIVE_DIR>/date=YYYY-MM-DD/keyword=<kw>/part-*.parquet
+# `date` is the day of created_at (`unknown` for rows without one).
+PARTITIONING = ds.partitioning(
+    pa.schema([("date", pa.string()), ("keyword", pa.string())]),
+    flavor="hive",
+)
+UNKNOWN_DATE = "unknown"
+_DATE_DIR = re.compile(r"date=([^/\\]+)")
+
+
+def arrow_type(column):
+    """Arrow type for a SentimentResult column."""
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    return pa.string()
+
+
+# File schema: every SentimentResult column except the partition keys, which
+# live in the directory names.
+ARCHIVE_SCHEMA = pa.schema(
+    [(c.name, arrow_type(c)) for c in SentimentResult.__table__.columns if c.name != "keyword"]
+    + [("date", pa.string()), ("keyword", pa.string())]
+)
+
+
+def archive_old_results(max_age_days: float = RETENTION_DAYS, bind=None,
+                        archive_dir: str = ARCHIVE_DIR, batch_size: int = 50000) -> int:
+    """
+    Move rows saved more than `max_age_days` ago into zstd-compressed Parquet.
+
+    Rows with no `created_at` (stored before the column had a default) are
+    of unknown age and archived too, under `date=unknown`.
+    Works through old rows in primary-key order; each batch is written to the
+    partitioned dataset first and only then deleted from SQLite, so a crash
+    can at worst archive a batch twice, never lose it.
+    """
+    bind = bind or engine
+    table = SentimentResult.__table__
+    cutoff = datetime.utcnow() - timedelta(days=max_age_days)
+    run_id = uuid.uuid4().hex[:12]
+    last_id = 0
+    archived = 0
+
+    while True:
+        with bind.connect() as conn:
+            rows = conn.execute(
+                select(table)
+                .where(table.c.id > last_id,
+                       or_(table.c.created_at < cutoff, table.c.created_at.is_(None)))
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).mappings().all()
+        if not rows:
+            break
+
+        records = [dict(row) for row in rows]
+        for record in records:
+            saved = record["created_at"]
+            record["date"] = saved.strftime("%Y-%m-%d") if saved else UNKNOWN_DATE
+        ds.write_dataset(
+            pa.Table.from_pylist(records, schema=ARCHIVE_SCHEMA),
+            archive_dir,
+            format="parquet",
+            partitioning=PARTITIONING,
+            basename_template=f"part-{run_id}-{last_id}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+        )
+
+        ids = [record["id"] for record in records]
+        with bind.begin() as conn:
+            conn.execute(delete(table).where(table.c.id.in_(ids)))
+
+        last_id = ids[-1]
+        archived += len(ids)
+        logger.info("[Archive] Moved %d rows (up to id %d) to %s", archived, last_id, archive_dir)
+
+    return archived
+
+
+def _open_archive(archive_dir: str) -> Optional[ds.Dataset]:
+    if not os.path.isdir(archive_dir):
+        return None
+    return ds.dataset(archive_dir, format="parquet", partitioning=PARTITIONING, schema=ARCHIVE_SCHEMA)
+
+
+def iter_archived_rows(columns: Sequence[str], batch_size: int = 50000,
+                       archive_dir: str = ARCHIVE_DIR) -> Iterator[List[Dict]]:
+    """
+    Every archived row, `batch_size` at a time, with only `columns` decoded.
+
+    Lets the rollup and term-sketch rebuilds cover rows that have left
+    SQLite; yields nothing when there is no archive. Labels are lowercased
+    like stored ones.
+    """
+    dataset = _open_archive(archive_dir)
+    if dataset is None:
+        return
+    for batch in dataset.to_batches(columns=list(columns), batch_size=batch_size):
+        if batch.num_rows:
+            rows = batch.to_pylist()
+            for row in rows:
+                if row.get("sentiment_label"):
+                    row["sentiment_label"] = row["sentiment_label"].lower()
+            yield rows
+
+
+def query_archive(keyword: Optional[str] = None, start: Optional[datetime] = None,
+                  end: Optional[datetime] = None, label: Optional[str] = None,
+                  source: Optional[str] = None, columns: Optional[Sequence[str]] = None,
+                  limit: int = 1000, archive_dir: str = ARCHIVE_DIR) -> List[Dict]:
+    """
+    Read archived rows matching the filters, oldest first.
+
+    `keyword` and the date range prune whole partition directories before
+    any file is opened; `columns` limits which Parquet columns are decoded.
+    Day partitions are read oldest first, each sorted by `(created_at, id)`,
+    until `limit` rows are collected; rows without a `created_at` come last.
+    """
+    dataset = _open_archive(archive_dir)
+    if dataset is None:
+        return []
+
+    conditions = []
+    if keyword:
+        conditions.append(ds.field("keyword") == keyword)
+    if start:
+        conditions.append(ds.field("date") >= start.strftime("%Y-%m-%d"))
+        conditions.append(ds.field("created_at") >= pa.scalar(start, pa.timestamp("us")))
+    if end:
+        conditions.append(ds.field("date") <= end.strftime("%Y-%m-%d"))
+        conditions.append(ds.field("created_at") < pa.scalar(end, pa.timestamp("us")))
+    if label:
+        # Files written before labels were normalized may hold `Neutral`
+        conditions.append(pc.utf8_lower(ds.field("sentiment_label")) == label.lower())
+    if source:
+        conditions.append(ds.field("source") == source)
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    dates = {match.group(1) for match in map(_DATE_DIR.search, dataset.files) if match}
+    if start or end:
+        dates.discard(UNKNOWN_DATE)  # no created_at, so never inside a range
+        dates = {d for d in dates if (not start or d >= start.strftime("%Y-%m-%d"))
+                 and (not end or d <= end.strftime("%Y-%m-%d"))}
+    # Read the sort keys alongside the requested columns, then drop them
+    read = list(dict.fromkeys([*columns, "created_at", "id"])) if columns else None
+    found = []
+    remaining = limit
+    for day in sorted(dates, key=lambda d: (d == UNKNOWN_DATE, d)):
+        if remaining <= 0:
+            break
+        day_filter = ds.field("date") == day
+        rows = dataset.to_table(columns=read, filter=day_filter if expression is None else expression & day_filter)
+        rows = rows.sort_by([("created_at", "ascending"), ("id", "ascending")]).slice(0, remaining)
+        if columns:
+            rows = rows.select(list(columns))
+        if "sentiment_label" in rows.column_names:
+            index = rows.column_names.index("sentiment_label")
+            rows = rows.set_column(index, "sentiment_label", pc.utf8_lower(rows["sentiment_label"]))
+        found.extend(rows.to_pylist())
+        remaining -= rows.num_rows
+    return found
+
+
+# --- Periodic retention job ---
+_retention_stop = threading.Event()
+
+
+def start_retention_job(interval_hours: float, max_age_days: float = RETENTION_DAYS):
+    """Run `archive_old_results` every `interval_hours` on a daemon thread."""
+    def loop():
+        while not _retention_stop.wait(interval_hours * 3600):
+            try:
+                archive_old_results(max_age_days)
+            except Exception:
+                logger.exception("[Archive] Retention run failed")
+
+    _retention_stop.clear()
+    threading.Thread(target=loop, name="retention", daemon=True).start()
+
+
+def stop_retention_job():
+    _retention_stop.set()
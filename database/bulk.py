@@ -0,0 +1,138 @@
+# database/bulk.py
+import hashlib
+from typing import Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from .db import engine
+from .models import SentimentResult
+from .rollups import apply_rollups
+from .terms import apply_term_sketches
+
+# Bound on `IN (...)` list sizes, well under SQLite's host-parameter limit.
+_MAX_IN_PARAMS = 900
+
+
+def text_hash(text: str) -> str:
+    """Stable sha256 hex digest of a post's text."""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def content_hash(text: str, source: Optional[str]) -> str:
+    """Dedup key for a post: the same text from the same source hashes equal."""
+    return hashlib.sha256(f"{(source or '').lower()}\x1f{text or ''}".encode("utf-8")).hexdigest()
+
+
+def bulk_insert_results(rows: Iterable[Dict], bind=None) -> int:
+    """
+    Insert sentiment rows in one transaction.
+
+    The INSERT is compiled once and run with `executemany`, skipping the
+    table reflection and dtype conversion `DataFrame.to_sql` does per call.
+    Rows are dicts keyed by `SentimentResult` column names.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+
+    with (bind or engine).begin() as conn:
+        conn.execute(insert(SentimentResult.__table__), rows)
+    return len(rows)
+
+
+def _stored_hashes(conn, hashes: Iterable[str]) -> Set[str]:
+    hashes = list({h for h in hashes if h})
+    existing = set()
+    table = SentimentResult.__table__
+    for start in range(0, len(hashes), _MAX_IN_PARAMS):
+        chunk = hashes[start:start + _MAX_IN_PARAMS]
+        existing.update(conn.execute(select(table.c.content_hash).where(table.c.content_hash.in_(chunk))).scalars())
+    return existing
+
+
+def stored_hashes(hashes: Iterable[str], bind=None) -> Set[str]:
+    """The subset of `hashes` (content hashes) already stored."""
+    with (bind or engine).connect() as conn:
+        return _stored_hashes(conn, hashes)
+
+
+def _new_rows(conn, rows: List[Dict]) -> List[Dict]:
+    """Rows whose `content_hash` is not stored yet (first occurrence only)."""
+    existing = _stored_hashes(conn, (row.get("content_hash") for row in rows))
+
+    fresh = []
+    for row in rows:
+        key = row.get("content_hash")
+        if key is None or key not in existing:
+            fresh.append(row)
+            if key is not None:
+                existing.add(key)
+    return fresh
+
+
+def bulk_upsert_results(rows: Iterable[Dict], bind=None, rollups: bool = True) -> int:
+    """
+    Insert-or-update sentiment rows by `content_hash` in one transaction.
+
+    Uses `INSERT ... ON CONFLICT(content_hash) DO UPDATE` via `executemany`:
+    a post seen before keeps its row (id, created_at, label, score and
+    `model_version`) and only `last_seen` is refreshed. Posts not seen
+    before are also added to the time-bucketed rollups and term sketches in
+    the same transaction. Re-labelling stored rows after a model change is
+    left to the re-scoring job, which corrects the rollups as it goes.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+
+    stmt = sqlite_insert(SentimentResult.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["content_hash"],
+        set_={"last_seen": stmt.excluded.last_seen},
+    )
+    with (bind or engine).begin() as conn:
+        fresh = _new_rows(conn, rows) if rollups else []
+        conn.execute(stmt, rows)
+        apply_rollups(conn, fresh)
+        apply_term_sketches(conn, fresh)
+    return len(rows)
+
+
+def _parse_post_times(values) -> List[Optional[object]]:
+    """Parse upstream timestamps (Twitter and Reddit formats) to naive UTC datetimes."""
+    parsed = pd.to_datetime(pd.Series(values, dtype="object"), errors="coerce", utc=True, format="mixed")
+    return [None if pd.isna(ts) else ts.tz_convert(None).to_pydatetime() for ts in parsed]
+
+
+def dataframe_to_rows(df, keyword: Optional[str] = None, model_version: Optional[str] = None) -> List[Dict]:
+    """
+    Map pipeline output columns onto `SentimentResult` columns.
+
+    Labels are stored lowercase (the display placeholder `Neutral` becomes
+    `neutral`), matching the lowercased label filters. Each row also
+    carries its cleaned tokens under `terms` (not a column; the insert
+    ignores it) for the term sketches.
+    """
+    sources = df["source"] if "source" in df.columns else [None] * len(df)
+    post_times = _parse_post_times(df["created_at"]) if "created_at" in df.columns else [None] * len(df)
+    cleaned = df["cleaned_text"] if "cleaned_text" in df.columns else [""] * len(df)
+
+    return [
+        {
+            "input_text": text,
+            "sentiment_label": str(label).lower(),
+            "sentiment_score": float(score) if score is not None else None,
+            "keyword": keyword,
+            "source": source,
+            "post_created_at": posted_at,
+            "text_hash": text_hash(text),
+            "content_hash": content_hash(text, source),
+            "model_version": model_version,
+            "terms": cleaned_text.split() if isinstance(cleaned_text, str) else [],
+        }
+        for text, label, score, source, posted_at, cleaned_text in zip(
+            df["text"], df["sentiment"], df["sentiment_score"], sources, post_times, cleaned
+        )
+    ]
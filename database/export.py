@@ -0,0 +1,136 @@
+# database/export.py
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Iterator, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import select
+
+from .archive import arrow_type
+from .db import engine
+from .models import SentimentResult
+from .queries import filter_results
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+_COLUMNS = list(SentimentResult.__table__.columns)
+_FIELD_NAMES = [column.name for column in _COLUMNS]
+_EXPORT_SCHEMA = pa.schema([(column.name, arrow_type(column)) for column in _COLUMNS])
+
+
+def _iter_chunks(bind, chunk_rows: int, **filters):
+    """Yield lists of rows from a server-side cursor, `chunk_rows` at a time."""
+    stmt = filter_results(select(*_COLUMNS), **filters).order_by(SentimentResult.id)
+    with bind.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=chunk_rows).execute(stmt)
+        for partition in result.partitions():
+            yield partition
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _encode_csv(chunks) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(_FIELD_NAMES)
+    for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _encode_ndjson(chunks) -> Iterator[bytes]:
+    for rows in chunks:
+        yield "".join(
+            json.dumps(dict(zip(_FIELD_NAMES, row)), default=_json_default) + "\n" for row in rows
+        ).encode("utf-8")
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file object whose buffered bytes can be taken after each write."""
+
+    def __init__(self):
+        super().__init__()
+        self._parts = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _encode_parquet(chunks) -> Iterator[bytes]:
+    """One Parquet row group per chunk, emitted as soon as it is written."""
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, _EXPORT_SCHEMA, compression="zstd")
+    try:
+        for rows in chunks:
+            columns = zip(*rows)
+            batch = pa.record_batch(
+                [pa.array(values, type=field.type) for values, field in zip(columns, _EXPORT_SCHEMA)],
+                schema=_EXPORT_SCHEMA,
+            )
+            writer.write_batch(batch)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def _gzip(stream: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for data in stream:
+        compressed = compressor.compress(data)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def iter_export(fmt: str, gzip: bool = False, chunk_rows: int = 5000, bind=None,
+                label: Optional[str] = None, start: Optional[datetime] = None,
+                end: Optional[datetime] = None, keyword: Optional[str] = None,
+                source: Optional[str] = None) -> Iterator[bytes]:
+    """
+    Stream stored results as CSV, NDJSON or Parquet bytes.
+
+    Rows come off a server-side cursor `chunk_rows` at a time and each chunk
+    is encoded and handed on before the next is fetched, so memory use does
+    not grow with the size of the export.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    chunks = _iter_chunks(bind or engine, chunk_rows, label=label, start=start, end=end,
+                          keyword=keyword, source=source)
+    encoder = {"csv": _encode_csv, "ndjson": _encode_ndjson, "parquet": _encode_parquet}[fmt]
+    stream = encoder(chunks)
+    return _gzip(stream) if gzip else stream
@@ -0,0 +1,177 @@
+# database/maintenance.py
+import logging
+from typing import Dict
+
+from sqlalchemy import bindparam, delete, func, select, text, update
+
+from src.analysis.sketches import TermSketch
+
+from .bulk import content_hash, text_hash
+from .db import engine
+from .models import SentimentResult, SentimentRollup, TermSketchWindow
+from .rollups import apply_rollups
+from .terms import apply_term_sketches
+
+logger = logging.getLogger("sentilytics")
+
+CONTENT_HASH_INDEX = "ux_sentiment_results_content_hash"
+
+
+def compact_results(bind=None, batch_size: int = 5000, vacuum: bool = False) -> Dict[str, int]:
+    """
+    One-off deduplication of `sentiment_results`.
+
+    Labels stored in mixed case by older versions are lowercased first,
+    together with their rollup buckets and term windows. Rows saved before
+    `content_hash` existed then get their hashes filled in, and each group of duplicates collapses onto its oldest row, as the upsert
+    would have done: that row keeps its id, created_at, label, score and
+    model_version, and `last_seen` becomes the newest copy's timestamp.
+    The removed copies are subtracted from the rollups and term sketches in
+    the same transaction, so neither needs rebuilding afterwards.
+    """
+    from src.processing.text_cleaner import preprocess_text
+
+    bind = bind or engine
+    table = SentimentResult.__table__
+
+    with bind.begin() as conn:
+        # The unique index would reject hashes of existing duplicates.
+        conn.exec_driver_sql(f"DROP INDEX IF EXISTS {CONTENT_HASH_INDEX}")
+
+    normalized = _normalize_labels(bind)
+    hashed = _fill_hashes(bind, batch_size)
+
+    with bind.begin() as conn:
+        conn.exec_driver_sql("""
+            CREATE TEMP TABLE _dupes AS
+            SELECT content_hash,
+                   MIN(id) AS keep_id,
+                   MAX(COALESCE(last_seen, created_at)) AS last_seen
+            FROM sentiment_results
+            WHERE content_hash IS NOT NULL
+            GROUP BY content_hash
+            HAVING COUNT(*) > 1
+        """)
+        conn.exec_driver_sql("""
+            UPDATE sentiment_results
+            SET last_seen = (SELECT d.last_seen FROM _dupes d WHERE d.keep_id = sentiment_results.id),
+                updated_at = strftime('%Y-%m-%d %H:%M:%f000', 'now')
+            WHERE id IN (SELECT keep_id FROM _dupes)
+        """)
+
+        # Take the copies about to be deleted back out of the derived tables
+        doomed = text("content_hash IN (SELECT content_hash FROM _dupes) AND id NOT IN (SELECT keep_id FROM _dupes)")
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                select(table.c.id, table.c.input_text, table.c.sentiment_label, table.c.sentiment_score,
+                       table.c.keyword, table.c.source, table.c.post_created_at, table.c.created_at)
+                .where(table.c.id > last_id, doomed)
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).mappings().all()
+            if not rows:
+                break
+            apply_rollups(conn, rows, sign=-1)
+            apply_term_sketches(conn, [{**row, "terms": preprocess_text(row["input_text"]).split()}
+                                       for row in rows], sign=-1)
+            last_id = rows[-1]["id"]
+
+        removed = conn.execute(delete(table).where(doomed)).rowcount
+        conn.exec_driver_sql("DROP TABLE _dupes")
+        conn.exec_driver_sql(
+            "UPDATE sentiment_results SET last_seen = created_at WHERE last_seen IS NULL"
+        )
+        # Buckets that only ever counted removed copies
+        rollups = SentimentRollup.__table__
+        conn.execute(delete(rollups).where(rollups.c.post_count <= 0))
+
+        for index in table.indexes:
+            if index.name == CONTENT_HASH_INDEX:
+                index.create(conn)
+
+    if vacuum:
+        with bind.connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql("VACUUM")
+
+    logger.info("[Compact] Lowercased %d labels, hashed %d rows, removed %d duplicates",
+                normalized, hashed, removed)
+    return {"labels_normalized": normalized, "hashed": hashed, "duplicates_removed": removed}
+
+
+def _normalize_labels(bind) -> int:
+    """Lowercase labels (e.g. the `Neutral` placeholder) in results, rollups and term windows."""
+    windows = TermSketchWindow.__table__
+    with bind.begin() as conn:
+        relabelled = conn.exec_driver_sql("""
+            UPDATE sentiment_results
+            SET sentiment_label = lower(sentiment_label),
+                updated_at = strftime('%Y-%m-%d %H:%M:%f000', 'now')
+            WHERE sentiment_label != lower(sentiment_label)
+        """).rowcount
+
+        conn.exec_driver_sql("""
+            INSERT INTO sentiment_rollups
+                (granularity, bucket_start, keyword, source, sentiment_label, post_count, score_sum)
+            SELECT granularity, bucket_start, keyword, source, lower(sentiment_label), post_count, score_sum
+            FROM sentiment_rollups
+            WHERE sentiment_label != lower(sentiment_label)
+            ON CONFLICT (granularity, keyword, bucket_start, source, sentiment_label) DO UPDATE
+            SET post_count = post_count + excluded.post_count, score_sum = score_sum + excluded.score_sum
+        """)
+        conn.exec_driver_sql("DELETE FROM sentiment_rollups WHERE sentiment_label != lower(sentiment_label)")
+
+        mixed = conn.execute(
+            select(windows).where(windows.c.sentiment_label != func.lower(windows.c.sentiment_label))
+        ).mappings().all()
+        for window in mixed:
+            where = (windows.c.keyword == window["keyword"], windows.c.window_start == window["window_start"],
+                     windows.c.sentiment_label == window["sentiment_label"].lower())
+            sketch = TermSketch.from_bytes(window["sketch"])
+            stored = conn.execute(select(windows.c.sketch, windows.c.post_count).where(*where)).first()
+            if stored is None:
+                conn.execute(windows.insert().values(
+                    keyword=window["keyword"], window_start=window["window_start"],
+                    sentiment_label=window["sentiment_label"].lower(),
+                    post_count=window["post_count"], sketch=sketch.to_bytes()))
+            else:
+                sketch.merge(TermSketch.from_bytes(stored.sketch))
+                conn.execute(update(windows).where(*where).values(
+                    post_count=stored.post_count + window["post_count"], sketch=sketch.to_bytes()))
+            conn.execute(delete(windows).where(windows.c.id == window["id"]))
+    if relabelled:
+        logger.info("[Compact] Lowercased %d stored labels", relabelled)
+    return relabelled
+
+
+def _fill_hashes(bind, batch_size: int) -> int:
+    """Compute `content_hash` (and `text_hash`) where missing."""
+    table = SentimentResult.__table__
+    last_id = 0
+    total = 0
+    while True:
+        with bind.begin() as conn:
+            rows = conn.execute(
+                select(table.c.id, table.c.input_text, table.c.source)
+                .where(table.c.id > last_id, table.c.content_hash.is_(None))
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            conn.execute(
+                update(table).where(table.c.id == bindparam("row_id")).values(
+                    content_hash=bindparam("c_hash"), text_hash=bindparam("t_hash")
+                ),
+                [
+                    {
+                        "row_id": row.id,
+                        "c_hash": content_hash(row.input_text, row.source),
+                        "t_hash": text_hash(row.input_text),
+                    }
+                    for row in rows
+                ],
+            )
+        last_id = rows[-1].id
+        total += len(rows)
+    return total
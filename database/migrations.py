@@ -0,0 +1,69 @@
+# database/migrations.py
+import logging
+
+from sqlalchemy import bindparam, inspect, select, update
+
+from .bulk import text_hash
+from .db import engine
+from .models import SentimentResult
+
+logger = logging.getLogger("sentilytics")
+
+
+def migrate(bind=None):
+    """
+    Bring an existing `app.db` up to the current `SentimentResult` schema.
+
+    `Base.metadata.create_all` only creates missing tables, so columns and
+    indexes added to the model later are applied here. Safe to run on every
+    startup: each step is skipped when already in place.
+    """
+    bind = bind or engine
+    table = SentimentResult.__table__
+    inspector = inspect(bind)
+    if not inspector.has_table(table.name):
+        return
+
+    existing = {column["name"] for column in inspector.get_columns(table.name)}
+    missing = [column for column in table.columns if column.name not in existing]
+
+    with bind.begin() as conn:
+        for column in missing:
+            column_type = column.type.compile(dialect=bind.dialect)
+            conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+            logger.info("[Migration] Added column %s.%s", table.name, column.name)
+
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+    added = {column.name for column in missing}
+    if "text_hash" in added:
+        _backfill_text_hash(bind)
+    if "content_hash" in added:
+        logger.warning("[Migration] Existing rows have no content_hash; run `python manage.py compact` "
+                       "to hash and deduplicate them.")
+
+
+def _backfill_text_hash(bind, batch_size: int = 5000):
+    """Compute `text_hash` for rows stored before the column existed."""
+    table = SentimentResult.__table__
+    last_id = 0
+    total = 0
+    while True:
+        with bind.begin() as conn:
+            rows = conn.execute(
+                select(table.c.id, table.c.input_text)
+                .where(table.c.id > last_id, table.c.text_hash.is_(None))
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            conn.execute(
+                update(table).where(table.c.id == bindparam("row_id")).values(text_hash=bindparam("hash")),
+                [{"row_id": row.id, "hash": text_hash(row.input_text)} for row in rows],
+            )
+        last_id = rows[-1].id
+        total += len(rows)
+    if total:
+        logger.info("[Migration] Backfilled text_hash for %d rows", total)
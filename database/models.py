@@ -1,5 +1,5 @@
 # database/models.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float
+from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, Float, Index, LargeBinary
 from datetime import datetime
 from .db import Base # Import Base from db.py in the same folder
 
@@ -11,6 +11,125 @@ class SentimentResult(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     input_text = Column(Text, nullable=False)
-    sentiment_label = Column(String(50), nullable=False) # e.g., 'Positive', 'Negative'
+    sentiment_label = Column(String(50), nullable=False) # lowercase: 'positive', 'neutral', 'negative'
     sentiment_score = Column(Float, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    # Query dimensions (nullable so rows saved before they existed stay valid)
+    keyword = Column(String(200), nullable=True)
+    source = Column(String(50), nullable=True) # e.g., 'Twitter', 'Reddit'
+    post_created_at = Column(DateTime, nullable=True) # when the post was published upstream
+    text_hash = Column(String(64), nullable=True, index=True) # sha256 of input_text
+
+    # Dedup key: sha256 of (source, input_text). Re-seen posts are upserted
+    # onto the existing row and bump `last_seen` instead of adding a copy.
+    content_hash = Column(String(64), nullable=True)
+    last_seen = Column(DateTime, default=datetime.utcnow, index=True) # also drives /api/results/ Last-Modified
+    model_version = Column(String(200), nullable=True, index=True) # model that produced the label (NULL: unknown, pre-tracking)
+    updated_at = Column(DateTime, nullable=True, index=True) # last in-place rewrite (re-scoring, compaction); feeds results_version
+
+    __table_args__ = (
+        Index("ux_sentiment_results_content_hash", "content_hash", unique=True),
+        Index("ix_sentiment_results_keyword_post_created_at", "keyword", "post_created_at"),
+        Index("ix_sentiment_results_keyword_source", "keyword", "source"),
+    )
+
+
+class SentimentRollup(Base):
+    """
+    Pre-aggregated post counts per (granularity, time bucket, keyword, source, label).
+
+    Maintained incrementally by the load stage; rebuilt from raw rows with
+    `python manage.py backfill-rollups`.
+    """
+    __tablename__ = "sentiment_rollups"
+
+    id = Column(Integer, primary_key=True)
+    granularity = Column(String(10), nullable=False) # 'minute', 'hour' or 'day'
+    bucket_start = Column(DateTime, nullable=False)
+    keyword = Column(String(200), nullable=False, default="")
+    source = Column(String(50), nullable=False, default="")
+    sentiment_label = Column(String(50), nullable=False)
+    post_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        Index(
+            "ux_sentiment_rollups_bucket",
+            "granularity", "keyword", "bucket_start", "source", "sentiment_label",
+            unique=True,
+        ),
+    )
+
+
+class TermSketchWindow(Base):
+    """
+    Heavy-hitter term sketch for one (keyword, sentiment label, hour window).
+
+    `sketch` is a serialized `src.analysis.sketches.TermSketch`; windows are
+    merged at query time to cover any range.
+    """
+    __tablename__ = "term_sketches"
+
+    id = Column(Integer, primary_key=True)
+    keyword = Column(String(200), nullable=False, default="")
+    sentiment_label = Column(String(50), nullable=False)
+    window_start = Column(DateTime, nullable=False)
+    post_count = Column(Integer, nullable=False, default=0)
+    sketch = Column(LargeBinary, nullable=False)
+
+    __table_args__ = (
+        Index("ux_term_sketches_window", "keyword", "sentiment_label", "window_start", unique=True),
+    )
+
+
+class WatchedKeyword(Base):
+    """
+    A keyword the watchlist scheduler polls, with its adaptive schedule and run state.
+    """
+    __tablename__ = "watched_keywords"
+
+    id = Column(Integer, primary_key=True)
+    keyword = Column(String(200), nullable=False, unique=True)
+    max_results = Column(Integer, nullable=False, default=50) # posts per source per poll
+    enabled = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Schedule: the interval adapts between min and max to the observed post rate
+    min_interval_seconds = Column(Float, nullable=False, default=60.0)
+    max_interval_seconds = Column(Float, nullable=False, default=3600.0)
+    interval_seconds = Column(Float, nullable=False, default=300.0)
+    next_run_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    # Run state
+    runs = Column(Integer, nullable=False, default=0)
+    consecutive_failures = Column(Integer, nullable=False, default=0)
+    last_run_at = Column(DateTime, nullable=True)
+    last_success_at = Column(DateTime, nullable=True)
+    last_duration_seconds = Column(Float, nullable=True)
+    last_fetched = Column(Integer, nullable=True)
+    last_new_posts = Column(Integer, nullable=True)
+    last_error = Column(Text, nullable=True)
+    post_rate_per_hour = Column(Float, nullable=True) # EWMA of new posts per hour
+    last_post_at = Column(DateTime, nullable=True) # newest post seen upstream
+
+
+class RescoreCheckpoint(Base):
+    """
+    Progress of re-scoring stored results with one model, committed with each batch.
+
+    A crashed or stopped job resumes after `last_id`.
+    """
+    __tablename__ = "rescore_checkpoints"
+
+    id = Column(Integer, primary_key=True)
+    model_version = Column(String(200), nullable=False, unique=True)
+    status = Column(String(20), nullable=False, default="running") # running, stopped, done, failed
+    last_id = Column(Integer, nullable=False, default=0) # highest sentiment_results.id processed
+    rows_total = Column(Integer, nullable=False, default=0) # rows needing re-scoring when the job (re)started
+    rows_done = Column(Integer, nullable=False, default=0)
+    rows_changed = Column(Integer, nullable=False, default=0) # rows whose label changed
+    started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
@@ -0,0 +1,181 @@
+# database/queries.py
+import base64
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from .db import SessionLocal
+from .models import SentimentResult
+
+logger = logging.getLogger("sentilytics")
+
+
+# --- Keyset cursors ---
+def pack_cursor(payload: Dict) -> str:
+    """Encode a keyset position as an opaque URL-safe token."""
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def unpack_cursor(cursor: str) -> Dict:
+    """Inverse of `pack_cursor`; raises ValueError on a malformed cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid cursor")
+    return payload
+
+
+def encode_cursor(last_id: int) -> str:
+    """Opaque cursor pointing just past `last_id`."""
+    return pack_cursor({"id": int(last_id)})
+
+
+def decode_cursor(cursor: str) -> int:
+    """Inverse of `encode_cursor`; raises ValueError on a malformed cursor."""
+    try:
+        return int(unpack_cursor(cursor)["id"])
+    except (KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+# --- Filters ---
+def filter_results(query, label: Optional[str] = None,
+                   start: Optional[datetime] = None, end: Optional[datetime] = None,
+                   keyword: Optional[str] = None, source: Optional[str] = None):
+    """Apply the optional `/api/results/` filters to a SentimentResult query."""
+    if keyword:
+        query = query.filter(SentimentResult.keyword == keyword)
+    if source:
+        query = query.filter(SentimentResult.source == source)
+    if label:
+        query = query.filter(SentimentResult.sentiment_label == label.lower())
+    if start:
+        query = query.filter(SentimentResult.created_at >= start)
+    if end:
+        query = query.filter(SentimentResult.created_at < end)
+    return query
+
+
+# --- Cached counts ---
+class CachedCount:
+    """
+    Stale-while-revalidate cache for expensive COUNT(*) queries.
+
+    `get()` returns the cached value and, once the entry is older than
+    `ttl` seconds, starts a background refresh. On a cold key it returns
+    `fallback()` as an estimate; when there is no cheap estimate it counts
+    once on the request path and caches the result.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[int, float]] = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, compute: Callable[[], int],
+            fallback: Callable[[], Optional[int]] = lambda: None) -> Tuple[int, bool]:
+        """Return `(total, is_estimate)`."""
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is None:
+            estimate = fallback()
+            if estimate is None:
+                value = compute()
+                self._store(key, value)
+                return value, False
+        stale = entry is None or time.monotonic() - entry[1] > self.ttl
+        if stale:
+            with self._lock:
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    threading.Thread(target=self._refresh, args=(key, compute), daemon=True).start()
+
+        if entry is not None:
+            return entry[0], stale
+        return estimate, True
+
+    def _store(self, key: Hashable, value: int):
+        with self._lock:
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                oldest = min(self._entries, key=lambda k: self._entries[k][1])
+                del self._entries[oldest]
+            self._entries[key] = (value, time.monotonic())
+
+    def _refresh(self, key: Hashable, compute: Callable[[], int]):
+        try:
+            self._store(key, compute())
+        except Exception:
+            logger.exception("[CachedCount] Refresh failed for %s", key)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+
+result_counts = CachedCount()
+
+
+def count_results(label: Optional[str] = None,
+                  start: Optional[datetime] = None, end: Optional[datetime] = None) -> Tuple[int, bool]:
+    """Cached total for the given filters; `(total, is_estimate)`."""
+
+    def compute() -> int:
+        db = SessionLocal()
+        try:
+            return filter_results(db.query(func.count(SentimentResult.id)), label, start, end).scalar() or 0
+        finally:
+            db.close()
+
+    def approximate() -> Optional[int]:
+        # Unfiltered: rowids are dense unless rows were deleted, so MAX(id)
+        # is an O(1) upper bound. Filtered totals are counted on first use.
+        if label or start or end:
+            return None
+        db = SessionLocal()
+        try:
+            return db.query(func.max(SentimentResult.id)).scalar() or 0
+        finally:
+            db.close()
+
+    return result_counts.get((label and label.lower(), start, end), compute, approximate)
+
+
+# --- Change detection (HTTP validators) ---
+def results_version(db) -> Tuple[Tuple, Optional[datetime]]:
+    """
+    Cheap fingerprint of the results table: `(version, last_modified)`.
+
+    MIN/MAX(id) move on inserts and on archiving (which deletes oldest ids
+    first); MAX(last_seen) moves when an upsert refreshes an existing row;
+    MAX(updated_at) moves when re-scoring or compaction rewrites rows in
+    place. All are answered from an index, so this is O(log n).
+    """
+    # One scalar subquery per aggregate: SQLite only uses the index shortcut
+    # for a lone MIN()/MAX(), not for several in the same SELECT.
+    min_id, max_id, last_seen, created_at, updated_at = db.query(*(
+        select(aggregate).scalar_subquery() for aggregate in (
+            func.min(SentimentResult.id),
+            func.max(SentimentResult.id),
+            func.max(SentimentResult.last_seen),
+            func.max(SentimentResult.created_at),
+            func.max(SentimentResult.updated_at),
+        )
+    )).one()
+    last_modified = max((t for t in (last_seen, created_at, updated_at) if t is not None), default=None)
+    version = (min_id, max_id, last_modified and last_modified.isoformat(), updated_at and updated_at.isoformat())
+    return version, last_modified
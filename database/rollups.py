@@ -0,0 +1,154 @@
+# database/rollups.py
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from .db import engine
+from .models import SentimentRollup
+
+logger = logging.getLogger("sentilytics")
+
+GRANULARITIES = ("minute", "hour", "day")
+
+# strftime patterns matching how SQLAlchemy stores DateTime on SQLite, so
+# SQL-built and Python-built buckets compare equal.
+_SQL_BUCKET_FORMATS = {
+    "minute": "%Y-%m-%d %H:%M:00.000000",
+    "hour": "%Y-%m-%d %H:00:00.000000",
+    "day": "%Y-%m-%d 00:00:00.000000",
+}
+
+
+def bucket_start(ts: datetime, granularity: str) -> datetime:
+    """Truncate a timestamp to the start of its bucket."""
+    if granularity == "minute":
+        return ts.replace(second=0, microsecond=0)
+    if granularity == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def apply_rollups(conn, rows: List[Dict], sign: int = 1) -> int:
+    """
+    Add newly inserted result rows to the rollup tables.
+
+    Runs on the caller's connection so the counts commit (or roll back)
+    together with the raw insert. Posts are bucketed by `post_created_at`,
+    falling back to the insert time. `sign=-1` subtracts the rows instead
+    (re-scoring removes a row's old label before adding its new one).
+    """
+    if not rows:
+        return 0
+
+    now = datetime.utcnow()
+    totals = defaultdict(lambda: [0, 0.0])
+    for row in rows:
+        ts = row.get("post_created_at") or row.get("created_at") or now
+        key_rest = (row.get("keyword") or "", row.get("source") or "", row["sentiment_label"])
+        score = row.get("sentiment_score") or 0.0
+        for granularity in GRANULARITIES:
+            entry = totals[(granularity, bucket_start(ts, granularity)) + key_rest]
+            entry[0] += sign
+            entry[1] += sign * score
+
+    params = [
+        {
+            "granularity": granularity,
+            "bucket_start": start,
+            "keyword": keyword,
+            "source": source,
+            "sentiment_label": label,
+            "post_count": count,
+            "score_sum": score_sum,
+        }
+        for (granularity, start, keyword, source, label), (count, score_sum) in totals.items()
+    ]
+
+    stmt = sqlite_insert(SentimentRollup.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["granularity", "keyword", "bucket_start", "source", "sentiment_label"],
+        set_={
+            "post_count": SentimentRollup.__table__.c.post_count + stmt.excluded.post_count,
+            "score_sum": SentimentRollup.__table__.c.score_sum + stmt.excluded.score_sum,
+        },
+    )
+    conn.execute(stmt, params)
+    return len(params)
+
+
+def backfill_rollups(bind=None, archive_dir: Optional[str] = None) -> int:
+    """
+    Rebuild every rollup bucket from the raw rows.
+
+    Rows still in `sentiment_results` are aggregated in SQL; rows already
+    moved to the Parquet archive are folded in afterwards, so archiving
+    never costs trend history. Runs in one transaction: readers keep
+    seeing the old buckets until the rebuild commits.
+    """
+    from .archive import ARCHIVE_DIR, iter_archived_rows
+
+    bind = bind or engine
+    with bind.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM sentiment_rollups")
+        for granularity, fmt in _SQL_BUCKET_FORMATS.items():
+            conn.exec_driver_sql(
+                """
+                INSERT INTO sentiment_rollups
+                    (granularity, bucket_start, keyword, source, sentiment_label, post_count, score_sum)
+                SELECT ?, strftime(?, COALESCE(post_created_at, created_at)),
+                       COALESCE(keyword, ''), COALESCE(source, ''), lower(sentiment_label),
+                       COUNT(*), COALESCE(SUM(sentiment_score), 0.0)
+                FROM sentiment_results
+                WHERE COALESCE(post_created_at, created_at) IS NOT NULL
+                GROUP BY 2, 3, 4, 5
+                """,
+                (granularity, fmt),
+            )
+        columns = ["keyword", "source", "sentiment_label", "sentiment_score", "post_created_at", "created_at"]
+        for rows in iter_archived_rows(columns, archive_dir=archive_dir or ARCHIVE_DIR):
+            apply_rollups(conn, [row for row in rows if row["post_created_at"] or row["created_at"]])
+        total = conn.exec_driver_sql("SELECT COUNT(*) FROM sentiment_rollups").scalar()
+    logger.info("[Rollups] Rebuilt %d buckets", total)
+    return total
+
+
+def query_trends(db, keyword: str, granularity: str = "hour", source: Optional[str] = None,
+                 start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict]:
+    """Per-bucket label counts and mean score for a keyword, read from the rollups."""
+    query = (
+        db.query(
+            SentimentRollup.bucket_start,
+            SentimentRollup.sentiment_label,
+            func.sum(SentimentRollup.post_count),
+            func.sum(SentimentRollup.score_sum),
+        )
+        .filter(SentimentRollup.granularity == granularity, SentimentRollup.keyword == keyword)
+    )
+    if source:
+        query = query.filter(SentimentRollup.source == source)
+    if start:
+        query = query.filter(SentimentRollup.bucket_start >= bucket_start(start, granularity))
+    if end:
+        query = query.filter(SentimentRollup.bucket_start < end)
+
+    buckets: Dict[datetime, Dict] = {}
+    rows = query.group_by(SentimentRollup.bucket_start, SentimentRollup.sentiment_label) \
+        .order_by(SentimentRollup.bucket_start).all()
+    for bucket, label, count, score_sum in rows:
+        entry = buckets.setdefault(bucket, {"bucket_start": bucket, "total": 0, "counts": {}, "score_sum": 0.0})
+        entry["counts"][label] = count
+        entry["total"] += count
+        entry["score_sum"] += score_sum or 0.0
+
+    result = []
+    for entry in buckets.values():
+        score_sum = entry.pop("score_sum")
+        entry["avg_score"] = round(score_sum / entry["total"], 4) if entry["total"] else 0.0
+        result.append(entry)
+    return result
@@ -0,0 +1,157 @@
+# database/search.py
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.exc import OperationalError
+
+from .db import engine
+from .queries import pack_cursor, unpack_cursor
+
+logger = logging.getLogger("sentilytics")
+
+FTS_TABLE = "sentiment_results_fts"
+SEARCH_MODES = ("terms", "phrase", "prefix")
+
+# External-content FTS5 index over sentiment_results.input_text. Triggers
+# keep it in sync with every write path (bulk upserts, compaction, archive
+# deletes) without the callers knowing it exists.
+_FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        input_text,
+        content='sentiment_results',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS sentiment_results_fts_ai AFTER INSERT ON sentiment_results BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, input_text) VALUES (new.id, new.input_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS sentiment_results_fts_ad AFTER DELETE ON sentiment_results BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, input_text) VALUES ('delete', old.id, old.input_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS sentiment_results_fts_au AFTER UPDATE OF input_text ON sentiment_results BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, input_text) VALUES ('delete', old.id, old.input_text);
+        INSERT INTO {FTS_TABLE}(rowid, input_text) VALUES (new.id, new.input_text);
+    END
+    """,
+]
+
+_fts_available = False
+
+
+def ensure_fts(bind=None) -> bool:
+    """
+    Create the FTS5 table and sync triggers if missing.
+
+    A freshly created index over a non-empty table is populated with a
+    rebuild. Returns False (and search stays disabled) when the SQLite build
+    has no FTS5 support.
+    """
+    global _fts_available
+    bind = bind or engine
+    existed = inspect(bind).has_table(FTS_TABLE)
+    try:
+        with bind.begin() as conn:
+            for statement in _FTS_DDL:
+                conn.exec_driver_sql(statement)
+    except OperationalError:
+        logger.warning("[Search] SQLite FTS5 unavailable; /api/search disabled.")
+        _fts_available = False
+        return False
+
+    _fts_available = True
+    if not existed:
+        rebuild_fts(bind)
+    return True
+
+
+def fts_available() -> bool:
+    return _fts_available
+
+
+def rebuild_fts(bind=None, optimize: bool = True):
+    """Re-index every stored post from `sentiment_results`."""
+    bind = bind or engine
+    with bind.begin() as conn:
+        conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        if optimize:
+            conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+    logger.info("[Search] Rebuilt full-text index")
+
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(q: str, mode: str = "terms") -> str:
+    """
+    Turn user input into an FTS5 MATCH expression.
+
+    Input is never passed through as FTS syntax: "terms" matches all words in
+    any order, "phrase" matches them adjacent and in order, and "prefix"
+    treats every word as a prefix (`micro` matches `microsoft`).
+    """
+    tokens = _TOKEN_RE.findall(q)
+    if not tokens:
+        raise ValueError("Query has no searchable words")
+    if mode == "phrase":
+        return '"' + " ".join(tokens) + '"'
+    if mode == "prefix":
+        return " ".join(f'"{token}"*' for token in tokens)
+    if mode == "terms":
+        return " ".join(f'"{token}"' for token in tokens)
+    raise ValueError(f"Unknown search mode: {mode}")
+
+
+def search_results(q: str, mode: str = "terms", label: Optional[str] = None,
+                   limit: int = 50, cursor: Optional[str] = None,
+                   bind=None) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Ranked full-text search over stored posts.
+
+    Results are ordered by bm25 (best first) then id; `cursor` continues
+    after the last row of the previous page. Returns `(rows, next_cursor)`.
+    """
+    bind = bind or engine
+    params = {"match": build_match_query(q, mode), "limit": limit, "label": None,
+              "after_rank": None, "after_id": None}
+    if label:
+        params["label"] = label.lower()
+    if cursor:
+        position = unpack_cursor(cursor)
+        try:
+            params["after_rank"] = float(position["rank"])
+            params["after_id"] = int(position["id"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError("Invalid cursor") from e
+
+    sql = f"""
+        SELECT * FROM (
+            SELECT r.id, r.input_text, r.sentiment_label, r.sentiment_score,
+                   r.keyword, r.source, r.post_created_at, r.created_at,
+                   bm25({FTS_TABLE}) AS rank
+            FROM {FTS_TABLE}
+            JOIN sentiment_results r ON r.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH :match
+              AND (:label IS NULL OR r.sentiment_label = :label)
+        )
+        WHERE :after_rank IS NULL
+           OR rank > :after_rank
+           OR (rank = :after_rank AND id > :after_id)
+        ORDER BY rank, id
+        LIMIT :limit
+    """
+    with bind.connect() as conn:
+        rows = [dict(row) for row in conn.exec_driver_sql(sql, params).mappings()]
+
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = pack_cursor({"rank": rows[-1]["rank"], "id": rows[-1]["id"]})
+    return rows, next_cursor
@@ -0,0 +1,165 @@
+# database/terms.py
+import logging
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from src.analysis.sketches import TermSketch
+
+from .db import engine
+from .models import SentimentResult, TermSketchWindow
+from .rollups import bucket_start
+
+logger = logging.getLogger("sentilytics")
+
+# Sketch window size; any `rollups` granularity works.
+TERM_WINDOW = "hour"
+
+
+def apply_term_sketches(conn, rows: List[Dict], sign: int = 1) -> int:
+    """
+    Fold the cleaned terms of newly inserted rows into their window sketches.
+
+    Rows carry their stopword-filtered tokens under `terms` (set by
+    `dataframe_to_rows` from the cleaning stage); rows without it are
+    skipped. Runs on the caller's connection, after its write, so the
+    read-merge-write of each sketch happens under SQLite's write lock.
+    `sign=-1` takes the rows' terms back out of their windows instead
+    (re-scoring moves a post's terms from its old label to its new one).
+    """
+    grouped: Dict[tuple, Counter] = defaultdict(Counter)
+    posts = defaultdict(int)
+    now = datetime.utcnow()
+    for row in rows:
+        terms = row.get("terms")
+        if not terms:
+            continue
+        ts = row.get("post_created_at") or row.get("created_at") or now
+        key = (row.get("keyword") or "", row["sentiment_label"], bucket_start(ts, TERM_WINDOW))
+        grouped[key].update(terms)
+        posts[key] += 1
+
+    if not grouped:
+        return 0
+
+    table = TermSketchWindow.__table__
+    params = []
+    for key, terms in grouped.items():
+        keyword, label, window = key
+        where = (table.c.keyword == keyword, table.c.sentiment_label == label, table.c.window_start == window)
+        stored = conn.execute(select(table.c.sketch, table.c.post_count).where(*where)).first()
+        if sign < 0:
+            if stored is None:
+                continue
+            if stored.post_count - posts[key] <= 0:
+                conn.execute(delete(table).where(*where))
+                continue
+            sketch = TermSketch.from_bytes(stored.sketch)
+            sketch.subtract_terms(terms.elements())
+            conn.execute(update(table).where(*where).values(
+                post_count=table.c.post_count - posts[key], sketch=sketch.to_bytes()))
+            continue
+
+        sketch = TermSketch()
+        sketch.add_terms(terms.elements())
+        if stored is not None:
+            sketch.merge(TermSketch.from_bytes(stored.sketch))
+        params.append({
+            "keyword": keyword,
+            "sentiment_label": label,
+            "window_start": window,
+            "post_count": posts[key],
+            "sketch": sketch.to_bytes(),
+        })
+
+    if params:
+        stmt = sqlite_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["keyword", "sentiment_label", "window_start"],
+            set_={"post_count": table.c.post_count + stmt.excluded.post_count, "sketch": stmt.excluded.sketch},
+        )
+        conn.execute(stmt, params)
+    return len(grouped)
+
+
+def backfill_term_sketches(bind=None, batch_size: int = 5000, archive_dir: Optional[str] = None) -> int:
+    """
+    Rebuild every term sketch by re-cleaning the stored `input_text` (one-off).
+
+    Covers rows in `sentiment_results` and rows already moved to the
+    Parquet archive, so archived windows keep their top terms.
+    """
+    from src.processing.text_cleaner import preprocess_text
+    from .archive import ARCHIVE_DIR, iter_archived_rows
+
+    bind = bind or engine
+    table = SentimentResult.__table__
+    with bind.begin() as conn:
+        conn.execute(TermSketchWindow.__table__.delete())
+
+    last_id = 0
+    total = 0
+    while True:
+        with bind.begin() as conn:
+            rows = conn.execute(
+                select(table.c.id, table.c.input_text, table.c.keyword, table.c.sentiment_label,
+                       table.c.post_created_at, table.c.created_at)
+                .where(table.c.id > last_id)
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).mappings().all()
+            if not rows:
+                break
+            apply_term_sketches(conn, [
+                {**row, "sentiment_label": row["sentiment_label"].lower(),
+                 "terms": preprocess_text(row["input_text"]).split()} for row in rows
+            ])
+        last_id = rows[-1]["id"]
+        total += len(rows)
+
+    columns = ["input_text", "keyword", "sentiment_label", "post_created_at", "created_at"]
+    for rows in iter_archived_rows(columns, batch_size=batch_size, archive_dir=archive_dir or ARCHIVE_DIR):
+        with bind.begin() as conn:
+            apply_term_sketches(conn, [
+                {**row, "terms": preprocess_text(row["input_text"]).split()} for row in rows
+            ])
+        total += len(rows)
+    logger.info("[Terms] Rebuilt term sketches from %d rows", total)
+    return total
+
+
+def query_top_terms(db, keyword: str, label: Optional[str] = None, start: Optional[datetime] = None,
+                    end: Optional[datetime] = None, limit: int = 20) -> Dict[str, Dict]:
+    """Merge the window sketches in [start, end) and return the top terms per label."""
+    query = db.query(TermSketchWindow).filter(TermSketchWindow.keyword == keyword)
+    if label:
+        query = query.filter(TermSketchWindow.sentiment_label == label.lower())
+    if start:
+        query = query.filter(TermSketchWindow.window_start >= bucket_start(start, TERM_WINDOW))
+    if end:
+        query = query.filter(TermSketchWindow.window_start < end)
+
+    merged: Dict[str, TermSketch] = {}
+    posts = defaultdict(int)
+    windows = defaultdict(int)
+    for record in query.yield_per(200):
+        sketch = TermSketch.from_bytes(record.sketch)
+        if record.sentiment_label in merged:
+            merged[record.sentiment_label].merge(sketch)
+        else:
+            merged[record.sentiment_label] = sketch
+        posts[record.sentiment_label] += record.post_count
+        windows[record.sentiment_label] += 1
+
+    return {
+        label: {
+            "posts": posts[label],
+            "windows": windows[label],
+            "total_terms": sketch.total,
+            "terms": [{"term": term, "count": count} for term, count in sketch.most_common(limit)],
+        }
+        for label, sketch in merged.items()
+    }
@@ -0,0 +1,327 @@
+# database/write_behind.py
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import DateTime
+
+from .bulk import bulk_upsert_results
+from .models import SentimentResult
+
+logger = logging.getLogger("sentilytics")
+
+OVERFLOW_POLICIES = ("block", "drop", "spill")
+
+# Spill-file key recording how many times a row's batch has failed to write.
+_ATTEMPTS_KEY = "_write_attempts"
+
+# Columns that need converting back to datetime when replaying the spill file.
+_DATETIME_COLUMNS = {
+    column.name for column in SentimentResult.__table__.columns
+    if isinstance(column.type, DateTime)
+}
+
+
+class WriteBehindWriter:
+    """
+    Bounded in-memory queue drained by a background thread.
+
+    Producers call `submit()` and return immediately; the writer thread
+    coalesces queued rows into batched transactions, flushing once
+    `batch_size` rows are waiting or `flush_interval` seconds have passed.
+    When the queue is full the `overflow` policy decides what happens:
+    "block" waits up to `block_timeout` seconds (then drops), "drop" discards
+    the rows, and "spill" appends them to `spill_path` to be replayed later.
+
+    With "spill", failed batch writes are spilled too. A replay that fails
+    backs off exponentially (up to `max_replay_backoff` seconds) instead of
+    re-reading the file on every idle flush, and rows whose batch has
+    failed `max_write_attempts` times are moved to `<spill_path>.quarantine`
+    for manual inspection.
+    """
+
+    def __init__(
+        self,
+        write_fn: Callable[[List[Dict]], int] = bulk_upsert_results,
+        max_queue_rows: int = 10000,
+        batch_size: int = 1000,
+        flush_interval: float = 1.0,
+        overflow: str = "block",
+        block_timeout: float = 5.0,
+        spill_path: str = "./write_behind_spill.ndjson",
+        max_write_attempts: int = 5,
+        max_replay_backoff: float = 300.0,
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+
+        self.write_fn = write_fn
+        self.max_queue_rows = max_queue_rows
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.spill_path = spill_path
+        self.quarantine_path = spill_path + ".quarantine"
+        self.max_write_attempts = max_write_attempts
+        self.max_replay_backoff = max_replay_backoff
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_rows)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._flush_requested = threading.Event()
+        self._spill_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._batch_oldest: Optional[float] = None
+        self._replay_backoff = 0.0
+        self._next_replay_at = 0.0
+        self._stats = {
+            "rows_submitted": 0,
+            "rows_written": 0,
+            "rows_dropped": 0,
+            "rows_spilled": 0,
+            "rows_quarantined": 0,
+            "replay_failures": 0,
+            "batches_written": 0,
+            "write_errors": 0,
+            "last_flush_at": None,
+            "last_batch_rows": 0,
+            "last_batch_lag_seconds": 0.0,
+        }
+
+    # --- Lifecycle ---
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the background writer thread (idempotent)."""
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+        logger.info("[WriteBehind] Started (max_queue_rows=%d, batch_size=%d, overflow=%s)",
+                    self.max_queue_rows, self.batch_size, self.overflow)
+
+    def stop(self, timeout: float = 30.0):
+        """Flush everything still queued, then stop the writer thread."""
+        if not self.running:
+            return
+        self._stopping.set()
+        self._flush_requested.set()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning("[WriteBehind] Stop timed out with %d rows queued", self._queue.qsize())
+        else:
+            logger.info("[WriteBehind] Stopped. Rows written: %d", self._stats["rows_written"])
+        self._thread = None
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Block until every submitted row has been written; False on timeout."""
+        deadline = time.monotonic() + timeout
+        self._flush_requested.set()
+        while self._queue.unfinished_tasks:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    # --- Producer side ---
+    def submit(self, rows: Iterable[Dict]) -> int:
+        """Queue rows for writing; returns how many were accepted into the queue."""
+        rows = list(rows)
+        accepted = 0
+        now = time.monotonic()
+        for index, row in enumerate(rows):
+            item = (now, row)
+            try:
+                if self.overflow == "block":
+                    self._queue.put(item, timeout=self.block_timeout)
+                else:
+                    self._queue.put_nowait(item)
+                accepted += 1
+            except queue.Full:
+                self._handle_overflow(rows[index:])
+                break
+
+        with self._stats_lock:
+            self._stats["rows_submitted"] += len(rows)
+        return accepted
+
+    def _handle_overflow(self, rows: List[Dict]):
+        if self.overflow == "spill":
+            self._spill(rows)
+        else:
+            logger.warning("[WriteBehind] Queue full, dropping %d rows", len(rows))
+            with self._stats_lock:
+                self._stats["rows_dropped"] += len(rows)
+
+    # --- Spill file ---
+    def _spill(self, rows: List[Dict], attempts: int = 0, path: Optional[str] = None,
+               stat: str = "rows_spilled"):
+        try:
+            with self._spill_lock, open(path or self.spill_path, "a", encoding="utf-8") as fh:
+                for row in rows:
+                    if attempts:
+                        row = {**row, _ATTEMPTS_KEY: attempts}
+                    fh.write(json.dumps(row, default=_json_default) + "\n")
+            with self._stats_lock:
+                self._stats[stat] += len(rows)
+        except OSError:
+            logger.exception("[WriteBehind] Spill failed, dropping %d rows", len(rows))
+            with self._stats_lock:
+                self._stats["rows_dropped"] += len(rows)
+
+    def _replay_spill(self):
+        """Write back spilled rows, backing off while replays keep failing."""
+        if time.monotonic() < self._next_replay_at:
+            return
+        with self._spill_lock:
+            if not os.path.exists(self.spill_path) or os.path.getsize(self.spill_path) == 0:
+                return
+            with open(self.spill_path, encoding="utf-8") as fh:
+                rows = [_restore_datetimes(json.loads(line)) for line in fh if line.strip()]
+            os.remove(self.spill_path)
+
+        logger.info("[WriteBehind] Replaying %d spilled rows", len(rows))
+        failed = False
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            attempts = max(row.pop(_ATTEMPTS_KEY, 0) for row in batch)
+            failed |= not self._write_batch(batch, oldest_enqueued=None, attempts=attempts)
+
+        if failed:
+            self._replay_backoff = min(max(2 * self._replay_backoff, self.flush_interval), self.max_replay_backoff)
+            self._next_replay_at = time.monotonic() + self._replay_backoff
+            with self._stats_lock:
+                self._stats["replay_failures"] += 1
+            logger.warning("[WriteBehind] Replay failed, retrying in %.1fs", self._replay_backoff)
+        else:
+            self._replay_backoff = 0.0
+
+    # --- Consumer side ---
+    def _run(self):
+        self._replay_spill()
+        while True:
+            batch, oldest = self._collect_batch()
+            if batch:
+                self._write_batch(batch, oldest)
+                with self._stats_lock:
+                    self._batch_oldest = None
+                for _ in batch:
+                    self._queue.task_done()
+            elif self._stopping.is_set():
+                break
+            elif self._queue.empty():
+                self._flush_requested.clear()
+                if self.overflow == "spill":
+                    self._replay_spill()
+
+    def _collect_batch(self):
+        """Gather up to `batch_size` rows, waiting at most `flush_interval`."""
+        batch: List[Dict] = []
+        oldest = None
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            if self._flush_requested.is_set():
+                timeout = 0.0
+            else:
+                timeout = max(0.0, deadline - time.monotonic())
+            try:
+                enqueued_at, row = self._queue.get(timeout=timeout) if timeout else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if oldest is None:
+                oldest = enqueued_at
+                with self._stats_lock:
+                    self._batch_oldest = enqueued_at
+            batch.append(row)
+        return batch, oldest
+
+    def _write_batch(self, batch: List[Dict], oldest_enqueued: Optional[float], attempts: int = 0) -> bool:
+        """Write one batch; `attempts` is how many times it already failed. False on failure."""
+        try:
+            written = self.write_fn(batch)
+        except Exception:
+            logger.exception("[WriteBehind] Batch write of %d rows failed", len(batch))
+            with self._stats_lock:
+                self._stats["write_errors"] += 1
+            attempts += 1
+            if self.overflow != "spill":
+                with self._stats_lock:
+                    self._stats["rows_dropped"] += len(batch)
+            elif attempts >= self.max_write_attempts:
+                logger.error("[WriteBehind] Quarantining %d rows after %d failed writes (see %s)",
+                             len(batch), attempts, self.quarantine_path)
+                self._spill(batch, attempts, path=self.quarantine_path, stat="rows_quarantined")
+            else:
+                self._spill(batch, attempts)
+            return False
+
+        with self._stats_lock:
+            self._stats["rows_written"] += written
+            self._stats["batches_written"] += 1
+            self._stats["last_flush_at"] = datetime.utcnow().isoformat()
+            self._stats["last_batch_rows"] = written
+            if oldest_enqueued is not None:
+                self._stats["last_batch_lag_seconds"] = round(time.monotonic() - oldest_enqueued, 4)
+        return True
+
+    # --- Metrics ---
+    def metrics(self) -> Dict:
+        """Queue depth, lag and throughput counters."""
+        with self._queue.mutex:
+            queued = len(self._queue.queue)
+            pending = self._queue.unfinished_tasks
+            oldest = self._queue.queue[0][0] if self._queue.queue else None
+        with self._stats_lock:
+            stats = dict(self._stats)
+            if self._batch_oldest is not None:
+                oldest = self._batch_oldest
+        stats.update({
+            "running": self.running,
+            "overflow_policy": self.overflow,
+            "queue_depth": queued,
+            "queue_capacity": self.max_queue_rows,
+            "replay_backoff_seconds": round(self._replay_backoff, 2),
+            "rows_in_flight": pending - queued,
+            "oldest_pending_age_seconds": round(time.monotonic() - oldest, 4) if oldest else 0.0,
+        })
+        return stats
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _restore_datetimes(row: Dict) -> Dict:
+    for name in _DATETIME_COLUMNS.intersection(row):
+        if isinstance(row[name], str):
+            row[name] = datetime.fromisoformat(row[name])
+    return row
+
+
+# Singleton pattern (Standard Python)
+_writer_instance = None
+
+def get_writer() -> WriteBehindWriter:
+    global _writer_instance
+    if _writer_instance is None:
+        _writer_instance = WriteBehindWriter(
+            max_queue_rows=int(os.getenv("WRITE_BEHIND_MAX_ROWS", "10000")),
+            batch_size=int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "1000")),
+            flush_interval=float(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL", "1.0")),
+            overflow=os.getenv("WRITE_BEHIND_OVERFLOW", "block"),
+            block_timeout=float(os.getenv("WRITE_BEHIND_BLOCK_TIMEOUT", "5.0")),
+            spill_path=os.getenv("WRITE_BEHIND_SPILL_PATH", "./write_behind_spill.ndjson"),
+            max_write_attempts=int(os.getenv("WRITE_BEHIND_MAX_WRITE_ATTEMPTS", "5")),
+        )
+    return _writer_instance
@@ -1,20 +1,50 @@
 from dotenv import load_dotenv
 load_dotenv()
 
-from fastapi import FastAPI, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Optional
 import logging
 import asyncio
 import os
+import time
 
 from database.db import engine, get_db
 from database import models
+from database.archive import query_archive, start_retention_job, stop_retention_job
+from database.export import EXPORT_FORMATS, iter_export
+from database.migrations import migrate
+from database.queries import count_results, decode_cursor, encode_cursor, filter_results, results_version
+from database.rollups import GRANULARITIES, query_trends
+from database.search import SEARCH_MODES, ensure_fts, fts_available, search_results
+from database.terms import TERM_WINDOW, query_top_terms
+from database.write_behind import get_writer
 from src.processing.pipeline import run_sentiment_pipeline
+from src.analysis.shifts import get_shift_detector
+from src.analysis.clusters import get_topic_clusters
+from src.analysis.model import analyzer_metrics
+from src.api.admission import Overloaded, get_admission
+from src.connectors.budget import UpstreamBudgetExhausted, get_upstream_budget
+from src.api.caching import (
+    is_not_modified, make_etag, not_modified_response, sentiment_cache, validator_headers,
+)
+from src.processing.jobs import JobQueueFull, get_job_manager, page_result_set
+from src.processing.watchlist import get_watchlist_scheduler, list_watches, watch_state
+from src.processing.rescoring import get_rescore_job
+from src.api.responses import (
+    RESPONSE_FORMATS, dumps, fast_json_response, records_to_columns, sentiment_payload,
+)
+from src.processing.streaming import STREAM_FORMATS, encode_ndjson, encode_sse, iter_stream_events
 
 # --- Create Tables ---
 models.Base.metadata.create_all(bind=engine)
+migrate(engine)
+ensure_fts(engine)
 
 # --- Logging setup ---
 logger = logging.getLogger("sentilytics")
@@ -26,11 +56,40 @@ logging.basicConfig(
 logger.info("[ENV] Reddit client ID present: %s", bool(os.getenv("REDDIT_CLIENT_ID")))
 logger.info("[ENV] Reddit secret present: %s", bool(os.getenv("REDDIT_CLIENT_SECRET")))
 
+# --- Lifespan (background services) ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    writer = get_writer()
+    writer.start()
+    get_admission().start()
+    # Background pipeline work shares the admission cap with requests
+    scheduler = get_watchlist_scheduler()
+    scheduler.admit = get_admission().hold
+    rescore = get_rescore_job()
+    rescore.admit = get_admission().hold
+    rescore.should_yield = get_admission().busy  # let live analyses have the CPU first
+    if os.getenv("WATCHLIST_ENABLED", "0") == "1":  # opt-in: polls spend upstream budget unattended
+        scheduler.start()
+    if os.getenv("RESCORE_AUTO_RESUME", "1") != "0":
+        rescore.resume_interrupted()
+    if os.getenv("ARCHIVE_INTERVAL_HOURS"):
+        start_retention_job(float(os.getenv("ARCHIVE_INTERVAL_HOURS")))
+    yield
+    stop_retention_job()
+    await asyncio.to_thread(get_watchlist_scheduler().stop)
+    await asyncio.to_thread(get_rescore_job().stop)
+    get_admission().shutdown()
+    get_job_manager().shutdown()
+    # Graceful shutdown: flush queued rows before the process exits
+    await asyncio.to_thread(writer.stop)
+
 # --- Initialize ---
 app = FastAPI(
     title="Sentilytics 360 API",
     description="API for real-time sentiment analysis across social platforms.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # --- CORS (Important for frontend working on another port) ---
@@ -40,7 +99,7 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=[frontend_url, "http://localhost:3000", "http://127.0.0.1:3000"],
     allow_credentials=True,
-    allow_methods=["GET", "POST"],
+    allow_methods=["GET", "POST", "DELETE"],
     allow_headers=["Content-Type"],
 )
 
@@ -61,6 +120,13 @@ class AnalysisResponse(BaseModel):
     status: str
     message: str
 
+
+class WatchRequest(BaseModel):
+    keyword: str
+    max_results: int = 50
+    min_interval_seconds: float = 60.0
+    max_interval_seconds: float = 3600.0
+
 # ---------------------------------------------------------
 # Helper functions
 # ---------------------------------------------------------
@@ -69,20 +135,19 @@ def credentials_available() -> bool:
     return bool(os.getenv("TWITTER_BEARER_TOKEN")) or bool(os.getenv("REDDIT_CLIENT_ID"))
 
 
-async def _run_pipeline_in_thread(keyword: str, max_results: int):
-    """Run blocking pipeline in a background thread to avoid blocking the event loop."""
-    return await asyncio.to_thread(run_sentiment_pipeline, keyword, max_results)
+def upstream_budget_http(e: UpstreamBudgetExhausted) -> HTTPException:
+    """503 for a run that couldn't get upstream call budget in time."""
+    return HTTPException(status_code=503, detail="Upstream rate budget exhausted. Try again shortly.",
+                         headers={"Retry-After": str(e.retry_after)})
 
 
-def _background_pipeline(keyword: str, max_results: int):
-    """Used for async background execution."""
-    try:
-        df = run_sentiment_pipeline(keyword, max_results)
-        logger.info("Background job completed: keyword=%s, rows=%d",
-                     keyword, len(df) if hasattr(df, "shape") else 0)
-        # Results are automatically saved to DB by the pipeline
-    except Exception:
-        logger.exception("Background job failed for keyword=%s", keyword)
+def _page_response(request: Request, result_set: dict, page: int, page_size: int, fmt: str):
+    """One page of a cached result set, serialized via the fast JSON path."""
+    body = page_result_set(result_set, page, page_size)
+    if fmt == "columnar":
+        body["data"] = records_to_columns(body["data"])
+    return fast_json_response(body, request)
+
 
 # ----------------------------------------------------------
 # 1. FRONTEND API ENDPOINT
@@ -93,42 +158,65 @@ def root():
     return {"message": "Welcome to the Sentilytics 360 API!"}
 
 
+@app.get("/api/metrics")
+def metrics():
+    """Runtime metrics for background services."""
+    return {
+        "write_behind": get_writer().metrics(),
+        "jobs": get_job_manager().metrics(),
+        "admission": get_admission().metrics(),
+        "sentiment_cache": sentiment_cache.metrics(),
+        "watchlist": get_watchlist_scheduler().metrics(),
+        "upstream_budget": get_upstream_budget().metrics(),
+        "inference": analyzer_metrics(),
+    }
+
+
 @app.get("/api/sentiment", response_model=SentimentResponse)
-async def sentiment(query: str = Query(..., min_length=1, max_length=200)):
+async def sentiment(
+    request: Request,
+    query: str = Query(..., min_length=1, max_length=200),
+    format: str = Query("records"),
+):
     """
     Analyze sentiment for a keyword.
     
     - `query`: Search term (max 200 chars)
+    - `format`: `records` (list of row objects, default) or `columnar`
+      (`data` is an object of parallel arrays, one per column)
     
-    Returns sentiment breakdown and up to 200 posts
+    Returns sentiment breakdown and up to 200 posts. Responds 503 with
+    `Retry-After` when too many analyses are already running or queued, or
+    when the shared upstream call budget is used up.
+
+    Responses are cached per (query, format) for SENTIMENT_CACHE_TTL_SECONDS;
+    repeats within that window skip the pipeline and honour `If-None-Match`.
     """
     if not query.strip():
         raise HTTPException(status_code=400, detail="Query cannot be only whitespace.")
+    if format not in RESPONSE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(RESPONSE_FORMATS)}.")
 
     try:
-        logger.info(f"Processing sentiment analysis for query: {query}")
-        df = await asyncio.to_thread(run_sentiment_pipeline, query, 200)
-
-        if df.empty:
-            return SentimentResponse(
-                keyword=query,
-                total_results=0,
-                sentiment_breakdown={},
-                data=[],
-            )
-
-        sentiment_breakdown = (
-            df["sentiment"].value_counts().to_dict()
-            if "sentiment" in df.columns else {}
-        )
-
-        return SentimentResponse(
-            keyword=query,
-            total_results=len(df),
-            sentiment_breakdown=sentiment_breakdown,
-            data=df.to_dict(orient="records"),
-        )
-
+        key = (query, format)
+        entry = sentiment_cache.get(key)
+        if entry is None:
+            logger.info(f"Processing sentiment analysis for query: {query}")
+            df = await get_admission().run(run_sentiment_pipeline, query, 200)
+            body = dumps(sentiment_payload(query, df, format))
+            entry = {"body": body, "etag": make_etag(body), "stored_at": time.monotonic()}
+            sentiment_cache.set(key, entry)
+
+        max_age = max(0, int(sentiment_cache.ttl - (time.monotonic() - entry["stored_at"])))
+        headers = validator_headers(entry["etag"], cache_control=f"private, max-age={max_age}")
+        if is_not_modified(request, entry["etag"], None):
+            return not_modified_response(headers)
+        return fast_json_response(entry["body"], request, headers=headers)
+
+    except Overloaded as e:
+        raise e.to_http()
+    except UpstreamBudgetExhausted as e:
+        raise upstream_budget_http(e)
     except HTTPException:
         raise
     except Exception as e:
@@ -136,11 +224,48 @@ async def sentiment(query: str = Query(..., min_length=1, max_length=200)):
         raise HTTPException(status_code=500, detail="Internal server error during analysis.")
 
 
+@app.get("/api/sentiment/stream")
+async def sentiment_stream(
+    query: str = Query(..., min_length=1, max_length=200),
+    format: str = Query("ndjson"),
+    batch_size: int = Query(32, ge=1, le=200),
+):
+    """
+    Streaming version of `/api/sentiment`.
+
+    - `query`: Search term (max 200 chars)
+    - `format`: `ndjson` (one JSON event per line) or `sse` (Server-Sent Events)
+    - `batch_size`: Posts scored per inference batch / `posts` event
+
+    Sends scored posts as each batch finishes, with running `summary`
+    events and a final `done` event holding the totals.
+    """
+    if not query.strip():
+        raise HTTPException(status_code=400, detail="Query cannot be only whitespace.")
+    if format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(STREAM_FORMATS)}.")
+
+    admission = get_admission()
+    try:
+        # The slot is held until the stream finishes (released by `iterate`)
+        await admission.acquire()
+    except Overloaded as e:
+        raise e.to_http()
+
+    logger.info(f"Streaming sentiment analysis for query: {query}")
+    events = iter_stream_events(query, 200, batch_size)
+    encoded = encode_sse(events) if format == "sse" else encode_ndjson(events)
+    body = admission.iterate(encoded)
+    # X-Accel-Buffering stops reverse proxies (nginx) from holding the stream back
+    return StreamingResponse(body, media_type=STREAM_FORMATS[format],
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
 # ----------------------------------------------------------
 # 2. OPTIONAL — Your existing POST endpoint
 # ----------------------------------------------------------
 @app.post("/api/run_analysis/", response_model=AnalysisResponse)
-def run_analysis_endpoint(request: KeywordRequest):
+async def run_analysis_endpoint(request: KeywordRequest):
     """Run sentiment analysis pipeline via POST request."""
     if not request.keyword or not request.keyword.strip():
         raise HTTPException(status_code=400, detail="Keyword cannot be empty.")
@@ -150,13 +275,17 @@ def run_analysis_endpoint(request: KeywordRequest):
 
     try:
         logger.info(f"Running analysis for keyword: {request.keyword}, max_results: {request.max_results}")
-        df = run_sentiment_pipeline(request.keyword, request.max_results)
+        df = await get_admission().run(run_sentiment_pipeline, request.keyword, request.max_results)
         
         result_count = len(df) if hasattr(df, "__len__") else 0
         return AnalysisResponse(
             status="success",
             message=f"Pipeline completed for '{request.keyword}'. {result_count} results saved to DB."
         )
+    except Overloaded as e:
+        raise e.to_http()
+    except UpstreamBudgetExhausted as e:
+        raise upstream_budget_http(e)
     except Exception as e:
         logger.exception(f"Analysis failed for keyword: {request.keyword}")
         raise HTTPException(status_code=500, detail="Analysis pipeline failed. Please try again.")
@@ -166,35 +295,259 @@ def run_analysis_endpoint(request: KeywordRequest):
 # 3. OPTIONAL — Fetch all DB results
 # ----------------------------------------------------------
 @app.get("/api/results/")
-def get_all_results(db: Session = Depends(get_db), skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000)):
+def get_all_results(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+    label: Optional[str] = Query(None, max_length=50),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+):
     """
-    Fetch all results with pagination.
-    
-    - `skip`: Number of records to skip (default 0)
+    Fetch stored results, oldest first.
+
+    - `cursor`: Opaque `next_cursor` from the previous page (keyset paging; preferred)
+    - `skip`: Number of records to skip when no cursor is given (legacy offset paging)
     - `limit`: Number of records to return (max 1000, default 100)
+    - `label`: Only rows with this sentiment label
+    - `start` / `end`: Only rows saved in [start, end)
+
+    `total` comes from a cache refreshed in the background (a filter's first
+    request counts it directly); `total_is_estimate` is true while it may be
+    stale or approximate.
+
+    Responses carry `ETag`/`Last-Modified`; a matching `If-None-Match` or
+    `If-Modified-Since` gets an empty `304` without the page query running.
     """
-    total = db.query(models.SentimentResult).count()
-    results = db.query(models.SentimentResult).offset(skip).limit(limit).all()
-    
+    total, total_is_estimate = count_results(label, start, end)
+    version, last_modified = results_version(db)
+    headers = validator_headers(make_etag(version, total, total_is_estimate), last_modified)
+    if is_not_modified(request, headers["ETag"], last_modified):
+        return not_modified_response(headers)
+    response.headers.update(headers)
+
+    query = filter_results(db.query(models.SentimentResult), label, start, end)
+
+    if cursor:
+        try:
+            after_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+        query = query.filter(models.SentimentResult.id > after_id)
+
+    query = query.order_by(models.SentimentResult.id)
+    if skip and not cursor:
+        query = query.offset(skip)
+
+    results = query.limit(limit).all()
+    next_cursor = encode_cursor(results[-1].id) if len(results) == limit else None
+
     return {
         "total": total,
+        "total_is_estimate": total_is_estimate,
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
         "data": results
     }
 
 
+@app.get("/api/trends")
+def get_trends(
+    db: Session = Depends(get_db),
+    keyword: str = Query(..., min_length=1, max_length=200),
+    granularity: str = Query("hour"),
+    source: Optional[str] = Query(None, max_length=50),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+):
+    """
+    Sentiment over time for a keyword, served from pre-aggregated rollups.
+
+    - `granularity`: `minute`, `hour` or `day` (default `hour`)
+    - `source`: Only posts from this platform (e.g. `Twitter`, `Reddit`)
+    - `start` / `end`: Bucket range [start, end), by post time
+    """
+    if granularity not in GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"granularity must be one of {', '.join(GRANULARITIES)}.")
+
+    buckets = query_trends(db, keyword, granularity, source, start, end)
+    return {"keyword": keyword, "granularity": granularity, "source": source, "buckets": buckets}
+
+
+@app.get("/api/top-terms")
+def get_top_terms(
+    db: Session = Depends(get_db),
+    keyword: str = Query(..., min_length=1, max_length=200),
+    label: Optional[str] = Query(None, max_length=50),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """
+    Most frequent cleaned terms for a keyword, per sentiment label.
+
+    - `label`: Only this sentiment label (e.g. `negative`)
+    - `start` / `end`: Window range [start, end), by post time (hourly windows)
+    - `limit`: Terms per label (max 100)
+
+    Served from per-window Count-Min/Space-Saving sketches, so counts are
+    estimates that may slightly overstate a term, never understate it.
+    """
+    labels = query_top_terms(db, keyword, label, start, end, limit)
+    return {"keyword": keyword, "window": TERM_WINDOW, "labels": labels}
+
+
+@app.get("/api/shifts")
+def get_shifts(
+    keyword: Optional[str] = Query(None, max_length=200),
+    source: Optional[str] = Query(None, max_length=50),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    Sentiment-shift alerts and live detector state.
+
+    - `keyword` / `source`: Only these streams
+    - `limit`: Max alerts returned, newest first
+
+    Streams are tracked per (keyword, source) in memory as posts are scored;
+    an alert means the negative share moved well away from its baseline.
+    """
+    detector = get_shift_detector()
+    return {
+        "alerts": detector.alerts(keyword, source, limit),
+        "streams": detector.states(keyword, source),
+    }
+
+
+@app.get("/api/clusters")
+def get_clusters(
+    keyword: str = Query(..., min_length=1, max_length=200),
+    terms: int = Query(5, ge=0, le=50),
+):
+    """
+    Topic clusters of a keyword's posts with per-cluster sentiment.
+
+    - `keyword`: Keyword whose posts were clustered
+    - `terms`: Top terms listed per cluster
+
+    Posts are assigned to clusters as they are scored, using embeddings
+    pooled from the sentiment model's own forward pass (only with
+    CLUSTERING_ENABLED=1). Clusters live in memory and are rebuilt from new
+    posts after a restart.
+    """
+    result = get_topic_clusters().clusters(keyword, terms)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No clustered posts for keyword '{keyword}'")
+    return result
+
+
+@app.get("/api/history")
+def get_history(
+    db: Session = Depends(get_db),
+    keyword: Optional[str] = Query(None, max_length=200),
+    label: Optional[str] = Query(None, max_length=50),
+    source: Optional[str] = Query(None, max_length=50),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """
+    Look up results across both storage tiers, oldest first.
+
+    Rows past the retention age live in the Parquet archive (see
+    `python manage.py archive`); newer rows are still in SQLite. Filters
+    are the same as `/api/results/` plus `keyword` and `source`.
+    """
+    archived = query_archive(keyword=keyword, start=start, end=end, label=label,
+                             source=source, limit=limit)
+    hot = []
+    if len(archived) < limit:
+        hot = (
+            filter_results(db.query(models.SentimentResult), label, start, end, keyword, source)
+            .order_by(models.SentimentResult.created_at, models.SentimentResult.id)
+            .limit(limit - len(archived))
+            .all()
+        )
+
+    return {"archived_rows": len(archived), "hot_rows": len(hot), "data": archived + hot}
+
+
+@app.get("/api/search")
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    mode: str = Query("terms"),
+    label: Optional[str] = Query(None, max_length=50),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+):
+    """
+    Full-text search over stored posts, best matches first (bm25).
+
+    - `q`: Words to search for
+    - `mode`: `terms` (all words, any order), `phrase` (exact phrase) or `prefix` (word prefixes)
+    - `label`: Only posts with this sentiment label
+    - `cursor`: `next_cursor` from the previous page
+    """
+    if mode not in SEARCH_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(SEARCH_MODES)}.")
+    if not fts_available():
+        raise HTTPException(status_code=503, detail="Full-text search is not available on this database.")
+
+    try:
+        rows, next_cursor = search_results(q, mode, label, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"query": q, "mode": mode, "next_cursor": next_cursor, "data": rows}
+
+
+@app.get("/api/export")
+def export_results(
+    format: str = Query("csv"),
+    gzip: bool = Query(False),
+    keyword: Optional[str] = Query(None, max_length=200),
+    label: Optional[str] = Query(None, max_length=50),
+    source: Optional[str] = Query(None, max_length=50),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+):
+    """
+    Stream stored results for offline analysis.
+
+    - `format`: `csv`, `ndjson` or `parquet`
+    - `gzip`: Compress the stream (sent with `Content-Encoding: gzip`)
+    - `keyword` / `label` / `source` / `start` / `end`: Same filters as `/api/history`
+
+    Rows are read through a server-side cursor and encoded chunk by chunk,
+    so exports of any size run in constant memory.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(EXPORT_FORMATS)}.")
+
+    stream = iter_export(format, gzip=gzip, label=label, start=start, end=end,
+                         keyword=keyword, source=source)
+    headers = {"Content-Disposition": f'attachment; filename="sentiment_results.{format}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(stream, media_type=EXPORT_FORMATS[format], headers=headers)
+
+
 # ----------------------------------------------------------
-# 4. ADVANCED — Analyze endpoint with pagination and background tasks
+# 4. ADVANCED — Analyze endpoint with pagination and background jobs
 # ----------------------------------------------------------
 @app.get("/analyze")
 async def analyze_keyword(
+    request: Request,
     keyword: str = Query(..., min_length=1, max_length=200),
-    background_tasks: BackgroundTasks = BackgroundTasks(), 
     max_results: int = Query(25, ge=1, le=200),
     page: int = Query(1, ge=1),
     page_size: int = Query(25, ge=1, le=100),
     background: bool = Query(False),
+    format: str = Query("records"),
 ):
     """Run sentiment analysis pipeline for a keyword with pagination.
 
@@ -203,67 +556,224 @@ async def analyze_keyword(
     - `max_results`: Number of posts to analyze (1-200, default 25)
     - `page`: Page number for pagination (default 1)
     - `page_size`: Results per page (1-100, default 25)
-    - `background`: If true, runs async and returns 202 (default false)
-    
+    - `background`: If true, returns 202 with a `job_id` to poll at `/jobs/{job_id}` (default false)
+    - `format`: `records` (default) or `columnar` (parallel arrays per column)
+
+    Results are cached per (keyword, max_results) for JOB_RESULT_TTL_SECONDS,
+    so requesting further pages does not re-run the pipeline.
+
     Requires REDDIT_CLIENT_ID environment variable to be set.
     """
     if not keyword.strip():
         raise HTTPException(status_code=400, detail="Keyword cannot be only whitespace.")
 
+    if format not in RESPONSE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(RESPONSE_FORMATS)}.")
+
     if not credentials_available():
         logger.error("Missing upstream credentials.")
         raise HTTPException(status_code=503, detail="Upstream credentials not configured. Set REDDIT_CLIENT_ID.")
 
+    jobs = get_job_manager()
     try:
-        # Run in background mode if requested
-        if background:
-            background_tasks.add_task(_background_pipeline, keyword, max_results)
-            return {"status": "scheduled", "message": "Analysis scheduled to run in background"}
-
-        # Run pipeline (non-blocking)
-        results_df = await _run_pipeline_in_thread(keyword, max_results)
-
-        # Validate pipeline output
-        if results_df is None or not hasattr(results_df, "empty"):
-            raise HTTPException(status_code=500, detail="Pipeline returned unexpected result type")
-
-        if results_df.empty:
-            return {"data": [], "summary": {"total_posts": 0, "sentiment_counts": {}, "platform_summary": {}}}
-
-        # Convert to JSON records
-        data = results_df.to_dict("records")
-        total = len(data)
-        start = (page - 1) * page_size
-        end = start + page_size
-        paged = data[start:end]
-
-        # Summaries
-        sentiment_counts = results_df["sentiment"].value_counts().to_dict() if "sentiment" in results_df.columns else {}
-        platform_summary = {}
-        if "source" in results_df.columns and "sentiment" in results_df.columns:
+        cached = jobs.cached_result(keyword, max_results)
+        if cached is not None:
+            return _page_response(request, cached, page, page_size, format)
+
+        job = jobs.active_job(keyword, max_results)
+        if job is None:
+            # A new run takes an admission slot before it is queued and keeps it
+            # until it finishes, whether or not this request waits for it
+            admission = get_admission()
+            await admission.acquire()
             try:
-                platform_summary = (
-                    results_df.groupby("source")["sentiment"]
-                    .value_counts()
-                    .unstack(fill_value=0)
-                    .to_dict("index")
-                )
-            except (KeyError, ValueError):
-                platform_summary = {}
-
-        summary = {
-            "total_posts": total,
-            "sentiment_counts": sentiment_counts,
-            "platform_summary": platform_summary,
-            "page": page,
-            "page_size": page_size,
-            "has_next": end < total,
-        }
-
-        return {"data": paged, "summary": summary}
+                job, created = jobs.submit(keyword, max_results)
+            except BaseException:
+                admission.release()
+                raise
+            if created:
+                job.future.add_done_callback(lambda _: admission.release_threadsafe())
+            else:
+                admission.release()  # joined a run that already holds a slot
 
+        # Run in background mode if requested
+        if background:
+            return JSONResponse(status_code=202, content={
+                "status": "scheduled",
+                "message": "Analysis scheduled to run in background",
+                "job_id": job.id,
+                "status_url": f"/jobs/{job.id}",
+            })
+
+        # Wait for the job without blocking the event loop
+        result_set = await asyncio.wrap_future(job.future)
+        return _page_response(request, result_set, page, page_size, format)
+
+    except Overloaded as e:
+        raise e.to_http()
+    except UpstreamBudgetExhausted as e:
+        raise upstream_budget_http(e)
+    except JobQueueFull:
+        raise HTTPException(status_code=503, detail="Too many analyses in progress. Try again shortly.",
+                            headers={"Retry-After": "5"})
     except HTTPException:
         raise
     except Exception:
         logger.exception("Error during analysis for keyword=%s", keyword)
-        raise HTTPException(status_code=500, detail="Internal error during analysis.")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal error during analysis.")
+
+
+# ----------------------------------------------------------
+# 5. JOBS — Status and cached results for /analyze runs
+# ----------------------------------------------------------
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """Status and progress of an analysis job."""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired.")
+    return job.to_dict()
+
+
+@app.get("/jobs/{job_id}/results")
+def get_job_results(
+    request: Request,
+    job_id: str,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(25, ge=1, le=100),
+    format: str = Query("records"),
+):
+    """Page through the results of a finished job (served from the result cache)."""
+    jobs = get_job_manager()
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired.")
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail="Job failed.")
+    if not job.done:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}.")
+
+    result_set = jobs.job_result(job)
+    if result_set is None:
+        raise HTTPException(status_code=410, detail="Job results have expired.")
+    if format not in RESPONSE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(RESPONSE_FORMATS)}.")
+    return _page_response(request, result_set, page, page_size, format)
+
+
+# ----------------------------------------------------------
+# 6. WATCHLIST — Keywords polled continuously by the scheduler
+# ----------------------------------------------------------
+def _get_watch(db: Session, keyword: str) -> models.WatchedKeyword:
+    watch = db.query(models.WatchedKeyword).filter(models.WatchedKeyword.keyword == keyword).first()
+    if watch is None:
+        raise HTTPException(status_code=404, detail="Keyword is not on the watchlist.")
+    return watch
+
+
+@app.get("/api/watchlist")
+def get_watchlist(db: Session = Depends(get_db)):
+    """Watched keywords with their schedule, lag and last-run state."""
+    scheduler = get_watchlist_scheduler()
+    return {"scheduler": scheduler.metrics(), "keywords": list_watches(db, scheduler)}
+
+
+@app.post("/api/watchlist")
+def watch_keyword(request: WatchRequest, db: Session = Depends(get_db)):
+    """
+    Add a keyword to the watchlist (or update its settings).
+
+    - `max_results`: Posts per source per poll (1-500)
+    - `min_interval_seconds` / `max_interval_seconds`: Bounds for the adaptive
+      polling interval; hot keywords move toward the minimum, quiet ones
+      toward the maximum
+
+    The first poll runs as soon as the upstream budget allows. Polling is
+    opt-in: the scheduler only runs with `WATCHLIST_ENABLED=1`.
+    """
+    keyword = request.keyword.strip()
+    if not keyword:
+        raise HTTPException(status_code=400, detail="Keyword cannot be empty.")
+    if request.max_results < 1 or request.max_results > 500:
+        raise HTTPException(status_code=400, detail="max_results must be between 1 and 500.")
+    if not 10 <= request.min_interval_seconds <= request.max_interval_seconds:
+        raise HTTPException(status_code=400, detail="Need 10 <= min_interval_seconds <= max_interval_seconds.")
+
+    watch = db.query(models.WatchedKeyword).filter(models.WatchedKeyword.keyword == keyword).first()
+    if watch is None:
+        watch = models.WatchedKeyword(keyword=keyword, next_run_at=datetime.utcnow(),
+                                      interval_seconds=request.min_interval_seconds)
+        db.add(watch)
+    watch.max_results = request.max_results
+    watch.min_interval_seconds = request.min_interval_seconds
+    watch.max_interval_seconds = request.max_interval_seconds
+    watch.interval_seconds = min(max(watch.interval_seconds, request.min_interval_seconds),
+                                 request.max_interval_seconds)
+    watch.enabled = True
+    db.commit()
+    return watch_state(watch)
+
+
+@app.get("/api/watchlist/{keyword}")
+def get_watch(keyword: str, db: Session = Depends(get_db)):
+    """Schedule, lag and last-run state for one watched keyword."""
+    watch = _get_watch(db, keyword)
+    return watch_state(watch, running=get_watchlist_scheduler().is_running(watch.id))
+
+
+@app.post("/api/watchlist/{keyword}/run")
+def run_watch_now(keyword: str, db: Session = Depends(get_db)):
+    """Make a watched keyword due immediately (still subject to the upstream budget)."""
+    watch = _get_watch(db, keyword)
+    watch.next_run_at = datetime.utcnow()
+    watch.enabled = True
+    db.commit()
+    return watch_state(watch)
+
+
+@app.delete("/api/watchlist/{keyword}")
+def unwatch_keyword(keyword: str, db: Session = Depends(get_db)):
+    """Stop watching a keyword. Results already stored are kept."""
+    db.delete(_get_watch(db, keyword))
+    db.commit()
+    return {"status": "removed", "keyword": keyword}
+
+
+# ----------------------------------------------------------
+# 7. RESCORING — Re-label stored results after a model change
+# ----------------------------------------------------------
+@app.get("/api/rescore")
+def get_rescore_status():
+    """
+    Progress of the re-scoring job for the current model.
+
+    `rows_total` counts the rows that needed re-scoring when the job
+    (re)started; `rows_changed` the ones whose label actually changed.
+    """
+    return get_rescore_job().status()
+
+
+@app.post("/api/rescore")
+def start_rescore():
+    """
+    Start (or resume) re-scoring stored results with the loaded model.
+
+    Rows are walked in id order and checkpointed per batch, so a stopped or
+    crashed job picks up where it left off. Runs throttled in the
+    background (RESCORE_MAX_ROWS_PER_SECOND) and backs off while live
+    analyses are running.
+    """
+    job = get_rescore_job()
+    if not job.start():
+        raise HTTPException(status_code=409, detail="A re-scoring job is already running.")
+    return {"status": "started"}
+
+
+@app.post("/api/rescore/stop")
+async def stop_rescore():
+    """Stop the re-scoring job after its current batch; it can be resumed later."""
+    job = get_rescore_job()
+    if not job.running:
+        raise HTTPException(status_code=409, detail="No re-scoring job is running.")
+    await asyncio.to_thread(job.stop)
+    return job.status()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Maintenance commands for the Sentilytics 360 database.
+
+    python manage.py compact [--vacuum]
+    python manage.py backfill-rollups
+    python manage.py archive [--days N]
+    python manage.py rebuild-fts
+    python manage.py backfill-terms
+    python manage.py rescore [--rate N] [--batch-size N]
+"""
+
+import argparse
+import logging
+
+from database.db import engine
+from database import models
+from database.migrations import migrate
+
+
+def cmd_compact(args):
+    from database.maintenance import compact_results
+    stats = compact_results(vacuum=args.vacuum)
+    print(f"[OK] Lowercased {stats['labels_normalized']} labels, hashed {stats['hashed']} rows, "
+          f"removed {stats['duplicates_removed']} duplicates.")
+
+
+def cmd_backfill_rollups(args):
+    from database.rollups import backfill_rollups
+    total = backfill_rollups()
+    print(f"[OK] Rebuilt {total} rollup buckets.")
+
+
+def cmd_archive(args):
+    from database.archive import RETENTION_DAYS, archive_old_results
+    days = args.days if args.days is not None else RETENTION_DAYS
+    moved = archive_old_results(days)
+    print(f"[OK] Archived {moved} rows older than {days:g} days.")
+
+
+def cmd_rebuild_fts(args):
+    from database.search import ensure_fts, rebuild_fts
+    if not ensure_fts():
+        raise SystemExit("[ERROR] This SQLite build has no FTS5 support.")
+    rebuild_fts()
+    print("[OK] Full-text index rebuilt.")
+
+
+def cmd_backfill_terms(args):
+    from database.terms import backfill_term_sketches
+    total = backfill_term_sketches()
+    print(f"[OK] Rebuilt term sketches from {total} stored results.")
+
+
+def cmd_rescore(args):
+    from src.processing.rescoring import get_rescore_job
+    job = get_rescore_job()
+    if args.rate is not None:
+        job.max_rows_per_second = args.rate
+    if args.batch_size is not None:
+        job.batch_size = args.batch_size
+
+    def progress(status):
+        print(f"  {status['rows_done']}/{status['rows_total']} rows, {status['rows_changed']} labels changed "
+              f"({status['rows_per_second'] or 0:.0f} rows/s)")
+
+    try:
+        status = job.run(progress=progress)
+    except KeyboardInterrupt:
+        raise SystemExit("[STOPPED] Progress is checkpointed; run `python manage.py rescore` again to resume.")
+    print(f"[OK] Re-scored {status['rows_done']} rows with {status['model_version']}, "
+          f"{status['rows_changed']} labels changed.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compact = commands.add_parser("compact", help="deduplicate stored results by content hash")
+    compact.add_argument("--vacuum", action="store_true", help="VACUUM the database afterwards")
+    compact.set_defaults(func=cmd_compact)
+
+    backfill = commands.add_parser("backfill-rollups", help="rebuild trend rollups from stored results")
+    backfill.set_defaults(func=cmd_backfill_rollups)
+
+    archive = commands.add_parser("archive", help="move old results to the Parquet archive")
+    archive.add_argument("--days", type=float, default=None,
+                         help="archive rows older than this (default RESULTS_RETENTION_DAYS or 30)")
+    archive.set_defaults(func=cmd_archive)
+
+    rebuild = commands.add_parser("rebuild-fts", help="rebuild the full-text search index")
+    rebuild.set_defaults(func=cmd_rebuild_fts)
+
+    terms = commands.add_parser("backfill-terms", help="rebuild top-term sketches from stored results")
+    terms.set_defaults(func=cmd_backfill_terms)
+
+    rescore = commands.add_parser("rescore", help="re-score stored results with the current model (resumable)")
+    rescore.add_argument("--rate", type=float, default=None,
+                         help="max rows per second (default RESCORE_MAX_ROWS_PER_SECOND or 50; 0 = unthrottled)")
+    rescore.add_argument("--batch-size", type=int, default=None, help="rows per batch (default 1000)")
+    rescore.set_defaults(func=cmd_rescore)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(name)s - %(message)s")
+
+    models.Base.metadata.create_all(bind=engine)
+    migrate(engine)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from cachetools import LRUCache
+
+from src.analysis.sketches import SpaceSaving
+
+
+class MiniBatchKMeans:
+    """
+    Incremental spherical k-means over post embeddings (Sculley's mini-batch k-means).
+
+    Embeddings are centered on a running mean (pooled transformer states
+    share a large common direction) and L2-normalized, so assignment is by
+    cosine similarity. Each centroid moves toward its new points with rate
+    1 / count; counts are capped at `max_count` so centroids keep following
+    drifting topics instead of freezing. The first `k` centroids are seeded
+    farthest-first from the earliest posts.
+    """
+
+    def __init__(self, k: int = 8, max_count: int = 1000):
+        self.k = k
+        self.max_count = max_count
+        self.centroids: Optional[np.ndarray] = None  # (clusters, dim) float32, unit rows
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.mean: Optional[np.ndarray] = None
+        self.seen = 0
+
+    def _normalize(self, X: np.ndarray) -> np.ndarray:
+        X = X - self.mean
+        norms = np.linalg.norm(X, axis=1, keepdims=True)
+        return X / np.maximum(norms, 1e-8)
+
+    def _update_mean(self, X: np.ndarray):
+        if self.mean is None:
+            self.mean = X.mean(axis=0)
+        else:
+            weight = len(X) / (min(self.seen, self.max_count) + len(X))
+            self.mean += weight * (X.mean(axis=0) - self.mean)
+        self.seen += len(X)
+
+    def _seed(self, X: np.ndarray):
+        while len(self.counts) < self.k:
+            if self.centroids is None:
+                pick = 0
+            else:
+                # Farthest-first: the point least similar to every centroid so far
+                pick = int(np.argmin((X @ self.centroids.T).max(axis=1)))
+                if (X[pick] @ self.centroids.T).max() > 0.999:
+                    return  # only near-duplicates left in this batch
+            point = X[pick:pick + 1]
+            self.centroids = point.copy() if self.centroids is None else np.vstack([self.centroids, point])
+            self.counts = np.append(self.counts, 0)
+
+    def partial_fit_predict(self, X: np.ndarray, update: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Assign each row of `X` to a cluster and move the centroids.
+
+        `update` is an optional boolean mask of rows that may move centroids
+        (the rest are assigned only, e.g. posts already seen).
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if len(X) == 0:
+            return np.zeros(0, dtype=np.int64)
+        if update is None:
+            update = np.ones(len(X), dtype=bool)
+        if update.any():
+            self._update_mean(X[update])
+        X = self._normalize(X)
+        if update.any():
+            self._seed(X[update])
+
+        labels = (X @ self.centroids.T).argmax(axis=1)
+        for cluster in np.unique(labels[update]):
+            members = X[update & (labels == cluster)]
+            self.counts[cluster] = min(self.counts[cluster] + len(members), self.max_count)
+            centroid = self.centroids[cluster]
+            centroid += (members.sum(axis=0) - len(members) * centroid) / self.counts[cluster]
+            self.centroids[cluster] = centroid / max(np.linalg.norm(centroid), 1e-8)
+        return labels
+
+
+class ClusterStats:
+    """Running sentiment counts, top terms and example posts for one cluster."""
+
+    __slots__ = ("posts", "labels", "terms", "examples", "updated_at")
+
+    def __init__(self, examples: int = 3):
+        self.posts = 0
+        self.labels: Dict[str, int] = {}
+        self.terms = SpaceSaving(capacity=50)
+        self.examples: deque = deque(maxlen=examples)
+        self.updated_at: Optional[datetime] = None
+
+    def to_dict(self, cluster: int, terms: int) -> Dict:
+        return {
+            "cluster": cluster,
+            "posts": self.posts,
+            "sentiment_breakdown": dict(self.labels),
+            "sentiment_share": {label: round(count / self.posts, 4) for label, count in self.labels.items()}
+            if self.posts else {},
+            "top_terms": self.terms.candidates()[:terms],
+            "examples": list(self.examples),
+            "updated_at": self.updated_at,
+        }
+
+
+class KeywordClusters:
+    __slots__ = ("model", "stats", "seen")
+
+    def __init__(self, k: int, max_count: int, max_seen: int):
+        self.model = MiniBatchKMeans(k, max_count)
+        self.stats: Dict[int, ClusterStats] = {}
+        self.seen: LRUCache = LRUCache(maxsize=max_seen)
+
+
+class TopicClusters:
+    """
+    Per-keyword topic clusters over the embeddings of scored posts.
+
+    `observe` assigns every post to its keyword's nearest cluster and
+    returns the cluster ids. Posts already seen (by content hash) are
+    assigned but neither move centroids nor count twice, so re-fetched
+    posts don't skew the breakdowns. State is in memory, like the shift
+    detector: clusters are rebuilt from new posts after a restart.
+    """
+
+    def __init__(self, k: int = 8, max_count: int = 1000, max_keywords: int = 1000, max_seen: int = 20000):
+        self.k = k
+        self.max_count = max_count
+        self.max_seen = max_seen
+        self._keywords: LRUCache = LRUCache(maxsize=max_keywords)
+        self._lock = threading.Lock()
+
+    def observe(self, keyword: str, embeddings: np.ndarray, labels: Sequence[str],
+                hashes: Sequence[str], terms: Sequence[List[str]], texts: Sequence[str]) -> List[int]:
+        keyword = keyword or ""
+        now = datetime.utcnow()
+        with self._lock:
+            state = self._keywords.get(keyword)
+            if state is None:
+                state = self._keywords[keyword] = KeywordClusters(self.k, self.max_count, self.max_seen)
+
+            fresh = np.zeros(len(hashes), dtype=bool)
+            for i, h in enumerate(hashes):
+                if h not in state.seen:  # also dedupes within the batch
+                    fresh[i] = True
+                    state.seen[h] = True
+
+            assigned = state.model.partial_fit_predict(embeddings, update=fresh)
+            for i in np.flatnonzero(fresh):
+                stats = state.stats.get(int(assigned[i]))
+                if stats is None:
+                    stats = state.stats[int(assigned[i])] = ClusterStats()
+                label = str(labels[i]).lower()
+                stats.posts += 1
+                stats.labels[label] = stats.labels.get(label, 0) + 1
+                for term in set(terms[i]):
+                    stats.terms.add(term)
+                stats.examples.append(texts[i])
+                stats.updated_at = now
+        return assigned.tolist()
+
+    def clusters(self, keyword: str, terms: int = 5) -> Optional[Dict]:
+        """Per-cluster breakdowns for `keyword`, largest first; None if it has no clusters yet."""
+        with self._lock:
+            state = self._keywords.get(keyword)
+            if state is None:
+                return None
+            clusters = [stats.to_dict(cluster, terms) for cluster, stats in state.stats.items()]
+            posts = sum(stats.posts for stats in state.stats.values())
+        clusters.sort(key=lambda c: c["posts"], reverse=True)
+        return {"keyword": keyword, "k": self.k, "posts": posts, "clusters": clusters}
+
+
+def clustering_enabled() -> bool:
+    """Opt-in: CLUSTERING_ENABLED=1 switches scoring to the embedding-returning path."""
+    return os.getenv("CLUSTERING_ENABLED", "0") == "1"
+
+
+# Singleton pattern (Standard Python)
+_clusters_instance = None
+
+def get_topic_clusters() -> TopicClusters:
+    global _clusters_instance
+    if _clusters_instance is None:
+        _clusters_instance = TopicClusters(
+            k=int(os.getenv("CLUSTER_COUNT", "8")),
+            max_count=int(os.getenv("CLUSTER_MAX_COUNT", "1000")),
+        )
+    return _clusters_instance
@@ -0,0 +1,230 @@
+import atexit
+import itertools
+import logging
+import multiprocessing as mp
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger("sentilytics")
+
+
+def partition_cores(replicas: int, threads: int, cores: Optional[Sequence[int]] = None) -> List[List[int]]:
+    """
+    Split the usable cores into `replicas` disjoint sets of `threads` cores.
+
+    If there are fewer cores than replicas x threads, sets wrap around and
+    overlap (a warning is logged) rather than failing.
+    """
+    if cores is None:
+        cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+    cores = list(cores)
+    if replicas * threads > len(cores):
+        logger.warning("[InferencePool] %d replicas x %d threads exceeds %d cores; core sets will overlap",
+                       replicas, threads, len(cores))
+    return [[cores[(r * threads + t) % len(cores)] for t in range(threads)] for r in range(replicas)]
+
+
+def parse_cores(spec: str) -> List[int]:
+    """Parse a core list like "0-7,16-23"."""
+    cores = []
+    for part in spec.split(","):
+        part = part.strip()
+        if "-" in part:
+            low, high = part.split("-")
+            cores.extend(range(int(low), int(high) + 1))
+        elif part:
+            cores.append(int(part))
+    return cores
+
+
+def _default_factory(model_name: str):
+    from src.analysis.model import SentimentAnalyzer
+    return SentimentAnalyzer(model_name=model_name)
+
+
+def _replica_main(index: int, cores: List[int], threads: int, factory: Callable, model_name: str,
+                  tasks, results):
+    """Replica process: pin to `cores`, size torch's thread pools, then serve tasks."""
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    import torch
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # already set in this process
+
+    try:
+        analyzer = factory(model_name)
+    except Exception as e:
+        results.put(("failed", index, repr(e)))
+        return
+    results.put(("ready", index, None))
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        task_id, method, args, kwargs = task
+        try:
+            results.put(("ok", task_id, getattr(analyzer, method)(*args, **kwargs)))
+        except Exception as e:
+            results.put(("error", task_id, repr(e)))
+
+
+class InferencePool:
+    """
+    N model replicas in separate processes, each pinned to its own cores.
+
+    Every replica runs `torch.set_num_threads(threads)` on a disjoint core
+    set, so replicas don't fight over the same cores the way concurrent
+    callers of one in-process model do. Batches go onto one shared queue
+    that idle replicas pull from, which routes work to whichever replica
+    is free. `analyze` has the same signature as `SentimentAnalyzer.analyze`
+    and splits its input into `batch_size` chunks that run in parallel.
+    """
+
+    def __init__(self, replicas: int, threads: int, model_name: str,
+                 cores: Optional[Sequence[int]] = None, factory: Callable = _default_factory,
+                 start_timeout: float = 300.0, task_timeout: float = 120.0):
+        self.model_name = model_name
+        self.replicas = replicas
+        self.threads = threads
+        self.task_timeout = task_timeout
+        self.core_sets = partition_cores(replicas, threads, cores)
+
+        ctx = mp.get_context("spawn")  # fresh interpreters: no inherited torch thread pools
+        self._tasks = ctx.Queue()
+        self._results = ctx.Queue()
+        self._futures: Dict[int, Future] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._stats = {"batches": 0, "texts": 0, "errors": 0}
+
+        self._processes = [
+            ctx.Process(target=_replica_main, name=f"inference-{i}", daemon=True,
+                        args=(i, cores_i, threads, factory, model_name, self._tasks, self._results))
+            for i, cores_i in enumerate(self.core_sets)
+        ]
+        for process in self._processes:
+            process.start()
+        self._await_ready(start_timeout)
+
+        self._collector = threading.Thread(target=self._collect, name="inference-collector", daemon=True)
+        self._collector.start()
+        atexit.register(self.shutdown)
+        logger.info("[InferencePool] %d replicas x %d threads ready (cores %s)", replicas, threads, self.core_sets)
+
+    def _await_ready(self, timeout: float):
+        ready = 0
+        while ready < self.replicas:
+            try:
+                status, index, detail = self._results.get(timeout=timeout)
+            except queue.Empty:
+                self.shutdown()
+                raise RuntimeError("Inference replicas did not start in time")
+            if status == "failed":
+                self.shutdown()
+                raise RuntimeError(f"Inference replica {index} failed to load the model: {detail}")
+            ready += 1
+
+    def _collect(self):
+        while True:
+            message = self._results.get()
+            if message is None:
+                return
+            status, task_id, payload = message
+            with self._lock:
+                future = self._futures.pop(task_id, None)
+            if future is None:
+                continue
+            if status == "ok":
+                future.set_result(payload)
+            else:
+                future.set_exception(RuntimeError(f"Inference replica error: {payload}"))
+
+    def submit(self, method: str, *args, **kwargs) -> Future:
+        """Queue one call of `analyzer.<method>(*args, **kwargs)` for the next idle replica."""
+        future: Future = Future()
+        task_id = next(self._ids)
+        with self._lock:
+            self._futures[task_id] = future
+        self._tasks.put((task_id, method, args, kwargs))
+        return future
+
+    def analyze(self, texts: List[str], batch_size: int = 16, return_embeddings: bool = False):
+        if not texts:
+            return ([], np.zeros((0, 0), dtype=np.float16)) if return_embeddings else []
+        texts = list(texts)
+        futures = [
+            self.submit("analyze", texts[start:start + batch_size], batch_size=batch_size,
+                        return_embeddings=return_embeddings)
+            for start in range(0, len(texts), batch_size)
+        ]
+        results = []
+        embeddings = []
+        try:
+            for future in futures:
+                output = future.result(timeout=self.task_timeout)
+                if return_embeddings:
+                    output, chunk_embeddings = output
+                    embeddings.append(chunk_embeddings)
+                results.extend(output)
+        except Exception:
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        with self._lock:
+            self._stats["batches"] += len(futures)
+            self._stats["texts"] += len(texts)
+        if return_embeddings:
+            # A replica that fell back to neutral scores returns no embeddings
+            return results, None if any(e is None for e in embeddings) else np.concatenate(embeddings)
+        return results
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            return {
+                "replicas": self.replicas,
+                "threads_per_replica": self.threads,
+                "alive": sum(process.is_alive() for process in self._processes),
+                "pending_batches": len(self._futures),
+                **self._stats,
+            }
+
+    def shutdown(self):
+        for _ in self._processes:
+            try:
+                self._tasks.put(None)
+            except (OSError, ValueError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        try:
+            self._results.put(None)
+        except (OSError, ValueError):
+            pass
+        self._processes = []
+
+
+def pool_from_env(model_name: str) -> Optional[InferencePool]:
+    """An `InferencePool` if INFERENCE_REPLICAS is set above 0, else None."""
+    replicas = int(os.getenv("INFERENCE_REPLICAS", "0"))
+    if replicas <= 0:
+        return None
+    cores = parse_cores(os.getenv("INFERENCE_CORES")) if os.getenv("INFERENCE_CORES") else None
+    if cores:
+        available = len(cores)
+    elif hasattr(os, "sched_getaffinity"):
+        available = len(os.sched_getaffinity(0))
+    else:
+        available = os.cpu_count() or 1
+    threads = int(os.getenv("INFERENCE_THREADS_PER_REPLICA", "0")) or max(1, available // replicas)
+    return InferencePool(replicas, threads, model_name=model_name, cores=cores)
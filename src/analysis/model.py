@@ -1,12 +1,17 @@
-from typing import List, Dict, Union, Any, cast
+from typing import List, Dict, Any, cast
 from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
 import logging
+import os
+import threading
+import numpy as np
 import torch
 
 logger = logging.getLogger("sentilytics")
 
+DEFAULT_MODEL = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+
 class SentimentAnalyzer:
-    def __init__(self, model_name: str = "cardiffnlp/twitter-roberta-base-sentiment-latest"):
+    def __init__(self, model_name: str = DEFAULT_MODEL):
         logger.info(f"Loading model: {model_name}")
         self.model_name = model_name
         
@@ -24,13 +29,28 @@ class SentimentAnalyzer:
         # Max length for this specific model is usually 512
         self.max_length = 512
 
-    def analyze(self, texts: List[str]) -> List[Dict[str, Union[str, float]]]:
+    def analyze(self, texts: List[str], batch_size: int = 16, return_embeddings: bool = False):
+        """
+        Score `texts`; returns one `{"label", "score"}` dict per text.
+
+        With `return_embeddings=True` returns `(results, embeddings)` instead,
+        where `embeddings` is an (n, hidden) float16 array of mean-pooled
+        last-layer hidden states from the same forward pass (None if the
+        analysis failed).
+        """
         if not texts:
-            return []
+            return ([], np.zeros((0, 0), dtype=np.float16)) if return_embeddings else []
 
         # 1. Basic cleaning (removing nulls/non-strings)
         valid_texts = [str(t) if t else "" for t in texts]
 
+        if return_embeddings:
+            try:
+                return self._analyze_with_embeddings(valid_texts, batch_size)
+            except Exception as e:
+                logger.error(f"Analysis failed: {e}")
+                return [{"label": "Neutral", "score": 0.0} for _ in texts], None
+
         results = []
         try:
             # 2. Let the pipeline handle truncation and batching natively
@@ -39,7 +59,7 @@ class SentimentAnalyzer:
                 valid_texts, 
                 truncation=True, 
                 max_length=self.max_length, 
-                batch_size=16
+                batch_size=batch_size
             )
 
             # 3. Normalize output
@@ -62,17 +82,7 @@ class SentimentAnalyzer:
                     label = 'Neutral'
                     score = 0.0
 
-                # Standardize labels (The model returns 'negative', 'neutral', 'positive' OR 'LABEL_0'...)
-                # We normalize them to Title Case for your UI
-                clean_label = "Neutral"
-                label_lower = str(label).lower()
-                
-                if "neg" in label_lower or "label_0" in label_lower:
-                    clean_label = "Negative"
-                elif "pos" in label_lower or "label_2" in label_lower:
-                    clean_label = "Positive"
-                elif "neu" in label_lower or "label_1" in label_lower:
-                    clean_label = "Neutral"
+                clean_label = _normalize_label(label)
 
                 results.append({
                     "label": clean_label,
@@ -86,11 +96,88 @@ class SentimentAnalyzer:
 
         return results
 
+    def _analyze_with_embeddings(self, texts: List[str], batch_size: int):
+        # Same model and tokenizer the pipeline wraps, called directly so the
+        # hidden states of the scoring pass can be pooled instead of recomputed
+        model = self.pipe.model
+        tokenizer = self.pipe.tokenizer
+        id2label = model.config.id2label
+
+        results = []
+        embeddings = []
+        for start in range(0, len(texts), batch_size):
+            encoded = tokenizer(
+                texts[start:start + batch_size],
+                truncation=True,
+                max_length=self.max_length,
+                padding=True,
+                return_tensors="pt",
+            ).to(model.device)
+            with torch.inference_mode():
+                hidden, logits = _encode_and_classify(model, encoded)
+
+            scores, label_ids = logits.softmax(dim=-1).max(dim=-1)
+            for score, label_id in zip(scores.tolist(), label_ids.tolist()):
+                results.append({"label": _normalize_label(id2label.get(label_id, "")), "score": float(score)})
+
+            # Mean over real tokens only (padding masked out)
+            mask = encoded["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1.0)
+            embeddings.append(pooled.to(torch.float16).cpu().numpy())
+
+        return results, np.concatenate(embeddings)
+
+
+def _encode_and_classify(model, encoded):
+    """Last-layer hidden states and logits from one forward pass."""
+    if hasattr(model, "roberta"):
+        # RoBERTa's head reads the encoder's sequence output directly, so run
+        # the two halves ourselves rather than keep every layer's states
+        hidden = model.roberta(**encoded)[0]
+        return hidden, model.classifier(hidden)
+    output = model(**encoded, output_hidden_states=True)
+    return output.hidden_states[-1], output.logits
+
+
+def _normalize_label(label) -> str:
+    # Standardize labels (The model returns 'negative', 'neutral', 'positive' OR 'LABEL_0'...)
+    # We normalize them to Title Case for your UI
+    label_lower = str(label).lower()
+    if "neg" in label_lower or "label_0" in label_lower:
+        return "Negative"
+    if "pos" in label_lower or "label_2" in label_lower:
+        return "Positive"
+    return "Neutral"
+
 # Singleton pattern (Standard Python)
 _analyzer_instance = None
+_analyzer_lock = threading.Lock()
 
 def get_analyzer():
+    """
+    The shared analyzer: an in-process `SentimentAnalyzer`, or a multi-replica
+    `InferencePool` with the same `analyze` interface when INFERENCE_REPLICAS > 0.
+
+    The model is SENTIMENT_MODEL (a Hugging Face name or local path), default
+    `DEFAULT_MODEL`. After changing it, `python manage.py rescore` (or
+    `POST /api/rescore`) re-labels stored results with the new model.
+    """
     global _analyzer_instance
     if _analyzer_instance is None:
-        _analyzer_instance = SentimentAnalyzer()
-    return _analyzer_instance
\ No newline at end of file
+        # Locked: concurrent first calls must not each load a model (or spawn a pool)
+        with _analyzer_lock:
+            if _analyzer_instance is None:
+                from src.analysis.inference_pool import pool_from_env
+                model_name = os.getenv("SENTIMENT_MODEL", DEFAULT_MODEL)
+                _analyzer_instance = pool_from_env(model_name) or SentimentAnalyzer(model_name)
+    return _analyzer_instance
+
+
+def analyzer_metrics():
+    """Inference metrics, or None until the first analysis has loaded the analyzer."""
+    instance = _analyzer_instance
+    if instance is None:
+        return None
+    if hasattr(instance, "metrics"):
+        return instance.metrics()
+    return {"replicas": 0, "model": getattr(instance, "model_name", None)}
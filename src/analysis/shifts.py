@@ -0,0 +1,200 @@
+import logging
+import math
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from cachetools import LRUCache
+
+logger = logging.getLogger("sentilytics")
+
+
+class ShiftState:
+    """
+    Online detector state for one (keyword, source) stream; O(1) per post.
+
+    Each positive/negative post is a Bernoulli observation of the negative
+    share (neutral posts carry no polarity and are skipped). A slow EWMA
+    tracks the baseline share; two Bernoulli CUSUMs (log-likelihood ratio
+    of "share moved by `shift`" vs "share is the baseline") accumulate
+    evidence of a sustained swing either way. A fast EWMA gives the recent
+    share for display. `seen` holds the content hashes of recently counted
+    posts so a re-fetched post isn't counted twice.
+    """
+
+    __slots__ = ("keyword", "source", "posts", "negatives", "baseline", "recent",
+                 "cusum_up", "cusum_down", "warmup", "watermark", "updated_at", "alerts", "seen")
+
+    def __init__(self, keyword: str, source: str, max_seen: int = 2000):
+        self.keyword = keyword
+        self.source = source
+        self.posts = 0
+        self.negatives = 0
+        self.baseline = 0.5
+        self.recent = 0.5
+        self.cusum_up = 0.0
+        self.cusum_down = 0.0
+        self.warmup = 0  # posts since the baseline was (re)started
+        self.watermark: Optional[datetime] = None
+        self.updated_at: Optional[datetime] = None
+        self.alerts = 0
+        self.seen: LRUCache = LRUCache(maxsize=max_seen)
+
+    def to_dict(self) -> Dict:
+        return {
+            "keyword": self.keyword,
+            "source": self.source,
+            "posts": self.posts,
+            "negative_posts": self.negatives,
+            "baseline_negative_share": round(self.baseline, 4),
+            "recent_negative_share": round(self.recent, 4),
+            "cusum_negative": round(self.cusum_up, 3),
+            "cusum_positive": round(self.cusum_down, 3),
+            "last_post_at": self.watermark,
+            "updated_at": self.updated_at,
+            "alerts": self.alerts,
+        }
+
+
+class ShiftDetector:
+    """
+    Sentiment-shift detection over the pipeline's scored posts.
+
+    `observe_rows` takes the rows the load stage builds. Per stream, posts
+    whose `content_hash` was already counted (among the last `max_seen`)
+    are skipped, so posts re-fetched by a later run are not counted twice,
+    however the run was batched. Alerts fire when a CUSUM crosses `threshold`; the stream
+    then learns a fresh baseline over `min_posts` posts, so a persistent
+    new level alerts once, not on every post.
+
+    `shift` is the change in negative share the CUSUMs are tuned for;
+    larger swings are caught faster, much smaller ones may not be.
+    """
+
+    def __init__(self, baseline_alpha: float = 0.01, recent_alpha: float = 0.1,
+                 shift: float = 0.15, threshold: float = 8.0, min_posts: int = 50,
+                 max_streams: int = 10000, max_alerts: int = 500, max_seen: int = 2000):
+        self.baseline_alpha = baseline_alpha
+        self.recent_alpha = recent_alpha
+        self.shift = shift
+        self.threshold = threshold
+        self.min_posts = min_posts
+        self.max_seen = max_seen
+        self._states: LRUCache = LRUCache(maxsize=max_streams)
+        self._alerts: deque = deque(maxlen=max_alerts)
+        self._lock = threading.Lock()
+
+    def observe_rows(self, rows: Iterable[Dict]) -> int:
+        """
+        Feed scored rows (`keyword`, `source`, `sentiment_label`, `post_created_at`,
+        `content_hash`); returns alerts raised.
+        """
+        rows = sorted(rows, key=lambda row: row.get("post_created_at") or datetime.min)
+        raised = 0
+        now = datetime.utcnow()
+        with self._lock:
+            for row in rows:
+                key = (row.get("keyword") or "", row.get("source") or "")
+                state = self._states.get(key)
+                if state is None:
+                    state = self._states[key] = ShiftState(*key, max_seen=self.max_seen)
+
+                digest = row.get("content_hash")
+                if digest is not None:
+                    digest = digest[:16]  # 64 bits is plenty per stream, at a quarter the memory
+                    if digest in state.seen:
+                        continue
+                    state.seen[digest] = True
+                posted_at = row.get("post_created_at")
+                if self._update(state, str(row.get("sentiment_label", "")).lower(), posted_at, now):
+                    raised += 1
+        return raised
+
+    def _update(self, state: ShiftState, label: str, posted_at: Optional[datetime], now: datetime) -> bool:
+        if posted_at is not None and (state.watermark is None or posted_at > state.watermark):
+            state.watermark = posted_at
+        state.updated_at = now
+        if label not in ("negative", "positive"):
+            return False
+
+        x = 1 if label == "negative" else 0
+        state.posts += 1
+        state.negatives += x
+        state.warmup += 1
+        state.recent = x if state.posts == 1 else state.recent + self.recent_alpha * (x - state.recent)
+
+        if state.warmup <= self.min_posts:
+            # Warm-up: baseline is the plain mean, no alerting yet
+            state.baseline += (x - state.baseline) / state.warmup
+            return False
+
+        p0 = min(max(state.baseline, 0.02), 0.98)
+        state.cusum_up = max(0.0, state.cusum_up + _llr(x, p0, min(p0 + self.shift, 0.99)))
+        state.cusum_down = max(0.0, state.cusum_down + _llr(x, p0, max(p0 - self.shift, 0.01)))
+        # Only learn the baseline while the stream looks in control, so a real
+        # swing isn't absorbed before the CUSUM can flag it
+        if max(state.cusum_up, state.cusum_down) < self.threshold / 2:
+            state.baseline += self.baseline_alpha * (x - state.baseline)
+
+        if state.cusum_up <= self.threshold and state.cusum_down <= self.threshold:
+            return False
+
+        direction = "negative" if state.cusum_up > self.threshold else "positive"
+        alert = {
+            "keyword": state.keyword,
+            "source": state.source,
+            "direction": direction,
+            "detected_at": now,
+            "post_created_at": posted_at,
+            "baseline_negative_share": round(state.baseline, 4),
+            "recent_negative_share": round(state.recent, 4),
+            "cusum": round(max(state.cusum_up, state.cusum_down), 3),
+            "posts_observed": state.posts,
+        }
+        self._alerts.append(alert)
+        state.alerts += 1
+        state.cusum_up = state.cusum_down = 0.0
+        state.baseline = 0.0
+        state.warmup = 0
+        logger.warning("[Shifts] %s swing for keyword=%s source=%s (negative share %.2f -> %.2f)",
+                       direction.title(), state.keyword, state.source,
+                       alert["baseline_negative_share"], alert["recent_negative_share"])
+        return True
+
+    def states(self, keyword: Optional[str] = None, source: Optional[str] = None) -> List[Dict]:
+        with self._lock:
+            return [
+                state.to_dict() for (kw, src), state in self._states.items()
+                if (keyword is None or kw == keyword) and (source is None or src == source)
+            ]
+
+    def alerts(self, keyword: Optional[str] = None, source: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """Most recent alerts first."""
+        with self._lock:
+            matching = [
+                alert for alert in reversed(self._alerts)
+                if (keyword is None or alert["keyword"] == keyword) and (source is None or alert["source"] == source)
+            ]
+        return matching[:limit]
+
+
+def _llr(x: int, p0: float, p1: float) -> float:
+    """Log-likelihood ratio of one Bernoulli observation under p1 vs p0."""
+    return math.log(p1 / p0) if x else math.log((1 - p1) / (1 - p0))
+
+
+# Singleton pattern (Standard Python)
+_detector_instance = None
+
+def get_shift_detector() -> ShiftDetector:
+    global _detector_instance
+    if _detector_instance is None:
+        _detector_instance = ShiftDetector(
+            baseline_alpha=float(os.getenv("SHIFT_BASELINE_ALPHA", "0.01")),
+            shift=float(os.getenv("SHIFT_DETECT_DELTA", "0.15")),
+            threshold=float(os.getenv("SHIFT_CUSUM_THRESHOLD", "8")),
+            min_posts=int(os.getenv("SHIFT_MIN_POSTS", "50")),
+        )
+    return _detector_instance
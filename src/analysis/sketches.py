@@ -0,0 +1,168 @@
+import hashlib
+import json
+import struct
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Defaults: error <= e/2048 (~0.13%) of all counted tokens with probability
+# 1 - e^-4 (~98%); 100 heavy-hitter candidates. ~32 KB raw, far less zlib'd.
+CMS_WIDTH = 2048
+CMS_DEPTH = 4
+TOP_K = 100
+
+_HEADER = struct.Struct(">HIIQ")  # depth, width, top-k capacity, total
+_VERSION = 1
+
+
+class CountMinSketch:
+    """
+    Fixed-size frequency estimator: never undercounts, overcounts by at most
+    ~e/width of the total with probability 1 - e^-depth.
+
+    Sketches of equal shape merge by element-wise addition.
+    """
+
+    def __init__(self, width: int = CMS_WIDTH, depth: int = CMS_DEPTH, table: Optional[np.ndarray] = None):
+        self.width = width
+        self.depth = depth
+        self.table = table if table is not None else np.zeros((depth, width), dtype=np.uint32)
+        self._rows = np.arange(depth)
+
+    def _indexes(self, item: str) -> np.ndarray:
+        # Double hashing (Kirsch-Mitzenmacher) from one stable 128-bit digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = struct.unpack(">QQ", digest)
+        return np.array([(h1 + i * h2) % self.width for i in range(self.depth)], dtype=np.int64)
+
+    def add(self, item: str, count: int = 1):
+        self.table[self._rows, self._indexes(item)] += count
+
+    def estimate(self, item: str) -> int:
+        return int(self.table[self._rows, self._indexes(item)].min())
+
+    def subtract(self, item: str, count: int = 1):
+        """Undo an earlier `add` (counters stop at zero)."""
+        indexes = self._indexes(item)
+        current = self.table[self._rows, indexes]
+        self.table[self._rows, indexes] = current - np.minimum(current, count).astype(current.dtype)
+
+    def merge(self, other: "CountMinSketch"):
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Cannot merge Count-Min sketches of different shapes")
+        self.table += other.table
+
+
+class SpaceSaving:
+    """
+    Space-Saving top-k summary (Metwally et al.).
+
+    Keeps at most `capacity` candidate items; any item more frequent than
+    total / capacity is guaranteed to be among them. `error` bounds how much
+    an item's count may be overstated.
+    """
+
+    def __init__(self, capacity: int = TOP_K):
+        self.capacity = capacity
+        self.counters: Dict[str, List[int]] = {}  # item -> [count, error]
+
+    def add(self, item: str, count: int = 1):
+        counter = self.counters.get(item)
+        if counter is not None:
+            counter[0] += count
+        elif len(self.counters) < self.capacity:
+            self.counters[item] = [count, 0]
+        else:
+            victim = min(self.counters, key=lambda key: self.counters[key][0])
+            floor = self.counters.pop(victim)[0]
+            self.counters[item] = [floor + count, floor]
+
+    def subtract(self, item: str, count: int = 1):
+        """Take back `count` occurrences of a tracked item; untracked items are left alone."""
+        counter = self.counters.get(item)
+        if counter is None:
+            return
+        counter[0] -= count
+        if counter[0] <= 0:
+            del self.counters[item]
+        else:
+            counter[1] = min(counter[1], counter[0])
+
+    def merge(self, other: "SpaceSaving"):
+        """Combine two summaries (Agarwal et al. mergeable summaries), keeping the top `capacity`."""
+        floor_self = self._floor()
+        floor_other = other._floor()
+        merged = {}
+        for item in set(self.counters) | set(other.counters):
+            mine = self.counters.get(item, [floor_self, floor_self])
+            theirs = other.counters.get(item, [floor_other, floor_other])
+            merged[item] = [mine[0] + theirs[0], mine[1] + theirs[1]]
+        keep = sorted(merged.items(), key=lambda kv: kv[1][0], reverse=True)[:self.capacity]
+        self.counters = dict(keep)
+
+    def _floor(self) -> int:
+        # An absent item may have occurred up to the smallest count, but only
+        # once the summary is full (before that every item is tracked exactly).
+        if len(self.counters) < self.capacity or not self.counters:
+            return 0
+        return min(counter[0] for counter in self.counters.values())
+
+    def candidates(self) -> List[str]:
+        return sorted(self.counters, key=lambda key: self.counters[key][0], reverse=True)
+
+
+class TermSketch:
+    """Count-Min Sketch plus Space-Saving candidates for one stream of terms."""
+
+    def __init__(self, width: int = CMS_WIDTH, depth: int = CMS_DEPTH, capacity: int = TOP_K):
+        self.cms = CountMinSketch(width, depth)
+        self.top = SpaceSaving(capacity)
+        self.total = 0
+
+    def add_terms(self, terms: Iterable[str]):
+        for term, count in Counter(terms).items():
+            self.cms.add(term, count)
+            self.top.add(term, count)
+            self.total += count
+
+    def subtract_terms(self, terms: Iterable[str]):
+        """Remove terms added earlier (e.g. a post that moved to another label)."""
+        for term, count in Counter(terms).items():
+            self.cms.subtract(term, count)
+            self.top.subtract(term, count)
+            self.total = max(0, self.total - count)
+
+    def merge(self, other: "TermSketch"):
+        self.cms.merge(other.cms)
+        self.top.merge(other.top)
+        self.total += other.total
+
+    def most_common(self, n: int = 20) -> List[Tuple[str, int]]:
+        """Top `n` terms with their Count-Min estimates, highest first."""
+        ranked = [(term, self.cms.estimate(term)) for term in self.top.candidates()]
+        ranked.sort(key=lambda pair: pair[1], reverse=True)
+        return ranked[:n]
+
+    def to_bytes(self) -> bytes:
+        counters = json.dumps(self.top.counters, separators=(",", ":")).encode("utf-8")
+        header = _HEADER.pack(self.cms.depth, self.cms.width, self.top.capacity, self.total)
+        return bytes([_VERSION]) + zlib.compress(header + struct.pack(">I", len(counters))
+                                                 + counters + self.cms.table.tobytes())
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "TermSketch":
+        if not blob or blob[0] != _VERSION:
+            raise ValueError("Unsupported term sketch encoding")
+        raw = zlib.decompress(blob[1:])
+        depth, width, capacity, total = _HEADER.unpack_from(raw)
+        offset = _HEADER.size
+        (length,) = struct.unpack_from(">I", raw, offset)
+        offset += 4
+        sketch = cls(width, depth, capacity)
+        sketch.top.counters = json.loads(raw[offset:offset + length])
+        offset += length
+        sketch.cms.table = np.frombuffer(raw, dtype=np.uint32, offset=offset).reshape(depth, width).copy()
+        sketch.total = total
+        return sketch
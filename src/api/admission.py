@@ -0,0 +1,209 @@
+import asyncio
+import concurrent.futures
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Dict, Iterator, Optional
+
+from fastapi import HTTPException
+
+logger = logging.getLogger("sentilytics")
+
+
+class Overloaded(Exception):
+    """Raised when a request can't be admitted (queue full or wait deadline passed)."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+    def to_http(self) -> HTTPException:
+        return HTTPException(
+            status_code=503,
+            detail=f"Server busy ({self.reason}). Try again shortly.",
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+
+class AdmissionController:
+    """
+    Caps concurrent pipeline runs and sheds load when the wait queue is full.
+
+    At most `max_concurrent` runs hold a slot; up to `max_queue` more wait
+    for one, each for at most `queue_timeout` seconds. Anything beyond that
+    is rejected immediately with `Overloaded`. Admitted work runs on a
+    dedicated thread pool, so the shared request threadpool stays free for
+    cheap endpoints. Background workers (job runs, watchlist polls,
+    re-scoring) take slots from their own threads with `hold()`: they wait
+    as long as needed but are never shed.
+    """
+
+    def __init__(self, max_concurrent: int = 4, max_queue: int = 16,
+                 queue_timeout: float = 10.0, retry_after: int = 5):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed = False
+        self._running = 0
+        self._waiting = 0
+        self._stats = {
+            "admitted": 0,
+            "rejected_queue_full": 0,
+            "rejected_timeout": 0,
+            "background_admitted": 0,
+            "total_wait_seconds": 0.0,
+        }
+
+    # --- Lifecycle (called from the app lifespan, inside the event loop) ---
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._closed = False
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix="pipeline")
+
+    def shutdown(self):
+        self._closed = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    # --- Admission ---
+    async def acquire(self):
+        """Wait for a slot or raise `Overloaded`."""
+        if self._semaphore is None:
+            self.start()
+
+        started = time.monotonic()
+        if not self._semaphore.locked():
+            # Free slot: acquire() returns without suspending
+            await self._semaphore.acquire()
+        else:
+            if self._waiting >= self.max_queue:
+                self._stats["rejected_queue_full"] += 1
+                raise Overloaded("queue full", self.retry_after)
+
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self._stats["rejected_timeout"] += 1
+                raise Overloaded("queue timeout", self.retry_after)
+            finally:
+                self._waiting -= 1
+
+        self._running += 1
+        self._stats["admitted"] += 1
+        self._stats["total_wait_seconds"] += time.monotonic() - started
+
+    def release(self):
+        self._running -= 1
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def _acquire_background(self):
+        await self._semaphore.acquire()
+        self._running += 1
+        self._stats["background_admitted"] += 1
+
+    @contextmanager
+    def hold(self):
+        """
+        Hold a slot from a worker thread for the duration of the block.
+
+        Waits without a deadline (background work is never shed). Outside a
+        started app (CLI, tests) there is nothing to share, so it's a no-op.
+        """
+        loop = self._loop
+        if loop is None or self._closed:
+            yield
+            return
+        future = asyncio.run_coroutine_threadsafe(self._acquire_background(), loop)
+        while True:
+            try:
+                future.result(timeout=1.0)
+                break
+            except concurrent.futures.TimeoutError:
+                if self._closed or loop.is_closed():
+                    future.cancel()
+                    raise Overloaded("shutting down", self.retry_after)
+        try:
+            yield
+        finally:
+            self.release_threadsafe()
+
+    def release_threadsafe(self):
+        """`release()` from any thread."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.release)
+
+    async def run(self, fn: Callable, *args):
+        """Admit, then run blocking `fn(*args)` on the pipeline pool."""
+        async with self.slot():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def iterate(self, iterator: Iterator) -> AsyncIterator:
+        """
+        Drive a blocking iterator on the pipeline pool while holding a slot.
+
+        The caller must already hold a slot (via `acquire()`); it is released
+        when the iterator is exhausted or the consumer goes away.
+        """
+        loop = asyncio.get_running_loop()
+        sentinel = object()
+        try:
+            while True:
+                item = await loop.run_in_executor(self._executor, next, iterator, sentinel)
+                if item is sentinel:
+                    break
+                yield item
+        finally:
+            self.release()
+
+    def busy(self) -> bool:
+        """True while any admitted pipeline run is in progress."""
+        return self._running > 0
+
+    def metrics(self) -> Dict:
+        admitted = self._stats["admitted"]
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "running": self._running,
+            "queue_depth": self._waiting,
+            "admitted": admitted,
+            "background_admitted": self._stats["background_admitted"],
+            "rejected_queue_full": self._stats["rejected_queue_full"],
+            "rejected_timeout": self._stats["rejected_timeout"],
+            "avg_wait_seconds": round(self._stats["total_wait_seconds"] / admitted, 4) if admitted else 0.0,
+        }
+
+
+# Singleton pattern (Standard Python)
+_admission_instance = None
+
+def get_admission() -> AdmissionController:
+    global _admission_instance
+    if _admission_instance is None:
+        _admission_instance = AdmissionController(
+            max_concurrent=int(os.getenv("PIPELINE_MAX_CONCURRENCY", "4")),
+            max_queue=int(os.getenv("PIPELINE_MAX_QUEUE", "16")),
+            queue_timeout=float(os.getenv("PIPELINE_QUEUE_TIMEOUT", "10")),
+            retry_after=int(os.getenv("PIPELINE_RETRY_AFTER", "5")),
+        )
+    return _admission_instance
@@ -0,0 +1,114 @@
+import hashlib
+import os
+import threading
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Hashable, Optional
+
+from cachetools import TTLCache
+from fastapi import Request
+from fastapi.responses import Response
+
+from src.api.responses import dumps
+
+# Seconds a repeated /api/sentiment query is answered from the response cache
+SENTIMENT_CACHE_TTL = float(os.getenv("SENTIMENT_CACHE_TTL_SECONDS", "60"))
+SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "256"))
+
+
+# --- Conditional requests ---
+def make_etag(*parts) -> str:
+    """Weak ETag over a serialized body, or over anything orjson can serialize."""
+    data = parts[0] if len(parts) == 1 and isinstance(parts[0], bytes) else dumps(parts)
+    return 'W/"' + hashlib.sha1(data).hexdigest()[:20] + '"'
+
+
+def http_date(value: datetime) -> str:
+    """RFC 7231 date for a naive-UTC datetime."""
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None,
+                      cache_control: str = "private, no-cache") -> Dict[str, str]:
+    """Headers for a cacheable response. The default makes clients revalidate every time."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    True when the client's cached copy is current.
+
+    `If-None-Match` wins when present (RFC 7232 §6); `If-Modified-Since` is
+    only consulted without it, at one-second resolution.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        weak = etag[2:] if etag.startswith("W/") else etag
+        return "*" in tags or etag in tags or weak in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
+
+
+# --- In-process response cache ---
+class ResponseCache:
+    """
+    Thread-safe TTL + LRU-evicting cache of response payloads.
+
+    Handlers look a request up here before doing any work; entries expire
+    after `ttl` seconds and the least recently used one is evicted once
+    `maxsize` is reached.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0):
+        self.ttl = ttl
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable):
+        with self._lock:
+            value = self._cache.get(key)
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value):
+        with self._lock:
+            self._cache[key] = value
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "maxsize": self._cache.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+sentiment_cache = ResponseCache(maxsize=SENTIMENT_CACHE_SIZE, ttl=SENTIMENT_CACHE_TTL)
@@ -0,0 +1,119 @@
+import gzip
+import os
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:  # optional: fall back to gzip only
+    brotli = None
+
+# Payloads smaller than this are sent uncompressed (not worth the CPU).
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+
+RESPONSE_FORMATS = ("records", "columnar")
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value):
+    """Types orjson doesn't handle natively (pandas Timestamp, numpy scalars, ...)."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+def dataframe_columns(df) -> Dict[str, list]:
+    """
+    DataFrame as parallel arrays: `{"column": [values...]}`.
+
+    Numeric columns go to orjson as numpy arrays without a Python-object
+    round trip; everything else becomes a plain list.
+    """
+    columns = {}
+    for name in df.columns:
+        values = df[name].to_numpy()
+        columns[str(name)] = values if values.dtype.kind in "biuf" else values.tolist()
+    return columns
+
+
+def records_to_columns(records: List[Dict]) -> Dict[str, list]:
+    """Columnar form of a list of row dicts (keys taken from the first row)."""
+    if not records:
+        return {}
+    return {key: [record.get(key) for record in records] for key in records[0]}
+
+
+def _negotiate_encoding(request: Optional[Request]) -> Optional[str]:
+    if request is None:
+        return None
+    accepted = {
+        part.split(";")[0].strip().lower()
+        for part in request.headers.get("accept-encoding", "").split(",")
+    }
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def fast_json_response(content, request: Optional[Request] = None, status_code: int = 200,
+                       headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Serialize with orjson and compress large bodies (brotli, else gzip).
+
+    Returning this `Response` directly skips FastAPI's `jsonable_encoder`
+    pass and `response_model` validation, so rows are not copied again.
+    `content` may also be an already-serialized JSON body.
+    """
+    body = content if isinstance(content, bytes) else dumps(content)
+    headers = dict(headers or {})
+    headers["Vary"] = "Accept-Encoding"
+
+    encoding = _negotiate_encoding(request) if len(body) >= COMPRESS_MIN_BYTES else None
+    if encoding:
+        body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+def sentiment_payload(keyword: str, df, fmt: str = "records") -> Dict:
+    """Body of `/api/sentiment` for a pipeline DataFrame."""
+    if df is None or df.empty:
+        return {"keyword": keyword, "total_results": 0, "sentiment_breakdown": {},
+                "data": {} if fmt == "columnar" else []}
+
+    sentiment_breakdown = (
+        df["sentiment"].value_counts().to_dict()
+        if "sentiment" in df.columns else {}
+    )
+    data = dataframe_columns(df) if fmt == "columnar" else df.to_dict(orient="records")
+    return {
+        "keyword": keyword,
+        "total_results": len(df),
+        "sentiment_breakdown": sentiment_breakdown,
+        "data": data,
+    }
@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+from typing import Optional
+
+
+class UpstreamBudgetExhausted(Exception):
+    """Raised when no upstream call budget frees up within the wait deadline."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("upstream call budget exhausted")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursting up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0, timeout: float = 0.0) -> bool:
+        """Take `tokens`, waiting up to `timeout` seconds for them to refill."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate if self.rate > 0 else timeout
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or tokens > self.capacity:
+                return False
+            time.sleep(min(wait, remaining))
+
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+class UpstreamBudget:
+    """
+    The one budget every upstream (Twitter/Reddit) call draws from.
+
+    Interactive requests and watchlist polls share it, so together they stay
+    under the providers' rate limits. `spend` waits up to `wait_seconds` for
+    tokens and then raises `UpstreamBudgetExhausted`. With no
+    `calls_per_minute` the budget only counts calls and never blocks.
+    """
+
+    def __init__(self, calls_per_minute: Optional[float] = None, burst: float = 20.0, wait_seconds: float = 5.0):
+        self.bucket = (TokenBucket(rate=calls_per_minute / 60.0, capacity=max(burst, 1.0))
+                       if calls_per_minute is not None else None)
+        self.wait_seconds = wait_seconds
+        self._stats = {"calls": 0, "exhausted": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def calls_per_minute(self) -> Optional[float]:
+        return self.bucket.rate * 60 if self.bucket is not None else None
+
+    def spend(self, calls: int = 1):
+        if self.bucket is not None and not self.bucket.acquire(calls, timeout=self.wait_seconds):
+            with self._lock:
+                self._stats["exhausted"] += 1
+            retry_after = max(1, int(calls / self.bucket.rate)) if self.bucket.rate > 0 else 60
+            raise UpstreamBudgetExhausted(retry_after)
+        with self._lock:
+            self._stats["calls"] += calls
+
+    def available(self) -> float:
+        return self.bucket.available() if self.bucket is not None else float("inf")
+
+    def metrics(self):
+        limited = self.bucket is not None
+        with self._lock:
+            return {
+                "calls_per_minute": round(self.calls_per_minute, 2) if limited else None,
+                "burst": self.bucket.capacity if limited else None,
+                "tokens": round(self.bucket.available(), 2) if limited else None,
+                **self._stats,
+            }
+
+
+# Singleton pattern (Standard Python)
+_budget_instance = None
+
+def get_upstream_budget() -> UpstreamBudget:
+    """
+    Unlimited unless UPSTREAM_BUDGET_CALLS_PER_MINUTE is set, or the watchlist
+    scheduler is enabled (it then defaults to 60 calls/min, so unattended
+    polls can't run the providers' limits down).
+    """
+    global _budget_instance
+    if _budget_instance is None:
+        default = "60" if os.getenv("WATCHLIST_ENABLED", "0") == "1" else None
+        calls_per_minute = os.getenv("UPSTREAM_BUDGET_CALLS_PER_MINUTE", default)
+        _budget_instance = UpstreamBudget(
+            calls_per_minute=float(calls_per_minute) if calls_per_minute else None,
+            burst=float(os.getenv("UPSTREAM_BUDGET_BURST", "20")),
+            wait_seconds=float(os.getenv("UPSTREAM_BUDGET_WAIT_SECONDS", "5")),
+        )
+    return _budget_instance
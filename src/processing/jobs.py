@@ -0,0 +1,225 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from cachetools import TTLCache
+
+from src.processing.pipeline import run_sentiment_pipeline
+
+logger = logging.getLogger("sentilytics")
+
+
+class JobQueueFull(Exception):
+    """Raised when the job pool already has `max_pending` jobs waiting or running."""
+
+
+def build_result_set(df) -> Dict:
+    """Convert a pipeline DataFrame once into records plus summary counts."""
+    if df is None or df.empty:
+        return {"records": [], "sentiment_counts": {}, "platform_summary": {}}
+
+    sentiment_counts = df["sentiment"].value_counts().to_dict() if "sentiment" in df.columns else {}
+    platform_summary = {}
+    if "source" in df.columns and "sentiment" in df.columns:
+        try:
+            platform_summary = (
+                df.groupby("source")["sentiment"]
+                .value_counts()
+                .unstack(fill_value=0)
+                .to_dict("index")
+            )
+        except (KeyError, ValueError):
+            platform_summary = {}
+
+    return {
+        "records": df.to_dict("records"),
+        "sentiment_counts": sentiment_counts,
+        "platform_summary": platform_summary,
+    }
+
+
+def page_result_set(result_set: Dict, page: int, page_size: int) -> Dict:
+    """Slice a cached result set into the `/analyze` response shape."""
+    records = result_set["records"]
+    total = len(records)
+    start = (page - 1) * page_size
+    end = start + page_size
+    summary = {
+        "total_posts": total,
+        "sentiment_counts": result_set["sentiment_counts"],
+        "platform_summary": result_set["platform_summary"],
+        "page": page,
+        "page_size": page_size,
+        "has_next": end < total,
+    }
+    return {"data": records[start:end], "summary": summary}
+
+
+class Job:
+    """State of one pipeline run submitted to the `JobManager`."""
+
+    def __init__(self, keyword: str, max_results: int):
+        self.id = uuid.uuid4().hex
+        self.keyword = keyword
+        self.max_results = max_results
+        self.status = "queued"  # queued -> running -> succeeded | failed
+        self.stage = None
+        self.progress = 0.0
+        self.error = None
+        self.total_posts = None
+        self.created_at = datetime.utcnow()
+        self.started_at = None
+        self.finished_at = None
+        self.future: Optional[Future] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "keyword": self.keyword,
+            "max_results": self.max_results,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": round(self.progress, 3),
+            "total_posts": self.total_posts,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    """
+    Runs pipeline jobs on a fixed-size thread pool and caches their results.
+
+    Identical requests (same keyword and max_results) that arrive while a
+    job is queued or running share that job. Queued and running jobs are
+    pinned until they finish; only finished jobs age out of the TTL cache.
+    Finished result sets are cached by query, so every `page`/`page_size`
+    is served without recomputing, and by job id, so a job's results stay
+    its own even after a newer run of the same query.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 32,
+                 result_ttl: float = 600.0, max_cached_results: int = 128):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline-job")
+        self._lock = threading.Lock()
+        self._jobs: TTLCache = TTLCache(maxsize=max_cached_results, ttl=result_ttl)  # finished jobs
+        self._active: Dict[tuple, Job] = {}
+        self._pinned: Dict[str, Job] = {}  # queued or running, by job id
+        self._results: TTLCache = TTLCache(maxsize=max_cached_results, ttl=result_ttl)
+        self._job_results: TTLCache = TTLCache(maxsize=max_cached_results, ttl=result_ttl)
+
+    @staticmethod
+    def _key(keyword: str, max_results: int) -> tuple:
+        return (keyword.strip().lower(), max_results)
+
+    def submit(self, keyword: str, max_results: int) -> Tuple[Job, bool]:
+        """
+        Queue a pipeline run, or join the in-flight job for the same query.
+
+        Returns `(job, created)`; `created` is False when an existing job was joined.
+        """
+        key = self._key(keyword, max_results)
+        with self._lock:
+            active = self._active.get(key)
+            if active is not None:
+                return active, False
+            if len(self._active) >= self.max_pending:
+                raise JobQueueFull(f"{len(self._active)} jobs already pending")
+
+            job = Job(keyword, max_results)
+            self._pinned[job.id] = job
+            self._active[key] = job
+        job.future = self._executor.submit(self._run, job, key)
+        return job, True
+
+    def active_job(self, keyword: str, max_results: int) -> Optional[Job]:
+        """The queued or running job for this query, if any."""
+        with self._lock:
+            return self._active.get(self._key(keyword, max_results))
+
+    def _run(self, job: Job, key: tuple):
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        started = time.perf_counter()
+
+        def progress(stage, fraction):
+            job.stage = stage
+            job.progress = fraction
+
+        try:
+            df = run_sentiment_pipeline(job.keyword, job.max_results, progress=progress)
+            result_set = build_result_set(df)
+            with self._lock:
+                self._results[key] = result_set
+                self._job_results[job.id] = result_set
+            job.total_posts = len(result_set["records"])
+            job.stage = "done"
+            job.progress = 1.0
+            job.status = "succeeded"
+            logger.info("Job %s completed: keyword=%s, rows=%d, %.2fs",
+                        job.id, job.keyword, job.total_posts, time.perf_counter() - started)
+            return result_set
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.exception("Job %s failed for keyword=%s", job.id, job.keyword)
+            raise
+        finally:
+            job.finished_at = datetime.utcnow()
+            with self._lock:
+                self._active.pop(key, None)
+                # Unpin; the TTL starts from completion time
+                self._pinned.pop(job.id, None)
+                self._jobs[job.id] = job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._pinned.get(job_id) or self._jobs.get(job_id)
+
+    def cached_result(self, keyword: str, max_results: int) -> Optional[Dict]:
+        with self._lock:
+            return self._results.get(self._key(keyword, max_results))
+
+    def job_result(self, job: Job) -> Optional[Dict]:
+        """Result set of a finished job, or None once it has expired from the cache."""
+        with self._lock:
+            return self._job_results.get(job.id)
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "pending_jobs": len(self._active),
+                "max_pending": self.max_pending,
+                "cached_results": len(self._results),
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Singleton pattern (Standard Python)
+_job_manager = None
+
+def get_job_manager() -> JobManager:
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager(
+            max_workers=int(os.getenv("JOB_WORKERS", "2")),
+            max_pending=int(os.getenv("JOB_MAX_PENDING", "32")),
+            result_ttl=float(os.getenv("JOB_RESULT_TTL_SECONDS", "600")),
+        )
+    return _job_manager
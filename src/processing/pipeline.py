@@ -1,8 +1,12 @@
-from database.db import engine
+from database.bulk import bulk_upsert_results, content_hash, dataframe_to_rows, stored_hashes
+from database.write_behind import get_writer
 # FIX: Use absolute imports instead of relative ".." imports
 from src.connectors.api_clients import fetch_twitter_data, fetch_reddit_data
+from src.connectors.budget import get_upstream_budget
 from src.processing.text_cleaner import preprocess_text
 from src.analysis.model import get_analyzer
+from src.analysis.shifts import get_shift_detector
+from src.analysis.clusters import clustering_enabled, get_topic_clusters
 import pandas as pd
 import logging
 
@@ -22,13 +26,16 @@ def _standardize_posts(posts, source):
         })
     return standardized
 
-def run_sentiment_pipeline(keyword, max_results=50):
-    analyzer = get_analyzer()
+def _no_progress(stage, fraction):
+    pass
 
-    print(f"🚀 [Pipeline] Starting analysis for: {keyword}")
 
-    # --- 1. EXTRACT ---
-    # Fetch data (Twitter will use Mock Data if scraping fails)
+def _extract(keyword, max_results):
+    """Fetch posts from every source and add a `cleaned_text` column."""
+    # Fetch data (Twitter will use Mock Data if scraping fails); both calls
+    # draw from the shared upstream budget up front, so a run either gets
+    # both or raises UpstreamBudgetExhausted before fetching anything
+    get_upstream_budget().spend(2)
     twitter_posts = fetch_twitter_data(keyword, max_results)
     reddit_posts = fetch_reddit_data(keyword, max_results)
 
@@ -47,19 +54,37 @@ def run_sentiment_pipeline(keyword, max_results=50):
         return pd.DataFrame()
 
     df['cleaned_text'] = df['text'].apply(preprocess_text)
+    return df
 
-    # --- 2. TRANSFORM (Analysis) ---
+
+def _score(analyzer, df, keyword=None):
+    """
+    Add `sentiment`/`sentiment_score` columns; None if the analysis failed.
+
+    Posts that clean to empty text get Neutral / 0.0 placeholders without
+    inference, also when every post is empty, so all pipeline variants
+    store and return them alike.
+
+    With clustering enabled (CLUSTERING_ENABLED=1) the same forward pass
+    also yields embeddings, which assign each scored post to one of the
+    keyword's topic clusters (a `cluster` column, -1 for posts that
+    weren't scored).
+    """
     # Filter out empty texts
     valid_texts_df = df[df['cleaned_text'].str.len() > 0].copy()
     
     if valid_texts_df.empty:
-        return df
+        return df.assign(sentiment='Neutral', sentiment_score=0.0)
 
     # Apply analysis
     results_df = pd.DataFrame()
     try:
         # Run the actual AI model
-        raw_results = analyzer.analyze(valid_texts_df['cleaned_text'].tolist())
+        embeddings = None
+        if clustering_enabled():
+            raw_results, embeddings = analyzer.analyze(valid_texts_df['cleaned_text'].tolist(), return_embeddings=True)
+        else:
+            raw_results = analyzer.analyze(valid_texts_df['cleaned_text'].tolist())
         results_df = pd.DataFrame(raw_results)
         
         # Standardize column names
@@ -71,7 +96,7 @@ def run_sentiment_pipeline(keyword, max_results=50):
 
     except Exception as e:
         print(f"❌ [Pipeline Error] Sentiment analysis failed: {e}")
-        return df 
+        return None
 
     # Join results back to the main dataframe
     if not results_df.empty:
@@ -83,6 +108,12 @@ def run_sentiment_pipeline(keyword, max_results=50):
             how='left'
         )
     
+    if embeddings is not None and not results_df.empty:
+        try:
+            _assign_clusters(df, valid_texts_df.index, embeddings, keyword)
+        except Exception as e:
+            print(f"⚠️ [Clusters] Assignment failed (Non-critical): {e}")
+
     # Fill NaNs for display safety
     if 'sentiment' in df.columns:
         df['sentiment'] = df['sentiment'].fillna('Neutral')
@@ -91,23 +122,129 @@ def run_sentiment_pipeline(keyword, max_results=50):
         # Fallback if merge failed
         df['sentiment'] = 'Neutral'
         df['sentiment_score'] = 0.0
+    return df
 
-    # --- 3. LOAD (Database) ---
+
+def _assign_clusters(df, index, embeddings, keyword):
+    scored = df.loc[index]
+    clusters = get_topic_clusters().observe(
+        keyword,
+        embeddings,
+        labels=scored['sentiment'].tolist(),
+        hashes=[content_hash(text, source) for text, source in zip(scored['text'], scored['source'])],
+        terms=[text.split() for text in scored['cleaned_text']],
+        texts=scored['text'].tolist(),
+    )
+    df['cluster'] = -1
+    df.loc[index, 'cluster'] = clusters
+
+
+def _load(df, keyword, model_version=None):
+    """Persist scored rows and feed them to the shift detector (failures are logged, never raised)."""
     try:
-        db_columns = df[['text', 'sentiment', 'sentiment_score']].copy()
-        db_columns.rename(columns={
-            'text': 'input_text',
-            'sentiment': 'sentiment_label',
-        }, inplace=True)
-
-        db_columns.to_sql(
-            name='sentiment_results',
-            con=engine,
-            if_exists='append',
-            index=False
-        )
-        print(f"💾 [Database] Saved {len(db_columns)} results.")
+        rows = dataframe_to_rows(df, keyword=keyword, model_version=model_version)
+    except Exception as e:
+        print(f"⚠️ [Database Error] Save failed (Non-critical): {e}")
+        return
+
+    try:
+        get_shift_detector().observe_rows(rows)
+    except Exception as e:
+        print(f"⚠️ [Shifts] Detector update failed (Non-critical): {e}")
+
+    # Hand rows to the write-behind queue when the API has started it, so the
+    # response doesn't wait on the insert; otherwise write synchronously.
+    try:
+        writer = get_writer()
+        if writer.running:
+            queued = writer.submit(rows)
+            print(f"💾 [Database] Queued {queued} results for write-behind.")
+        else:
+            saved = bulk_upsert_results(rows)
+            print(f"💾 [Database] Saved {saved} results.")
     except Exception as e:
         print(f"⚠️ [Database Error] Save failed (Non-critical): {e}")
 
-    return df
\ No newline at end of file
+
+def run_sentiment_pipeline(keyword, max_results=50, progress=_no_progress):
+    """
+    Fetch, clean, score and store posts for `keyword`.
+
+    `progress(stage, fraction)` is called as each stage finishes, so job
+    runners can report how far along a run is.
+    """
+    analyzer = get_analyzer()
+
+    print(f"🚀 [Pipeline] Starting analysis for: {keyword}")
+    progress("extract", 0.0)
+
+    # --- 1. EXTRACT ---
+    df = _extract(keyword, max_results)
+    if df.empty:
+        return df
+    progress("score", 0.4)
+
+    # --- 2. TRANSFORM (Analysis) ---
+    scored = _score(analyzer, df, keyword)
+    if scored is None:
+        return df
+    progress("load", 0.9)
+
+    # --- 3. LOAD (Database) ---
+    _load(scored, keyword, analyzer.model_name)
+
+    return scored
+
+
+def run_incremental_pipeline(keyword, max_results=50):
+    """
+    Fetch posts for `keyword` but only score and store the ones not stored yet.
+
+    Used by the watchlist scheduler, which re-polls the same keyword: posts
+    already in the database are dropped before inference. Returns
+    `(fetched_count, new_posts_df)`.
+    """
+    analyzer = get_analyzer()
+
+    df = _extract(keyword, max_results)
+    if df.empty:
+        return 0, df
+
+    hashes = pd.Series([content_hash(text, source) for text, source in zip(df["text"], df["source"])],
+                       index=df.index)
+    stored = stored_hashes(hashes)
+    fresh = df[~hashes.isin(stored) & ~hashes.duplicated()]
+    print(f"🚀 [Pipeline] {keyword}: {len(fresh)} new of {len(df)} fetched posts.")
+    if fresh.empty:
+        return len(df), fresh
+
+    scored = _score(analyzer, fresh, keyword)
+    if scored is None:
+        return len(df), fresh.iloc[0:0]
+
+    _load(scored, keyword, analyzer.model_name)
+    return len(df), scored
+
+
+def iter_sentiment_pipeline(keyword, max_results=50, batch_size=32):
+    """
+    Streaming variant of `run_sentiment_pipeline`.
+
+    Posts are fetched and cleaned up front, then scored and stored
+    `batch_size` at a time; each scored batch is yielded as a DataFrame as
+    soon as its inference finishes. Posts that clean to empty text get the
+    same Neutral / 0.0 placeholders as in `run_sentiment_pipeline` (see
+    `_score`), even when a whole batch is empty.
+    """
+    analyzer = get_analyzer()
+
+    print(f"🚀 [Pipeline] Streaming analysis for: {keyword}")
+    df = _extract(keyword, max_results)
+
+    for start in range(0, len(df), batch_size):
+        batch = df.iloc[start:start + batch_size]
+        scored = _score(analyzer, batch, keyword)
+        if scored is None:
+            continue
+        _load(scored, keyword, analyzer.model_name)
+        yield scored
@@ -0,0 +1,314 @@
+import logging
+import os
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Callable, ContextManager, Dict, List, Optional
+
+from sqlalchemy import bindparam, func, or_, select, update
+
+from database.db import engine
+from database.models import RescoreCheckpoint, SentimentResult, SentimentRollup
+from database.rollups import apply_rollups
+from database.terms import apply_term_sketches
+from src.analysis.model import get_analyzer
+from src.processing.text_cleaner import preprocess_text
+
+logger = logging.getLogger("sentilytics")
+
+_COLUMNS = ("id", "input_text", "sentiment_label", "sentiment_score", "keyword", "source",
+            "post_created_at", "created_at")
+
+
+def _stale(table, model_version: str):
+    return or_(table.c.model_version.is_(None), table.c.model_version != model_version)
+
+
+def rescore_batch(analyzer, rows: List[Dict], inference_batch: int) -> List[Dict]:
+    """
+    New `{"label", "score", "terms"}` per row, scored the way the pipeline
+    scores posts (`terms` are the cleaned tokens, for the term sketches).
+
+    Rows whose text cleans to nothing were never scored by the pipeline;
+    they keep their stored label. Raises if the analyzer fell back to its
+    neutral placeholders, so a failed batch is never written.
+    """
+    cleaned = [preprocess_text(row["input_text"]) for row in rows]
+    results = [{"label": row["sentiment_label"], "score": row["sentiment_score"], "terms": text.split()}
+               for row, text in zip(rows, cleaned)]
+    scored_idx = [i for i, text in enumerate(cleaned) if text]
+    if not scored_idx:
+        return results
+
+    scored = analyzer.analyze([cleaned[i] for i in scored_idx], batch_size=inference_batch)
+    if len(scored) != len(scored_idx) or any(not result.get("score") for result in scored):
+        raise RuntimeError("Analyzer returned fallback scores; batch not written")
+    for i, result in zip(scored_idx, scored):
+        results[i].update(label=str(result["label"]).lower(), score=float(result["score"]))
+    return results
+
+
+class RescoreJob:
+    """
+    Re-scores stored results whose `model_version` isn't the loaded model's.
+
+    Walks `sentiment_results` in primary-key order, `batch_size` rows at a
+    time, scoring them in `inference_batch` chunks. Each batch's label
+    updates, rollup and term-sketch corrections and checkpoint commit in
+    one transaction, so a crashed or stopped job resumes exactly after the
+    last written row. Throughput is capped at `max_rows_per_second`, and before each
+    batch the job waits (up to `max_yield_seconds`) while `should_yield()`
+    reports live analyses in progress; inference then runs inside
+    `admit()`, which the app points at the admission controller.
+    """
+
+    def __init__(self, batch_size: int = 1000, inference_batch: int = 64, max_rows_per_second: float = 50.0,
+                 should_yield: Optional[Callable[[], bool]] = None, max_yield_seconds: float = 5.0, bind=None):
+        self.batch_size = batch_size
+        self.inference_batch = inference_batch
+        self.max_rows_per_second = max_rows_per_second
+        self.should_yield = should_yield
+        self.admit: Callable[[], ContextManager] = nullcontext
+        self.max_yield_seconds = max_yield_seconds
+        self.bind = bind or engine
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._model_version: Optional[str] = None
+        self._rows_per_second: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """Start (or resume) in a background thread; False if already running."""
+        with self._lock:
+            if self.running:
+                return False
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run_logged, name="rescore", daemon=True)
+            self._thread.start()
+        return True
+
+    def resume_interrupted(self) -> bool:
+        """Restart a job that was still running when the process exited."""
+        with self.bind.connect() as conn:
+            interrupted = conn.execute(
+                select(func.count()).select_from(RescoreCheckpoint.__table__)
+                .where(RescoreCheckpoint.__table__.c.status == "running")
+            ).scalar()
+        return bool(interrupted) and self.start()
+
+    def stop(self, timeout: float = 30.0):
+        """Stop after the current batch; its checkpoint is kept for resuming."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def _run_logged(self):
+        try:
+            self.run()
+        except Exception:
+            logger.exception("[Rescore] Job failed")
+
+    def run(self, progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Re-score in the calling thread until done or stopped; returns the final status."""
+        analyzer = get_analyzer()
+        model_version = analyzer.model_name
+        self._model_version = model_version
+        checkpoint = self._open_checkpoint(model_version)
+        if checkpoint is None:
+            return self.status()
+        logger.info("[Rescore] Re-scoring %d rows with %s from id > %d",
+                    checkpoint["rows_total"] - checkpoint["rows_done"], model_version, checkpoint["last_id"])
+
+        table = SentimentResult.__table__
+        last_id = checkpoint["last_id"]
+        finished = False
+        try:
+            while not self._stop.is_set():
+                started = time.monotonic()
+                with self.bind.connect() as conn:
+                    rows = conn.execute(
+                        select(*(table.c[name] for name in _COLUMNS))
+                        .where(table.c.id > last_id, _stale(table, model_version))
+                        .order_by(table.c.id)
+                        .limit(self.batch_size)
+                    ).mappings().all()
+                if not rows:
+                    finished = True
+                    break
+
+                self._yield_to_live_requests()
+                with self.admit():
+                    results = rescore_batch(analyzer, rows, self.inference_batch)
+                last_id = rows[-1]["id"]
+                self._write_batch(model_version, rows, results, last_id)
+
+                elapsed = time.monotonic() - started
+                # Throttle: stretch each batch to at least len(rows) / max_rows_per_second
+                if self.max_rows_per_second > 0:
+                    self._stop.wait(max(0.0, len(rows) / self.max_rows_per_second - elapsed))
+                self._rows_per_second = len(rows) / max(time.monotonic() - started, 1e-6)
+                if progress:
+                    progress(self.status())
+
+            if finished:
+                self._finish(model_version)
+            else:
+                self._set_status(model_version, "stopped")
+        except Exception as e:
+            self._set_status(model_version, "failed", error=str(e))
+            raise
+        finally:
+            self._rows_per_second = None
+        return self.status()
+
+    def _yield_to_live_requests(self):
+        if self.should_yield is None:
+            return
+        deadline = time.monotonic() + self.max_yield_seconds
+        while time.monotonic() < deadline and not self._stop.is_set() and self.should_yield():
+            self._stop.wait(0.25)
+
+    def _open_checkpoint(self, model_version: str) -> Optional[Dict]:
+        """Start or resume the checkpoint for `model_version`; None if nothing needs re-scoring."""
+        ckpt = RescoreCheckpoint.__table__
+        results = SentimentResult.__table__
+        now = datetime.utcnow()
+        with self.bind.begin() as conn:
+            row = conn.execute(select(ckpt).where(ckpt.c.model_version == model_version)).mappings().first()
+            if row is None or row["status"] == "done":
+                # Fresh run; a finished model that is switched back to starts over
+                last_id, rows_done, rows_changed = 0, 0, 0
+            else:
+                last_id, rows_done, rows_changed = row["last_id"], row["rows_done"], row["rows_changed"]
+            remaining = conn.execute(
+                select(func.count()).select_from(results)
+                .where(results.c.id > last_id, _stale(results, model_version))
+            ).scalar()
+            if row is not None and row["status"] == "done" and not remaining:
+                return None
+            values = {
+                "status": "running", "last_id": last_id, "rows_total": rows_done + remaining,
+                "rows_done": rows_done, "rows_changed": rows_changed,
+                "updated_at": now, "finished_at": None, "last_error": None,
+            }
+            if row is None:
+                conn.execute(ckpt.insert().values(model_version=model_version, started_at=now, **values))
+            else:
+                if row["status"] == "done":
+                    values["started_at"] = now
+                conn.execute(ckpt.update().where(ckpt.c.id == row["id"]).values(**values))
+        return values
+
+    def _write_batch(self, model_version: str, rows: List[Dict], results: List[Dict], last_id: int) -> int:
+        """Write one batch and its checkpoint in a transaction; returns how many labels changed."""
+        table = SentimentResult.__table__
+        ckpt = RescoreCheckpoint.__table__
+        old_rows = []
+        new_rows = []
+        for row, result in zip(rows, results):
+            if row["sentiment_label"] != result["label"] or row["sentiment_score"] != result["score"]:
+                old_rows.append(row)
+                new_rows.append({**row, "sentiment_label": result["label"], "sentiment_score": result["score"]})
+        moved = [(row, result) for row, result in zip(rows, results) if row["sentiment_label"] != result["label"]]
+        changed = len(moved)
+        now = datetime.utcnow()
+
+        with self.bind.begin() as conn:
+            conn.execute(
+                update(table).where(table.c.id == bindparam("row_id")).values(
+                    sentiment_label=bindparam("label"),
+                    sentiment_score=bindparam("score"),
+                    model_version=bindparam("version"),
+                    updated_at=bindparam("updated_at"),
+                ),
+                [
+                    {"row_id": row["id"], "label": result["label"], "score": result["score"],
+                     "version": model_version, "updated_at": now}
+                    for row, result in zip(rows, results)
+                ],
+            )
+            # Move changed rows between rollup buckets in the same transaction
+            if old_rows:
+                apply_rollups(conn, old_rows, sign=-1)
+                apply_rollups(conn, new_rows)
+            # Relabelled posts' terms move between label windows the same way
+            if moved:
+                apply_term_sketches(conn, [{**row, "terms": result["terms"]} for row, result in moved], sign=-1)
+                apply_term_sketches(conn, [{**row, "sentiment_label": result["label"], "terms": result["terms"]}
+                                           for row, result in moved])
+            conn.execute(
+                ckpt.update().where(ckpt.c.model_version == model_version).values(
+                    last_id=last_id,
+                    rows_done=ckpt.c.rows_done + len(rows),
+                    rows_changed=ckpt.c.rows_changed + changed,
+                    updated_at=datetime.utcnow(),
+                )
+            )
+        return changed
+
+    def _finish(self, model_version: str):
+        rollups = SentimentRollup.__table__
+        with self.bind.begin() as conn:
+            conn.execute(rollups.delete().where(rollups.c.post_count <= 0))
+        status = self._set_status(model_version, "done")
+        logger.info("[Rescore] Done: %d rows re-scored with %s, %d labels changed",
+                    status["rows_done"], model_version, status["rows_changed"])
+
+    def _set_status(self, model_version: str, status: str, error: Optional[str] = None) -> Dict:
+        ckpt = RescoreCheckpoint.__table__
+        now = datetime.utcnow()
+        values = {"status": status, "updated_at": now, "last_error": error}
+        if status == "done":
+            values["finished_at"] = now
+        with self.bind.begin() as conn:
+            conn.execute(ckpt.update().where(ckpt.c.model_version == model_version).values(**values))
+            return dict(conn.execute(select(ckpt).where(ckpt.c.model_version == model_version)).mappings().one())
+
+    def status(self) -> Dict:
+        """Progress of the current (or most recent) job."""
+        ckpt = RescoreCheckpoint.__table__
+        query = select(ckpt)
+        if self._model_version:
+            query = query.where(ckpt.c.model_version == self._model_version)
+        with self.bind.connect() as conn:
+            row = conn.execute(query.order_by(ckpt.c.updated_at.desc()).limit(1)).mappings().first()
+        if row is None:
+            return {"running": self.running, "status": None}
+
+        rate = self._rows_per_second
+        remaining = max(0, row["rows_total"] - row["rows_done"])
+        return {
+            "running": self.running,
+            "model_version": row["model_version"],
+            "status": row["status"],
+            "rows_total": row["rows_total"],
+            "rows_done": row["rows_done"],
+            "rows_changed": row["rows_changed"],
+            "progress": round(row["rows_done"] / row["rows_total"], 4) if row["rows_total"] else 1.0,
+            "last_id": row["last_id"],
+            "rows_per_second": round(rate, 2) if rate else None,
+            "eta_seconds": round(remaining / rate, 1) if rate and self.running else None,
+            "started_at": row["started_at"],
+            "updated_at": row["updated_at"],
+            "finished_at": row["finished_at"],
+            "last_error": row["last_error"],
+        }
+
+
+# Singleton pattern (Standard Python)
+_rescore_instance = None
+
+def get_rescore_job() -> RescoreJob:
+    global _rescore_instance
+    if _rescore_instance is None:
+        _rescore_instance = RescoreJob(
+            batch_size=int(os.getenv("RESCORE_BATCH_SIZE", "1000")),
+            inference_batch=int(os.getenv("RESCORE_INFERENCE_BATCH", "64")),
+            max_rows_per_second=float(os.getenv("RESCORE_MAX_ROWS_PER_SECOND", "50")),
+        )
+    return _rescore_instance
@@ -0,0 +1,71 @@
+import json
+import logging
+import time
+from collections import Counter
+from typing import Dict, Iterator
+
+from src.connectors.budget import UpstreamBudgetExhausted
+from src.processing.pipeline import iter_sentiment_pipeline
+
+logger = logging.getLogger("sentilytics")
+
+STREAM_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def iter_stream_events(keyword: str, max_results: int = 200, batch_size: int = 32) -> Iterator[Dict]:
+    """
+    Events for a progressively delivered sentiment analysis.
+
+    A `started` event is sent immediately; after that each scored batch
+    yields a `posts` event followed by a `summary` event with the running
+    label and per-source counts. The stream ends with a `done` event
+    carrying the final totals (or an `error` event).
+    """
+    sentiment_counts = Counter()
+    source_counts: Dict[str, Counter] = {}
+    processed = 0
+    started = time.perf_counter()
+
+    def summary(event_type):
+        return {
+            "type": event_type,
+            "keyword": keyword,
+            "total_results": processed,
+            "sentiment_breakdown": dict(sentiment_counts),
+            "platform_summary": {source: dict(counts) for source, counts in source_counts.items()},
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+        }
+
+    yield {"type": "started", "keyword": keyword}
+    try:
+        for batch in iter_sentiment_pipeline(keyword, max_results, batch_size):
+            records = batch.to_dict(orient="records")
+            processed += len(records)
+            for record in records:
+                sentiment_counts[record["sentiment"]] += 1
+                source_counts.setdefault(record.get("source"), Counter())[record["sentiment"]] += 1
+            yield {"type": "posts", "data": records}
+            yield summary("summary")
+    except UpstreamBudgetExhausted as e:
+        yield {"type": "error", "detail": "Upstream rate budget exhausted. Try again shortly.",
+               "retry_after": e.retry_after}
+        return
+    except Exception:
+        logger.exception("Streaming analysis failed for query: %s", keyword)
+        yield {"type": "error", "detail": "Internal server error during analysis."}
+        return
+
+    yield summary("done")
+
+
+def encode_ndjson(events: Iterator[Dict]) -> Iterator[str]:
+    for event in events:
+        yield json.dumps(event, default=str) + "\n"
+
+
+def encode_sse(events: Iterator[Dict]) -> Iterator[str]:
+    for event in events:
+        yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
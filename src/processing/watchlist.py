@@ -0,0 +1,263 @@
+import logging
+import os
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, ContextManager, Dict, List, Optional
+
+import pandas as pd
+
+from database.db import SessionLocal
+from database.models import WatchedKeyword
+from src.connectors.budget import UpstreamBudget, UpstreamBudgetExhausted, get_upstream_budget
+from src.processing.pipeline import run_incremental_pipeline
+
+logger = logging.getLogger("sentilytics")
+
+# Upstream calls per poll (one per connector: Twitter and Reddit)
+CALLS_PER_POLL = 2
+
+
+def next_interval(watch: WatchedKeyword, new_posts: int, elapsed_seconds: Optional[float]) -> float:
+    """
+    Adapt the polling interval to the keyword's observed post rate.
+
+    Aims for about half of `max_results` new posts per poll: hot keywords
+    are polled sooner (and at once harder if a poll came back full, since
+    posts may have been missed), quiet ones back off exponentially. The
+    result is clamped to the keyword's [min, max] interval.
+    """
+    interval = watch.interval_seconds
+    if elapsed_seconds and elapsed_seconds > 0:
+        rate = new_posts * 3600.0 / elapsed_seconds
+        previous = watch.post_rate_per_hour
+        watch.post_rate_per_hour = rate if previous is None else 0.7 * previous + 0.3 * rate
+
+    target = max(1.0, watch.max_results / 2)
+    if new_posts == 0:
+        interval *= 2
+    elif watch.post_rate_per_hour:
+        interval = target * 3600.0 / watch.post_rate_per_hour
+    if new_posts >= watch.max_results:
+        interval = min(interval, watch.interval_seconds / 2)
+    return min(max(interval, watch.min_interval_seconds), watch.max_interval_seconds)
+
+
+def watch_state(watch: WatchedKeyword, now: Optional[datetime] = None, running: bool = False) -> Dict:
+    """API view of a watched keyword, including how far behind schedule it is."""
+    now = now or datetime.utcnow()
+    return {
+        "keyword": watch.keyword,
+        "enabled": watch.enabled,
+        "max_results": watch.max_results,
+        "running": running,
+        "interval_seconds": round(watch.interval_seconds, 1),
+        "min_interval_seconds": watch.min_interval_seconds,
+        "max_interval_seconds": watch.max_interval_seconds,
+        "next_run_at": watch.next_run_at,
+        # Overdue time: waiting on the upstream budget or a free worker
+        "schedule_lag_seconds": max(0.0, round((now - watch.next_run_at).total_seconds(), 1))
+        if watch.enabled and watch.next_run_at else 0.0,
+        # Age of the newest post seen for this keyword
+        "data_lag_seconds": round((now - watch.last_post_at).total_seconds(), 1) if watch.last_post_at else None,
+        "runs": watch.runs,
+        "consecutive_failures": watch.consecutive_failures,
+        "last_run_at": watch.last_run_at,
+        "last_success_at": watch.last_success_at,
+        "last_duration_seconds": watch.last_duration_seconds,
+        "last_fetched": watch.last_fetched,
+        "last_new_posts": watch.last_new_posts,
+        "post_rate_per_hour": round(watch.post_rate_per_hour, 2) if watch.post_rate_per_hour is not None else None,
+        "last_error": watch.last_error,
+    }
+
+
+class WatchlistScheduler:
+    """
+    Polls watched keywords on adaptive schedules within the shared upstream budget.
+
+    A daemon thread wakes every `tick_seconds`, picks the most overdue
+    enabled keywords and, while budget tokens and workers are free, runs
+    them through `run_incremental_pipeline` (only posts not stored yet are
+    scored and persisted). The budget is the one interactive requests draw
+    from too (`src.connectors.budget`); keywords that can't get budget stay
+    due and accumulate schedule lag. Each poll runs inside `admit()`, which the app
+    points at the admission controller so polls share its concurrency cap.
+    """
+
+    def __init__(self, workers: int = 2, budget: Optional[UpstreamBudget] = None, tick_seconds: float = 1.0):
+        self.workers = workers
+        self.tick_seconds = tick_seconds
+        self.budget = budget or get_upstream_budget()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._in_flight = set()
+        self._stats = {"polls": 0, "failures": 0, "budget_deferrals": 0, "new_posts": 0}
+        self.admit: Callable[[], ContextManager] = nullcontext
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="watchlist")
+        self._thread = threading.Thread(target=self._loop, name="watchlist", daemon=True)
+        self._thread.start()
+        logger.info("[Watchlist] Started (workers=%d, budget=%s calls/min)",
+                    self.workers, self.budget.calls_per_minute or "unlimited")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def is_running(self, keyword_id: int) -> bool:
+        with self._lock:
+            return keyword_id in self._in_flight
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self._dispatch_due()
+            except Exception:
+                logger.exception("[Watchlist] Dispatch failed")
+            self._stop.wait(self.tick_seconds)
+
+    def _dispatch_due(self):
+        with self._lock:
+            free = self.workers - len(self._in_flight)
+            in_flight = set(self._in_flight)
+        if free <= 0:
+            return
+
+        db = SessionLocal()
+        try:
+            due = (
+                db.query(WatchedKeyword.id)
+                .filter(WatchedKeyword.enabled.is_(True), WatchedKeyword.next_run_at <= datetime.utcnow())
+                .order_by(WatchedKeyword.next_run_at)
+                .limit(free + len(in_flight))
+                .all()
+            )
+        finally:
+            db.close()
+
+        # Only dispatch polls the budget can cover now; the calls themselves
+        # spend the tokens (see `_extract`), as interactive requests do
+        available = self.budget.available()
+        for (keyword_id,) in due:
+            if keyword_id in in_flight:
+                continue
+            if free <= 0:
+                break
+            if available < CALLS_PER_POLL:
+                with self._lock:
+                    self._stats["budget_deferrals"] += 1
+                break
+            available -= CALLS_PER_POLL
+            with self._lock:
+                self._in_flight.add(keyword_id)
+            free -= 1
+            self._executor.submit(self._poll, keyword_id)
+
+    def _poll(self, keyword_id: int):
+        db = SessionLocal()
+        try:
+            watch = db.get(WatchedKeyword, keyword_id)
+            if watch is None or not watch.enabled:
+                return
+
+            started = datetime.utcnow()
+            elapsed = (started - watch.last_success_at).total_seconds() if watch.last_success_at else None
+            watch.last_run_at = started
+            watch.runs += 1
+            try:
+                with self.admit():
+                    fetched, new_df = run_incremental_pipeline(watch.keyword, watch.max_results)
+            except UpstreamBudgetExhausted as e:
+                # Interactive traffic took the budget first: stay due, not a failure
+                watch.next_run_at = started + timedelta(seconds=e.retry_after)
+                with self._lock:
+                    self._stats["budget_deferrals"] += 1
+            except Exception as e:
+                logger.exception("[Watchlist] Poll failed for keyword=%s", watch.keyword)
+                watch.consecutive_failures += 1
+                watch.last_error = str(e)
+                # Exponential backoff on errors, capped at the max interval
+                retry = min(watch.interval_seconds * 2 ** watch.consecutive_failures, watch.max_interval_seconds)
+                watch.next_run_at = started + timedelta(seconds=retry)
+                with self._lock:
+                    self._stats["failures"] += 1
+            else:
+                new_posts = len(new_df)
+                watch.interval_seconds = next_interval(watch, new_posts, elapsed)
+                watch.next_run_at = started + timedelta(seconds=watch.interval_seconds)
+                watch.last_success_at = started
+                watch.last_fetched = fetched
+                watch.last_new_posts = new_posts
+                watch.consecutive_failures = 0
+                watch.last_error = None
+                newest = _newest_post_time(new_df)
+                if newest is not None and (watch.last_post_at is None or newest > watch.last_post_at):
+                    watch.last_post_at = newest
+                with self._lock:
+                    self._stats["new_posts"] += new_posts
+                logger.info("[Watchlist] %s: %d new of %d fetched, next poll in %.0fs",
+                            watch.keyword, new_posts, fetched, watch.interval_seconds)
+
+            watch.last_duration_seconds = round((datetime.utcnow() - started).total_seconds(), 3)
+            db.commit()
+            with self._lock:
+                self._stats["polls"] += 1
+        except Exception:
+            db.rollback()
+            logger.exception("[Watchlist] Could not record poll for keyword id=%s", keyword_id)
+        finally:
+            db.close()
+            with self._lock:
+                self._in_flight.discard(keyword_id)
+
+    def metrics(self) -> Dict:
+        budget = self.budget.metrics()
+        with self._lock:
+            return {
+                "running": self.running,
+                "workers": self.workers,
+                "in_flight": len(self._in_flight),
+                "budget_calls_per_minute": budget["calls_per_minute"],
+                "budget_tokens": budget["tokens"],
+                **self._stats,
+            }
+
+
+def _newest_post_time(df) -> Optional[datetime]:
+    if df is None or df.empty or "created_at" not in df.columns:
+        return None
+    newest = pd.to_datetime(df["created_at"], errors="coerce", utc=True, format="mixed").max()
+    return None if pd.isna(newest) else newest.tz_convert(None).to_pydatetime()
+
+
+def list_watches(db, scheduler: Optional["WatchlistScheduler"] = None) -> List[Dict]:
+    now = datetime.utcnow()
+    watches = db.query(WatchedKeyword).order_by(WatchedKeyword.keyword).all()
+    return [watch_state(w, now, scheduler.is_running(w.id) if scheduler else False) for w in watches]
+
+
+# Singleton pattern (Standard Python)
+_scheduler_instance = None
+
+def get_watchlist_scheduler() -> WatchlistScheduler:
+    global _scheduler_instance
+    if _scheduler_instance is None:
+        _scheduler_instance = WatchlistScheduler(
+            workers=int(os.getenv("WATCHLIST_WORKERS", "2")),
+        )
+    return _scheduler_instance
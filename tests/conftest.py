@@ -0,0 +1,21 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Keep the module-level engine off the project's app.db
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def db_engine(tmp_path):
+    """A fresh SQLite database with every table created."""
+    from database import models
+    from database.db import create_db_engine
+
+    engine = create_db_engine(f"sqlite:///{tmp_path}/app.db")
+    models.Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from database.archive import archive_old_results, query_archive
+from database.bulk import bulk_upsert_results, content_hash
+from database.models import SentimentResult
+from database.rollups import backfill_rollups
+from database.terms import backfill_term_sketches, query_top_terms
+from src.processing.text_cleaner import preprocess_text
+from tests.test_maintenance import rollups
+
+
+def insert_rows(engine, created):
+    table = SentimentResult.__table__
+    with engine.begin() as conn:
+        conn.execute(insert(table), [
+            {"input_text": f"post {i}", "sentiment_label": "positive", "sentiment_score": 0.9,
+             "keyword": "acme", "source": "Twitter", "created_at": created_at}
+            for i, created_at in enumerate(created)
+        ])
+
+
+def test_rows_without_created_at_are_archived(db_engine, tmp_path):
+    old = datetime.utcnow() - timedelta(days=60)
+    insert_rows(db_engine, [old, None, datetime.utcnow()])
+
+    assert archive_old_results(30, bind=db_engine, archive_dir=str(tmp_path / "archive")) == 2
+    with db_engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(SentimentResult.__table__)).scalar() == 1
+
+
+def test_archive_reads_oldest_first(db_engine, tmp_path):
+    base = datetime(2026, 1, 1)
+    # Inserted out of order and spread over several date partitions
+    insert_rows(db_engine, [base + timedelta(days=d, hours=h) for d, h in [(3, 1), (0, 5), (2, 0), (0, 1), (1, 9)]])
+    archive_dir = str(tmp_path / "archive")
+    archive_old_results(30, bind=db_engine, archive_dir=archive_dir)
+
+    rows = query_archive(limit=3, columns=["input_text"], archive_dir=archive_dir)
+    assert rows == [{"input_text": "post 3"}, {"input_text": "post 1"}, {"input_text": "post 4"}]
+
+
+def test_rebuilds_keep_the_history_of_archived_rows(db_engine, tmp_path):
+    old = datetime.utcnow() - timedelta(days=60)
+    bulk_upsert_results([
+        {"input_text": text, "sentiment_label": "negative", "sentiment_score": 0.8, "keyword": "acme",
+         "source": "Twitter", "post_created_at": old, "created_at": old,
+         "content_hash": content_hash(text, "Twitter"), "terms": preprocess_text(text).split()}
+        for text in ["battery died again", "battery drains fast"]
+    ], bind=db_engine)
+    archive_dir = str(tmp_path / "archive")
+    archive_old_results(30, bind=db_engine, archive_dir=archive_dir)
+    before = rollups(db_engine)
+
+    backfill_rollups(db_engine, archive_dir=archive_dir)
+    backfill_term_sketches(db_engine, archive_dir=archive_dir)
+
+    assert rollups(db_engine) == before != []
+    db = sessionmaker(bind=db_engine)()
+    try:
+        top = query_top_terms(db, "acme")
+    finally:
+        db.close()
+    assert top["negative"]["terms"][0] == {"term": "battery", "count": 2}
+
+
+def test_rows_without_created_at_are_read_last(db_engine, tmp_path):
+    insert_rows(db_engine, [None, datetime(2026, 1, 2), datetime(2026, 1, 1)])
+    archive_dir = str(tmp_path / "archive")
+    archive_old_results(30, bind=db_engine, archive_dir=archive_dir)
+
+    rows = query_archive(columns=["input_text"], archive_dir=archive_dir)
+    assert rows == [{"input_text": "post 2"}, {"input_text": "post 1"}, {"input_text": "post 0"}]
+    assert query_archive(limit=1, columns=["input_text"], archive_dir=archive_dir) == [{"input_text": "post 2"}]
+    assert query_archive(start=datetime(2026, 1, 2), columns=["input_text"], archive_dir=archive_dir) == [
+        {"input_text": "post 1"}]
@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+import src.connectors.budget as budget_module
+from src.connectors.budget import TokenBucket, UpstreamBudget, UpstreamBudgetExhausted, get_upstream_budget
+
+
+def test_bucket_bursts_to_capacity_then_refills():
+    bucket = TokenBucket(rate=100.0, capacity=2)
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert bucket.acquire(timeout=1.0)  # ~10ms until the next token
+
+
+def test_bucket_never_waits_for_more_than_capacity():
+    bucket = TokenBucket(rate=100.0, capacity=2)
+    started = time.monotonic()
+    assert not bucket.acquire(3, timeout=1.0)
+    assert time.monotonic() - started < 0.5
+
+
+def test_budget_raises_with_retry_after_when_exhausted():
+    budget = UpstreamBudget(calls_per_minute=6, burst=1, wait_seconds=0)
+    budget.spend()
+    with pytest.raises(UpstreamBudgetExhausted) as exc:
+        budget.spend()
+    assert exc.value.retry_after == 10
+    assert budget.metrics()["calls"] == 1
+    assert budget.metrics()["exhausted"] == 1
+
+
+def test_budget_without_a_rate_never_blocks():
+    budget = UpstreamBudget(wait_seconds=5)
+    started = time.monotonic()
+    for _ in range(100):
+        budget.spend(2)
+    assert time.monotonic() - started < 0.5
+    assert budget.metrics()["calls"] == 200
+    assert budget.metrics()["calls_per_minute"] is None
+
+
+def test_budget_is_unlimited_unless_configured_or_polling(monkeypatch):
+    monkeypatch.delenv("UPSTREAM_BUDGET_CALLS_PER_MINUTE", raising=False)
+    monkeypatch.delenv("WATCHLIST_ENABLED", raising=False)
+    monkeypatch.setattr(budget_module, "_budget_instance", None)
+    assert get_upstream_budget().calls_per_minute is None
+
+    monkeypatch.setenv("WATCHLIST_ENABLED", "1")
+    monkeypatch.setattr(budget_module, "_budget_instance", None)
+    assert get_upstream_budget().calls_per_minute == 60
@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from sqlalchemy import text
+
+from database.bulk import bulk_upsert_results, content_hash
+from database.rollups import backfill_rollups
+
+
+def make_row(text_, label, score, model_version="model-a"):
+    return {
+        "input_text": text_,
+        "sentiment_label": label,
+        "sentiment_score": score,
+        "keyword": "acme",
+        "source": "Twitter",
+        "post_created_at": datetime(2026, 10, 1, 12, 30),
+        "content_hash": content_hash(text_, "Twitter"),
+        "model_version": model_version,
+        "terms": text_.split(),
+    }
+
+
+def rollups(engine):
+    with engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT granularity, bucket_start, keyword, source, sentiment_label, post_count, "
+            "ROUND(score_sum, 6) FROM sentiment_rollups WHERE post_count > 0 ORDER BY 1, 2, 3, 4, 5"
+        )).all()
+
+
+def test_refetched_post_keeps_its_row_and_label(db_engine):
+    bulk_upsert_results([make_row("great launch", "positive", 0.9)], bind=db_engine)
+    bulk_upsert_results([make_row("great launch", "negative", 0.7, "model-b")], bind=db_engine)
+
+    with db_engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT sentiment_label, sentiment_score, model_version FROM sentiment_results"
+        )).all()
+    assert rows == [("positive", 0.9, "model-a")]
+
+
+def test_rollups_match_a_rebuild_after_refetches(db_engine):
+    bulk_upsert_results([make_row("great launch", "positive", 0.9), make_row("bad battery", "negative", 0.8)],
+                        bind=db_engine)
+    bulk_upsert_results([make_row("great launch", "negative", 0.6, "model-b"),
+                         make_row("new post", "neutral", 0.5, "model-b")], bind=db_engine)
+
+    incremental = rollups(db_engine)
+    backfill_rollups(db_engine)
+    assert incremental == rollups(db_engine)
@@ -0,0 +1,32 @@
+import pandas as pd
+from sqlalchemy import func, select
+
+from database.bulk import bulk_insert_results, dataframe_to_rows
+from database.db import SQLITE_PRAGMAS
+from database.models import SentimentResult
+
+
+def test_connections_use_wal_and_busy_timeout(db_engine):
+    with db_engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == SQLITE_PRAGMAS["busy_timeout"]
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+
+
+def test_bulk_insert_writes_every_row(db_engine):
+    rows = [
+        {"input_text": f"post {i}", "sentiment_label": "positive", "sentiment_score": 0.5,
+         "keyword": "acme", "source": "Twitter"}
+        for i in range(500)
+    ]
+    assert bulk_insert_results(rows, bind=db_engine) == 500
+    assert bulk_insert_results([], bind=db_engine) == 0
+
+    with db_engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(SentimentResult.__table__)).scalar() == 500
+
+
+def test_labels_are_stored_lowercase():
+    df = pd.DataFrame({"text": ["ok", "great"], "sentiment": ["Neutral", "positive"], "sentiment_score": [0.0, 0.9],
+                       "source": "Twitter"})
+    assert [row["sentiment_label"] for row in dataframe_to_rows(df, "acme")] == ["neutral", "positive"]
@@ -0,0 +1,51 @@
+import threading
+
+import pandas as pd
+
+import src.processing.jobs as jobs_module
+from src.processing.jobs import JobManager
+
+
+def fake_pipeline(release):
+    def run(keyword, max_results, progress):
+        if keyword == "slow":
+            release.wait(5)
+        return pd.DataFrame({"text": [f"{keyword} post"], "source": "Twitter", "sentiment": "positive"})
+    return run
+
+
+def test_running_job_is_not_evicted(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(jobs_module, "run_sentiment_pipeline", fake_pipeline(release))
+    manager = JobManager(max_workers=2, max_pending=2, max_cached_results=2)
+    try:
+        slow, _ = manager.submit("slow", 10)
+        for i in range(5):
+            job, _ = manager.submit(f"fast-{i}", 10)
+            job.future.result(5)
+
+        assert manager.get(slow.id) is slow
+        release.set()
+        slow.future.result(5)
+        assert manager.get(slow.id) is slow
+    finally:
+        release.set()
+        manager.shutdown()
+
+
+def test_job_results_are_keyed_by_job(monkeypatch):
+    runs = iter(["first", "second"])
+    monkeypatch.setattr(jobs_module, "run_sentiment_pipeline",
+                        lambda keyword, max_results, progress: pd.DataFrame({"text": [next(runs)]}))
+    manager = JobManager(max_workers=1)
+    try:
+        first, _ = manager.submit("acme", 10)
+        first.future.result(5)
+        second, _ = manager.submit("acme", 10)
+        second.future.result(5)
+
+        assert manager.job_result(first)["records"] == [{"text": "first"}]
+        assert manager.job_result(second)["records"] == [{"text": "second"}]
+        assert manager.cached_result("acme", 10)["records"] == [{"text": "second"}]
+    finally:
+        manager.shutdown()
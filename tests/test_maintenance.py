@@ -0,0 +1,75 @@
+from datetime import datetime
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.orm import sessionmaker
+
+from database.maintenance import compact_results
+from database.models import SentimentResult
+from database.rollups import backfill_rollups
+from database.terms import backfill_term_sketches, query_top_terms
+
+
+def rollups(engine):
+    with engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT granularity, bucket_start, keyword, source, sentiment_label, post_count, "
+            "ROUND(score_sum, 6) FROM sentiment_rollups WHERE post_count > 0 ORDER BY 1, 2, 3, 4, 5"
+        )).all()
+
+
+def test_compact_keeps_the_oldest_copy_and_corrects_derived_tables(db_engine):
+    # Rows stored before content_hash existed: one post saved three times
+    copies = [("positive", 0.9, "model-a"), ("negative", 0.7, "model-b"), ("negative", 0.6, "model-b")]
+    with db_engine.begin() as conn:
+        conn.execute(insert(SentimentResult.__table__), [
+            {"input_text": "battery died again", "sentiment_label": label, "sentiment_score": score,
+             "keyword": "acme", "source": "Twitter", "post_created_at": datetime(2026, 10, 1, 12),
+             "created_at": datetime(2026, 10, 1, 12, 5), "model_version": version}
+            for label, score, version in copies
+        ])
+    backfill_rollups(db_engine)
+    backfill_term_sketches(db_engine)
+
+    assert compact_results(bind=db_engine)["duplicates_removed"] == 2
+
+    with db_engine.connect() as conn:
+        rows = conn.execute(select(SentimentResult.sentiment_label, SentimentResult.model_version)).all()
+    assert rows == [("positive", "model-a")]
+
+    compacted = rollups(db_engine)
+    backfill_rollups(db_engine)
+    assert compacted == rollups(db_engine)
+
+    db = sessionmaker(bind=db_engine)()
+    try:
+        top = query_top_terms(db, "acme")
+    finally:
+        db.close()
+    assert set(top) == {"positive"}
+    assert top["positive"]["posts"] == 1
+
+
+def test_compact_lowercases_labels_and_merges_their_rollups(db_engine):
+    with db_engine.begin() as conn:
+        conn.execute(insert(SentimentResult.__table__), [
+            {"input_text": text, "sentiment_label": label, "sentiment_score": 0.0, "keyword": "acme",
+             "source": "Twitter", "post_created_at": datetime(2026, 10, 1, 12), "created_at": datetime(2026, 10, 1, 12)}
+            for text, label in [("shipping update posted", "Neutral"), ("store opens monday", "neutral")]
+        ])
+    backfill_rollups(db_engine)
+    backfill_term_sketches(db_engine)
+
+    assert compact_results(bind=db_engine)["labels_normalized"] == 1
+
+    with db_engine.connect() as conn:
+        assert conn.execute(select(SentimentResult.sentiment_label)).scalars().all() == ["neutral", "neutral"]
+    assert {row.sentiment_label for row in rollups(db_engine)} == {"neutral"}
+    assert rollups(db_engine)[0].post_count == 2
+
+    db = sessionmaker(bind=db_engine)()
+    try:
+        top = query_top_terms(db, "acme")
+    finally:
+        db.close()
+    assert set(top) == {"neutral"}
+    assert top["neutral"]["posts"] == 2
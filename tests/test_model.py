@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from benchmarks.bench_inference_pool import build_tiny_model
+from src.analysis.model import SentimentAnalyzer
+
+
+@pytest.fixture(scope="module")
+def analyzer(tmp_path_factory):
+    return SentimentAnalyzer(model_name=build_tiny_model(str(tmp_path_factory.mktemp("tiny"))))
+
+
+def test_embedding_path_matches_pipeline_scores(analyzer):
+    texts = ["great launch love", "terrible battery hate", "price update news", ""] * 3
+
+    plain = analyzer.analyze(texts, batch_size=4)
+    results, embeddings = analyzer.analyze(texts, batch_size=4, return_embeddings=True)
+
+    assert [r["label"] for r in results] == [r["label"] for r in plain]
+    assert np.allclose([r["score"] for r in results], [r["score"] for r in plain], atol=1e-5)
+    assert embeddings.dtype == np.float16
+    assert embeddings.shape == (len(texts), 64)
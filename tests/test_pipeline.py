@@ -1 +1,43 @@
- 
+import pandas as pd
+
+import src.processing.pipeline as pipeline
+
+
+class StubAnalyzer:
+    model_name = "stub"
+
+    def analyze(self, texts, batch_size=32):
+        return [{"label": "positive", "score": 0.9} for _ in texts]
+
+
+def test_stream_emits_batches_of_empty_posts(monkeypatch):
+    posts = pd.DataFrame({
+        "text": ["🔥🔥", "https://t.co/x", "great launch", "love it"],
+        "source": "Twitter",
+        "cleaned_text": ["", "", "great launch", "love it"],
+    })
+    loaded = []
+    monkeypatch.setattr(pipeline, "get_analyzer", StubAnalyzer)
+    monkeypatch.setattr(pipeline, "_extract", lambda keyword, max_results: posts)
+    monkeypatch.setattr(pipeline, "_load", lambda df, keyword, model_version=None: loaded.append(len(df)))
+
+    batches = list(pipeline.iter_sentiment_pipeline("acme", batch_size=2))
+
+    streamed = pd.concat(batches)
+    assert streamed["sentiment"].tolist() == ["Neutral", "Neutral", "positive", "positive"]
+    assert streamed["sentiment_score"].tolist() == [0.0, 0.0, 0.9, 0.9]
+    assert loaded == [2, 2]
+
+
+def test_run_stores_placeholders_when_every_post_is_empty(monkeypatch):
+    posts = pd.DataFrame({"text": ["🔥🔥", "https://t.co/x"], "source": "Twitter", "cleaned_text": ["", ""]})
+    loaded = []
+    monkeypatch.setattr(pipeline, "get_analyzer", StubAnalyzer)
+    monkeypatch.setattr(pipeline, "_extract", lambda keyword, max_results: posts)
+    monkeypatch.setattr(pipeline, "_load", lambda df, keyword, model_version=None: loaded.append(df))
+
+    result = pipeline.run_sentiment_pipeline("acme")
+
+    assert result["sentiment"].tolist() == ["Neutral", "Neutral"]
+    assert result["sentiment_score"].tolist() == [0.0, 0.0]
+    assert len(loaded) == 1 and loaded[0] is result
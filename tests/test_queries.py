@@ -0,0 +1,33 @@
+import pytest
+
+from database.queries import CachedCount, decode_cursor, encode_cursor, pack_cursor, unpack_cursor
+
+
+def test_cold_count_without_estimate_is_exact():
+    counts = CachedCount(ttl=60)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return 42
+
+    assert counts.get("label=negative", compute) == (42, False)
+    assert counts.get("label=negative", compute) == (42, False)
+    assert len(calls) == 1
+
+
+def test_cold_count_with_estimate_refreshes_in_background():
+    counts = CachedCount(ttl=60)
+    assert counts.get("all", lambda: 42, fallback=lambda: 50) == (50, True)
+
+
+def test_cursor_round_trips():
+    assert decode_cursor(encode_cursor(1234)) == 1234
+    assert unpack_cursor(pack_cursor({"rank": -1.5, "id": 7})) == {"rank": -1.5, "id": 7}
+    assert "=" not in encode_cursor(1)
+
+
+def test_malformed_cursor_is_rejected():
+    for cursor in ["not-a-cursor", pack_cursor({"rank": 1.0}), encode_cursor(3)[:-2], "WzFd"]:
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
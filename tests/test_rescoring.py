@@ -0,0 +1,101 @@
+from datetime import datetime
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+from database.bulk import bulk_upsert_results, content_hash
+from database.models import SentimentResult
+from database.queries import results_version
+from database.terms import query_top_terms
+from src.processing.rescoring import RescoreJob
+from src.processing.text_cleaner import preprocess_text
+
+
+class StubAnalyzer:
+    model_name = "model-b"
+
+    def __init__(self):
+        self.seen = []
+
+    def analyze(self, texts, batch_size=32):
+        self.seen.extend(texts)
+        return [{"label": "negative", "score": 0.8} for _ in texts]
+
+
+def insert_rows(engine, n):
+    with engine.begin() as conn:
+        conn.execute(insert(SentimentResult.__table__), [
+            # The cleaner strips digits, so tell posts apart by word length
+            {"input_text": f"launch post {'x' * (i + 1)}", "sentiment_label": "positive", "sentiment_score": 0.9,
+             "keyword": "acme", "source": "Twitter", "created_at": datetime(2026, 10, 1),
+             "model_version": "model-a"}
+            for i in range(n)
+        ])
+
+
+def test_stopped_job_resumes_after_its_checkpoint(db_engine, monkeypatch):
+    analyzer = StubAnalyzer()
+    monkeypatch.setattr("src.analysis.model._analyzer_instance", analyzer)
+    insert_rows(db_engine, 25)
+
+    first = RescoreJob(batch_size=10, max_rows_per_second=0, bind=db_engine)
+    status = first.run(progress=lambda status: first.stop())
+    assert status["status"] == "stopped"
+    assert (status["rows_done"], status["last_id"]) == (10, 10)
+
+    # A new job (e.g. after a restart) picks up from the checkpoint
+    status = RescoreJob(batch_size=10, max_rows_per_second=0, bind=db_engine).run()
+    assert status["status"] == "done"
+    assert (status["rows_total"], status["rows_done"], status["rows_changed"]) == (25, 25, 25)
+    assert len(analyzer.seen) == 25 and len(set(analyzer.seen)) == 25
+
+    with db_engine.connect() as conn:
+        rows = conn.execute(select(SentimentResult.sentiment_label, SentimentResult.model_version)).all()
+    assert set(rows) == {("negative", "model-b")}
+
+
+def test_finished_job_is_not_rerun(db_engine, monkeypatch):
+    analyzer = StubAnalyzer()
+    monkeypatch.setattr("src.analysis.model._analyzer_instance", analyzer)
+    insert_rows(db_engine, 5)
+
+    RescoreJob(batch_size=10, max_rows_per_second=0, bind=db_engine).run()
+    status = RescoreJob(batch_size=10, max_rows_per_second=0, bind=db_engine).run()
+    assert status["status"] == "done"
+    assert status["rows_done"] == 5
+    assert len(analyzer.seen) == 5
+
+
+def test_relabelled_terms_move_between_label_windows(db_engine, monkeypatch):
+    monkeypatch.setattr("src.analysis.model._analyzer_instance", StubAnalyzer())
+    bulk_upsert_results([
+        {"input_text": text, "sentiment_label": "positive", "sentiment_score": 0.9, "keyword": "acme",
+         "source": "Twitter", "post_created_at": datetime(2026, 10, 1, 12), "content_hash": content_hash(text, "Twitter"),
+         "model_version": "model-a", "terms": preprocess_text(text).split()}
+        for text in ["battery died again", "battery lasts forever"]
+    ], bind=db_engine)
+
+    RescoreJob(max_rows_per_second=0, bind=db_engine).run()
+
+    db = sessionmaker(bind=db_engine)()
+    try:
+        top = query_top_terms(db, "acme")
+    finally:
+        db.close()
+    assert set(top) == {"negative"}
+    assert top["negative"]["posts"] == 2
+    assert top["negative"]["terms"][0] == {"term": "battery", "count": 2}
+
+
+def test_relabelling_changes_the_results_version(db_engine, monkeypatch):
+    monkeypatch.setattr("src.analysis.model._analyzer_instance", StubAnalyzer())
+    insert_rows(db_engine, 3)
+    db = sessionmaker(bind=db_engine)()
+    try:
+        before = results_version(db)
+        RescoreJob(max_rows_per_second=0, bind=db_engine).run()
+        after = results_version(db)
+    finally:
+        db.close()
+    assert after[0] != before[0]
+    assert after[1] > before[1]
@@ -0,0 +1,20 @@
+import pytest
+
+from database.search import build_match_query
+
+
+def test_modes():
+    assert build_match_query("acme launch") == '"acme" "launch"'
+    assert build_match_query("acme launch", "phrase") == '"acme launch"'
+    assert build_match_query("micro soft", "prefix") == '"micro"* "soft"*'
+
+
+def test_fts_syntax_is_not_passed_through():
+    assert build_match_query('acme OR "x" NEAR(y) -z*') == '"acme" "OR" "x" "NEAR" "y" "z"'
+
+
+def test_rejects_empty_query_and_unknown_mode():
+    with pytest.raises(ValueError):
+        build_match_query('"*()-')
+    with pytest.raises(ValueError):
+        build_match_query("acme", "regex")
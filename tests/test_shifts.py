@@ -0,0 +1,62 @@
+import hashlib
+import random
+from datetime import datetime, timedelta
+
+from src.analysis.shifts import ShiftDetector
+
+
+def make_rows(n, negative_share, start, seed=1, keyword="acme", source="Twitter"):
+    rng = random.Random(seed)
+    return [
+        {
+            "keyword": keyword,
+            "source": source,
+            "sentiment_label": "negative" if rng.random() < negative_share else "positive",
+            "post_created_at": start + timedelta(minutes=i),
+            "content_hash": hashlib.sha256(f"{seed}:{i}".encode()).hexdigest(),
+        }
+        for i in range(n)
+    ]
+
+
+def posts_seen(detector):
+    return {state["source"]: state["posts"] for state in detector.states()}
+
+
+def test_batched_feed_counts_the_same_posts_as_one_feed():
+    # Upstream returns newest first; the streaming pipeline loads it 10 rows at a time
+    rows = list(reversed(make_rows(120, 0.5, datetime(2026, 10, 1))))
+
+    whole = ShiftDetector()
+    whole.observe_rows(rows)
+    batched = ShiftDetector()
+    for start in range(0, len(rows), 10):
+        batched.observe_rows(rows[start:start + 10])
+
+    assert posts_seen(batched) == posts_seen(whole) == {"Twitter": 120}
+
+
+def test_refetched_posts_are_not_counted_twice():
+    detector = ShiftDetector()
+    rows = make_rows(80, 0.3, datetime(2026, 10, 1))
+    detector.observe_rows(rows)
+    detector.observe_rows(rows[40:])
+    assert posts_seen(detector) == {"Twitter": 80}
+
+
+def test_stable_stream_raises_no_alert():
+    detector = ShiftDetector()
+    detector.observe_rows(make_rows(2000, 0.3, datetime(2026, 10, 1)))
+    assert detector.alerts() == []
+
+
+def test_negative_swing_alerts_once():
+    detector = ShiftDetector()
+    start = datetime(2026, 10, 1)
+    detector.observe_rows(make_rows(300, 0.2, start, seed=1))
+    detector.observe_rows(make_rows(300, 0.6, start + timedelta(days=1), seed=2))
+
+    alerts = detector.alerts()
+    assert len(alerts) == 1
+    assert alerts[0]["direction"] == "negative"
+    assert alerts[0]["post_created_at"] < start + timedelta(days=1, minutes=100)
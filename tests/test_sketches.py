@@ -0,0 +1,66 @@
+import random
+from collections import Counter
+
+from src.analysis.sketches import CountMinSketch, SpaceSaving, TermSketch
+
+WORDS = [f"term{i}" for i in range(300)]
+
+
+def zipf_stream(n, seed):
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(WORDS))]
+    return rng.choices(WORDS, weights=weights, k=n)
+
+
+def test_merged_count_min_never_undercounts():
+    left, right = zipf_stream(5000, 1), zipf_stream(5000, 2)
+    merged = CountMinSketch(width=256, depth=4)
+    other = CountMinSketch(width=256, depth=4)
+    for term in left:
+        merged.add(term)
+    for term in right:
+        other.add(term)
+    merged.merge(other)
+
+    truth = Counter(left + right)
+    for term, count in truth.items():
+        assert count <= merged.estimate(term) <= count + 2.72 * 10000 / 256
+
+
+def test_merged_space_saving_keeps_heavy_hitters():
+    left, right = zipf_stream(5000, 1), zipf_stream(5000, 2)
+    merged = SpaceSaving(capacity=20)
+    other = SpaceSaving(capacity=20)
+    for term in left:
+        merged.add(term)
+    for term in right:
+        other.add(term)
+    merged.merge(other)
+
+    truth = Counter(left + right)
+    assert len(merged.counters) == 20
+    # Anything above total / capacity is guaranteed to survive the merge
+    assert {term for term, count in truth.items() if count > 10000 / 20} <= set(merged.counters)
+    for term, (count, error) in merged.counters.items():
+        assert count - error <= truth[term] <= count
+
+
+def test_term_sketch_round_trips_through_bytes():
+    sketch = TermSketch(width=256, depth=4, capacity=20)
+    sketch.add_terms(zipf_stream(2000, 3))
+    restored = TermSketch.from_bytes(sketch.to_bytes())
+    assert restored.total == sketch.total == 2000
+    assert restored.most_common(5) == sketch.most_common(5)
+
+
+def test_subtracting_terms_undoes_adding_them():
+    sketch = TermSketch(width=256, depth=4, capacity=20)
+    kept, moved = zipf_stream(2000, 4), zipf_stream(300, 5)
+    sketch.add_terms(kept)
+    sketch.add_terms(moved)
+    sketch.subtract_terms(moved)
+
+    truth = Counter(kept)
+    assert sketch.total == len(kept)
+    for term, count in truth.items():
+        assert count <= sketch.cms.estimate(term)
@@ -0,0 +1,35 @@
+from database.models import WatchedKeyword
+from src.processing.watchlist import next_interval
+
+
+def make_watch(interval=300.0, rate=None):
+    return WatchedKeyword(keyword="acme", max_results=50, min_interval_seconds=60.0,
+                          max_interval_seconds=3600.0, interval_seconds=interval, post_rate_per_hour=rate)
+
+
+def test_quiet_keyword_backs_off_to_the_max():
+    watch = make_watch(interval=2400.0)
+    assert next_interval(watch, 0, 2400.0) == 3600.0
+
+
+def test_interval_targets_half_a_poll_of_new_posts():
+    # 20 posts in 10 minutes = 120/h; 25 posts (half of max_results) take 750s
+    watch = make_watch()
+    assert next_interval(watch, 20, 600.0) == 750.0
+    assert watch.post_rate_per_hour == 120.0
+
+
+def test_post_rate_is_smoothed():
+    watch = make_watch(rate=120.0)
+    next_interval(watch, 40, 600.0)  # 240/h observed
+    assert watch.post_rate_per_hour == 0.7 * 120.0 + 0.3 * 240.0
+
+
+def test_full_poll_at_least_halves_the_interval():
+    watch = make_watch(interval=300.0, rate=10.0)
+    assert next_interval(watch, 50, None) == 150.0
+
+
+def test_hot_keyword_is_clamped_to_the_min():
+    watch = make_watch()
+    assert next_interval(watch, 50, 10.0) == 60.0
@@ -0,0 +1,55 @@
+import json
+
+from database.write_behind import WriteBehindWriter
+
+
+class FlakyWrite:
+    def __init__(self):
+        self.failing = True
+        self.calls = 0
+        self.written = []
+
+    def __call__(self, rows):
+        self.calls += 1
+        if self.failing:
+            raise RuntimeError("database is locked")
+        self.written.extend(rows)
+        return len(rows)
+
+
+def make_writer(tmp_path, write_fn, **kwargs):
+    return WriteBehindWriter(write_fn=write_fn, overflow="spill", flush_interval=60.0,
+                             spill_path=str(tmp_path / "spill.ndjson"), **kwargs)
+
+
+def test_failed_replay_backs_off(tmp_path):
+    write = FlakyWrite()
+    writer = make_writer(tmp_path, write)
+    writer._write_batch([{"input_text": "a"}], oldest_enqueued=None)
+
+    writer._replay_spill()
+    writer._replay_spill()  # still backing off: the file is not re-read
+    assert write.calls == 2
+    assert writer.metrics()["replay_failures"] == 1
+
+    write.failing = False
+    writer._next_replay_at = 0.0
+    writer._replay_spill()
+    assert write.written == [{"input_text": "a"}]
+    assert writer.metrics()["replay_backoff_seconds"] == 0.0
+
+
+def test_batch_that_keeps_failing_is_quarantined(tmp_path):
+    write = FlakyWrite()
+    writer = make_writer(tmp_path, write, max_write_attempts=3)
+    writer._write_batch([{"input_text": "a"}, {"input_text": "b"}], oldest_enqueued=None)
+    for _ in range(3):
+        writer._next_replay_at = 0.0
+        writer._replay_spill()
+
+    assert write.calls == 3
+    assert not (tmp_path / "spill.ndjson").exists()
+    with open(writer.quarantine_path, encoding="utf-8") as fh:
+        quarantined = [json.loads(line) for line in fh]
+    assert [row["input_text"] for row in quarantined] == ["a", "b"]
+    assert writer.metrics()["rows_quarantined"] == 2